@@ -1,5 +1,5 @@
 import os
-import json
+import sys
 import pandas as pd
 import re
 import nltk
@@ -11,52 +11,14 @@ from sklearn.pipeline import Pipeline
 import joblib
 from sklearn.metrics import accuracy_score, classification_report
 
+# Ortak korpus yükleyicisi proje kök dizinindedir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from korpus_yukleyici import korpusu_hazirla
+
 # Türkçe stopwords'leri indir
 nltk.download('stopwords')
 turkish_stop_words = [word for word in stopwords.words('turkish') if len(word) > 2]
 
-# JSON dosyalarını okuma fonksiyonu
-def read_json_file(file_path, is_lines_format=False):
-    haberler = []
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"{file_path} bulunamadı! Dosya yolunu kontrol et.")
-    
-    with open(file_path, "r", encoding="utf-8") as f:
-        if is_lines_format:
-            for line in f:
-                try:
-                    haber = json.loads(line.strip())
-                    metin = haber.get("Body", "").strip()
-                    durum = haber.get("Durum", None)
-                    if metin and durum is not None:
-                        durum_int = int(float(str(durum)))
-                        if 0 <= durum_int <= 10:
-                            haberler.append({"metin": metin, "durum": durum_int})
-                except (ValueError, TypeError, json.JSONDecodeError):
-                    pass
-        else:
-            veri = json.load(f)
-            for haber in veri:
-                metin = haber.get("Body", "").strip()
-                durum = haber.get("Durum", None)
-                if metin and durum is not None:
-                    durum_int = int(float(str(durum)))
-                    if 0 <= durum_int <= 10:
-                        haberler.append({"metin": metin, "durum": durum_int})
-    return haberler
-
-# Dosyaları oku
-total_data = read_json_file("json_dosyası/total.json", is_lines_format=True)
-aanews_data = read_json_file("json_dosyası/TRNews.AANews.json", is_lines_format=False)
-
-# Verileri birleştir
-combined_data = total_data + aanews_data
-
-# Pandas DataFrame'e çevir
-df = pd.DataFrame(combined_data)
-print(f"Toplam haber sayısı: {len(df)}")
-print("Sınıf dağılımı:\n", df["durum"].value_counts())
-
 # Metin temizleme fonksiyonu
 def temizle(text):
     text = text.lower()
@@ -65,7 +27,16 @@ def temizle(text):
     words = [word for word in text.split() if word not in turkish_stop_words and len(word) > 2]
     return ' '.join(words)
 
-df["metin"] = df["metin"].apply(temizle)
+# Dosyaları akış halinde oku, temizle ve Parquet önbelleğine yaz (ortak yükleyici: korpus_yukleyici.py)
+korpus_yolu = korpusu_hazirla(
+    [("json_dosyası/total.json", True), ("json_dosyası/TRNews.AANews.json", False)],
+    "csv_dosyası/korpus_svm.parquet",
+    temizleyici=temizle
+)
+df = pd.read_parquet(korpus_yolu)
+df["durum"] = df["durum"].astype(int)
+print(f"Toplam haber sayısı: {len(df)}")
+print("Sınıf dağılımı:\n", df["durum"].value_counts())
 
 # Veriyi kaydet
 os.makedirs("csv_dosyası", exist_ok=True)
@@ -1,5 +1,7 @@
+import os
+import sys
 import pandas as pd
-from sklearn.model_selection import train_test_split, GridSearchCV
+from sklearn.model_selection import train_test_split
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.ensemble import RandomForestClassifier  # Random Forest sınıfı import edildi
 from sklearn.metrics import classification_report, accuracy_score
@@ -9,6 +11,13 @@ import nltk
 from nltk.corpus import stopwords
 import re
 
+# Ortak arama modülü proje kök dizinindedir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from onbellekli_arama import OnbellekliArama
+
+# Arama yöntemi: "grid" (bütün adaylar) veya "halving" (ardışık yarılama, çok daha hızlı)
+ARAMA_YONTEMI = os.environ.get('ARAMA_YONTEMI', 'grid')
+
 # NLTK Türkçe stop words'ü indir ve yükle
 nltk.download('stopwords')
 turkish_stop_words = stopwords.words('turkish')
@@ -56,7 +65,9 @@ param_grid = {
 }
 
 # 6. Modeli Grid Search ile Eğitme
-grid_search = GridSearchCV(pipeline, param_grid, cv=5, scoring='f1_weighted', verbose=2, n_jobs=-1)
+# Her TF-IDF ayarı her katman için bir kez vektörleştirilip önbelleğe alınır; model ayarları bu bellek
+# eşlemeli matrisler üzerinde denenir (bkz. onbellekli_arama.py).
+grid_search = OnbellekliArama(pipeline, param_grid, cv=5, scoring='f1_weighted', yontem=ARAMA_YONTEMI, verbose=2, n_jobs=-1)
 grid_search.fit(X_train, y_train)
 
 # 7. Modeli Değerlendirme
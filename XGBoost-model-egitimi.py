@@ -1,123 +1,57 @@
 import os
-import json
+from collections import Counter
 import pandas as pd
-import re
-import nltk
-from nltk.corpus import stopwords
-from sklearn.model_selection import train_test_split
-from sklearn.feature_extraction.text import TfidfVectorizer
-from xgboost import XGBClassifier
-from sklearn.pipeline import Pipeline
 import joblib
 from sklearn.metrics import accuracy_score, classification_report
-import numpy as np
-from collections import Counter
-
-nltk.download('stopwords')
-turkish_stop_words = [word for word in stopwords.words('turkish') if len(word) > 2]
-
-def read_json_file(file_path, is_lines_format=False):
-    haberler = []
-    if not os.path.exists(file_path):
-        raise FileNotFoundError(f"{file_path} bulunamadı! Dosya yolunu kontrol et.")
-    
-    with open(file_path, "r", encoding="utf-8") as f:
-        if is_lines_format:
-            for line in f:
-                try:
-                    haber = json.loads(line.strip())
-                    metin = haber.get("Body", "").strip()
-                    durum = haber.get("Durum", None)
-                    if metin and durum is not None:
-                        durum_int = int(float(str(durum)))
-                        if 0 <= durum_int <= 10:
-                            haberler.append({"metin": metin, "durum": durum_int})
-                except (ValueError, TypeError, json.JSONDecodeError):
-                    pass
-        else:
-            veri = json.load(f)
-            for haber in veri:
-                metin = haber.get("Body", "").strip()
-                durum = haber.get("Durum", None)
-                if metin and durum is not None:
-                    durum_int = int(float(str(durum)))
-                    if 0 <= durum_int <= 10:
-                        haberler.append({"metin": metin, "durum": durum_int})
-    return haberler
-
-total_data = read_json_file("json_dosyası/total.json", is_lines_format=True)
-aanews_data = read_json_file("json_dosyası/TRNews.AANews.json", is_lines_format=False)
-
-combined_data = total_data + aanews_data
-
-df = pd.DataFrame(combined_data)
-
-df = df.dropna(subset=["metin", "durum"])
-df = df[df["metin"].str.strip() != ""]
-print(f"Toplam haber sayısı (temizlendikten sonra): {len(df)}")
-print("Sınıf dağılımı:\n", df["durum"].value_counts())
+from metin_temizleme import normalize_et
+from model_kurulumu import DENGELEME_YONTEMI, OZELLIK_ASAMASI, egitim_verisini_hazirla, pipeline_olustur
+from korpus_yukleyici import korpus_parcalari, korpusu_hazirla
+from artimli_egitim import baslangic_durumunu_kaydet
+from model_kayit_defteri import HIZLI_KLASORU, KAYIT_KLASORU, aktif_yap, derlenmis_bicimi_ekle, meta_oku, surumu_kaydet
 
+# Servis tarafıyla (app.py) aynı normalizasyon kullanılır; durak kelimeler model_kurulumu.py'de.
 def temizle(metin):
-    metin = metin.lower()
-    metin = re.sub(r'[^\w\s]', ' ', metin) 
-    metin = re.sub(r'\d+', ' ', metin) 
-    metin = re.sub(r'\s+', ' ', metin).strip()
-    kelimeler = [kelime for kelime in metin.split() if kelime not in turkish_stop_words and len(kelime) > 2]
-    return ' '.join(kelimeler)
-
-print("Metinler temizleniyor...")
-chunk_size = 10000
-cleaned_metinler = []
-for i in range(0, len(df), chunk_size):
-    chunk = df["metin"][i:i + chunk_size].apply(temizle)
-    cleaned_metinler.extend(chunk)
-    print(f"{i + len(chunk)} / {len(df)} satır temizlendi.")
-df["metin"] = cleaned_metinler
-
-os.makedirs("csv_dosyası", exist_ok=True)
-df.to_csv("csv_dosyası/haberveriseti.csv", index=False, encoding="utf-8")
-print("Veri CSV olarak kaydedildi: csv_dosyası/haberveriseti.csv")
-
-print("Sınıf dengesizliği ele alınıyor (oversampling)...")
-class_counts = Counter(df["durum"])
-target_count = 5000 
-oversampled_data = []
-for label in class_counts:
-    class_data = df[df["durum"] == label]
-    oversample_factor = target_count / class_counts[label]
-    if oversample_factor < 1:  
-        oversampled_data.append(class_data.sample(n=target_count, random_state=42))
-    else:  
-        oversampled_data.append(class_data.sample(frac=oversample_factor, replace=True, random_state=42))
-df_oversampled = pd.concat(oversampled_data).sample(frac=1, random_state=42).reset_index(drop=True)
-print(f"Oversampling sonrası sınıf dağılımı:\n", df_oversampled["durum"].value_counts())
-
-X = df_oversampled["metin"]
-y = df_oversampled["durum"]
-X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42, stratify=y)
-
-pipeline = Pipeline([
-    ("tfidf", TfidfVectorizer(
-        stop_words=turkish_stop_words,
-        max_features=3000,  
-        ngram_range=(1, 1),  
-        dtype=np.float32  
-    )),
-    ("xgb", XGBClassifier(
-        objective='multi:softmax',
-        num_class=11,
-        eval_metric='mlogloss',
-        random_state=42,
-        tree_method='hist', 
-        n_jobs=4,  
-        n_estimators=100,  
-        max_depth=5,  
-        learning_rate=0.1  
-    ))
-])
+    return normalize_et(metin)
+
+# Korpus akış halinde okunur, etiketler okunurken doğrulanır; metinler süreç havuzunda paralel temizlenip
+# (işçi sayısı: EGITIM_ISCI_SAYISI, varsayılan çekirdek sayısı) parça parça Parquet önbelleğine yazılır.
+# Kaynak dosyalar değişmediyse önbellek yeniden kullanılır ve temizleme atlanır.
+print("Metinler okunup temizleniyor...")
+korpus_yolu = korpusu_hazirla(
+    [("json_dosyası/total.json", True), ("json_dosyası/TRNews.AANews.json", False)],
+    "csv_dosyası/korpus_temiz.parquet",
+    temizleyici=temizle
+)
+# Sınıf dağılımı yalnızca "durum" sütunu satır grupları halinde okunarak sayılır; eğitim için de yalnızca
+# kullanılan sütunlar okunur ve korpusun ikinci bir kopyası (CSV) yazılmaz.
+sinif_sayilari = Counter()
+for parca in korpus_parcalari(korpus_yolu, sutunlar=("durum",)):
+    sinif_sayilari.update(parca.column("durum").to_numpy())
+print(f"Toplam haber sayısı (temizlendikten sonra): {sum(sinif_sayilari.values())}")
+print("Sınıf dağılımı:\n", pd.Series(sinif_sayilari).sort_index())
+
+df = pd.read_parquet(korpus_yolu, columns=["metin", "durum"])
+
+# Sınıf dengesizliği DENGELEME_YONTEMI ile seçilen yöntemle ele alınır: "satir" (varsayılan) ve "agirlik"
+# metinleri kopyalamadan XGBoost'a örnek ağırlığı verir, "kopya" eski DataFrame tekrarlı örneklemesidir.
+# Yöntemlerin bellek ve doğruluk karşılaştırması için: python dengeleme_karsilastirma.py
+print(f"Sınıf dengesizliği ele alınıyor (yöntem: {DENGELEME_YONTEMI})...")
+X_train, X_test, y_train, y_test, agirliklar = egitim_verisini_hazirla(df)
+if agirliklar is None:
+    fit_ayarlari = {}
+    print(f"Oversampling sonrası eğitim seti sınıf dağılımı:\n", y_train.value_counts())
+else:
+    fit_ayarlari = {"xgb__sample_weight": agirliklar}
+    print(f"Eğitim seti sınıf başına ağırlık toplamı:\n", pd.Series(agirliklar).groupby(y_train.to_numpy()).sum())
+
+# Özellik aşaması OZELLIK_ASAMASI ile seçilir: "tfidf" (varsayılan, 3000 terimlik sözlük) veya "hashing"
+# (sözlüksüz işaretli özellik özetleme + IDF; sütun sayısı 2**HASH_BITLERI). İkisinin doğruluk ve gecikme
+# karşılaştırması için: python ozellik_karsilastirma.py
+print(f"Özellik aşaması: {OZELLIK_ASAMASI}")
+pipeline = pipeline_olustur(OZELLIK_ASAMASI)
 
 print("Model eğitiliyor...")
-pipeline.fit(X_train, y_train)
+pipeline.fit(X_train, y_train, **fit_ayarlari)
 print("Eğitim tamamlandı.")
 
 
@@ -134,4 +68,24 @@ with open("csv_dosyası/performans_raporu.txt", "w", encoding="utf-8") as f:
     f.write(f"Doğruluk (test seti): {accuracy_score(y_test, y_pred)}\n")
     f.write("Sınıflandırma Raporu:\n")
     f.write(classification_report(y_test, y_pred, zero_division=0))
-print("Performans raporu kaydedildi: csv_dosyası/performans_raporu.txt")
\ No newline at end of file
+print("Performans raporu kaydedildi: csv_dosyası/performans_raporu.txt")
+
+# Modeli kayıt defterine yeni sürüm olarak ekle ve servis edilecek sürüm yap; çalışan sunucu yeniden
+# başlatılmadan bu sürüme geçer. Sürümle birlikte sunucunun sklearn yüklemeden açtığı hızlı biçim
+# (sözlük, IDF ve ağaçlar NumPy dizileri halinde, booster UBJSON olarak) da dışa aktarılır.
+# MODEL_DERLE=1 ise ağaçlar ayrıca Treelite ile derlenir (derlenmis_model.py; sunucuda MODEL_ARKA_UCU=derlenmis).
+# Sunucu sürümü derlenmiş haliyle görsün diye sürüm, derleme bittikten sonra aktif yapılır.
+surum = surumu_kaydet(pipeline, rapor_yolu="csv_dosyası/performans_raporu.txt", kaynak="tam_egitim")
+print(f"Model kayıt defterine eklendi: {surum}")
+if meta_oku(surum).get("hizli_bicim"):
+    print(f"Hızlı açılan model biçimi yazıldı: {os.path.join(KAYIT_KLASORU, surum, HIZLI_KLASORU)}")
+    if os.environ.get('MODEL_DERLE', '0') == '1':
+        try:
+            print(f"Derlenmiş model biçimi yazıldı: {derlenmis_bicimi_ekle(surum)}")
+        except Exception as e:
+            print(f"[UYARI] Ağaçlar derlenemedi, sunucu hızlı biçimi kullanacak: {str(e)}")
+aktif_yap(surum)
+
+# Tam eğitimde kullanılan etiketler artımlı eğitim (artimli_egitim.py) için "görüldü" olarak işaretlenir.
+baslangic_durumunu_kaydet(surum)
+print("Artımlı eğitim başlangıç durumu kaydedildi.")
@@ -0,0 +1,177 @@
+# aktif_ogrenme.py
+#
+# Etiketleme aracı (json_dosyası/app.py) için aktif öğrenme kuyruğu. Etiketsiz haberler, servis edilen
+# modelle (model_kayit_defteri.ModelYoneticisi) arka planda büyük parçalar halinde tek predict_proba
+# çağrısıyla puanlanır ve belirsizlik skorları etiketleme deposuna (etiketleme_deposu.py) skoru üreten model
+# sürümü ve ölçütle birlikte yazılır. Kuyruk, depodaki (skor) indeksinden en belirsiz haberden başlayarak okunur.
+# Yeni bir model sürümü geldiğinde yalnızca başka sürümle puanlanmış haberler yeniden puanlanır; yeni
+# skorlar yazılana kadar eski skorlarla sıralama sürer. Etiketlenen haberler kuyruktan kendiliğinden düşer.
+# Belirsizlik ölçütü AKTIF_OGRENME_OLCUTU ile seçilir:
+#     marj      1 - (en yüksek iki sınıf olasılığının farkı)
+#     entropi   olasılık dağılımının sınıf sayısının logaritmasına bölünmüş entropisi
+#
+# Kullanım: python aktif_ogrenme.py [--korpus json_dosyası/TRNews.AANews.json] [--olcut marj] [--adet 20]
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+
+from etiketleme_deposu import EtiketlemeDeposu
+from metin_temizleme import normalize_et
+
+logger = logging.getLogger(__name__)
+
+OLCUTLER = ('marj', 'entropi')
+BELIRSIZLIK_OLCUTU = os.environ.get('AKTIF_OGRENME_OLCUTU', 'marj')
+# Tek predict_proba çağrısında puanlanan haber sayısı.
+PUANLAMA_PARCA_BOYUTU = int(os.environ.get('AKTIF_OGRENME_PARCA_BOYUTU', 2000))
+# Puanlanacak haber kalmadığında yeni haber veya model sürümü için bekleme süresi (saniye).
+PUANLAMA_BEKLEME = float(os.environ.get('AKTIF_OGRENME_BEKLEME', 30))
+# Kuyruktan verilen haberin başka bir etiketleyiciye verilmeden ayrılmış kaldığı süre (saniye).
+REZERVASYON_SURESI = float(os.environ.get('KUYRUK_REZERVASYON_SURESI', 600))
+
+# Sınıf olasılıklarından (satır başına bir haber) 0-1 aralığında belirsizlik skorları üretir.
+def belirsizlik_skorlari(olasiliklar, olcut=BELIRSIZLIK_OLCUTU):
+    olasiliklar = np.asarray(olasiliklar, dtype=np.float64)
+    if olcut == 'marj':
+        en_iyi_iki = np.partition(olasiliklar, -2, axis=1)[:, -2:]
+        return 1.0 - (en_iyi_iki[:, 1] - en_iyi_iki[:, 0])
+    if olcut == 'entropi':
+        p = np.clip(olasiliklar, 1e-12, 1.0)
+        return -(p * np.log(p)).sum(axis=1) / np.log(olasiliklar.shape[1])
+    raise ValueError(f"Bilinmeyen belirsizlik ölçütü: {olcut}")
+
+# Etiketsiz haberleri aktif modelle puanlayan arka plan iş parçacığı. puanla() tek geçişte eksik ve eski
+# sürümlü skorları yeniler; döngü geçiş boş dönünce bekleme saniyesi kadar veya uyandir() çağrılana dek uyur.
+class BelirsizlikPuanlayici:
+    def __init__(self, depo, model_yoneticisi, olcut=BELIRSIZLIK_OLCUTU, parca_boyutu=PUANLAMA_PARCA_BOYUTU,
+                 bekleme=PUANLAMA_BEKLEME):
+        if olcut not in OLCUTLER:
+            raise ValueError(f"Bilinmeyen belirsizlik ölçütü: {olcut}")
+        self.depo = depo
+        self.model_yoneticisi = model_yoneticisi
+        self.olcut = olcut
+        self.parca_boyutu = parca_boyutu
+        self.bekleme = bekleme
+        self._uyandir = threading.Event()
+        self._durdur = threading.Event()
+        self._isci = None
+
+    # Aktif modelin sürümüyle puanlanmamış etiketsiz haberleri puanlar; puanlanan haber sayısını döndürür.
+    # Geçiş sırasında model değişirse geçiş bırakılır, sonraki geçiş yeni sürümle başlar.
+    def puanla(self):
+        aktif = self.model_yoneticisi.guncel()
+        if aktif is None:
+            return 0
+        anahtar = self._anahtar(aktif)
+        toplam, after_id = 0, None
+        while not self._durdur.is_set():
+            parca = self.depo.puanlanacaklar(anahtar, after_id, self.parca_boyutu)
+            if not parca:
+                break
+            olasiliklar = aktif.model.predict_proba([normalize_et(metin or '') for _, metin in parca])
+            skorlar = belirsizlik_skorlari(olasiliklar, self.olcut)
+            self.depo.skorlari_kaydet(zip((kimlik for kimlik, _ in parca), skorlar), anahtar)
+            toplam += len(parca)
+            after_id = parca[-1][0]
+            if self.model_yoneticisi.guncel() is not aktif:
+                break
+        return toplam
+
+    # Skorlar model sürümü ve ölçütle işaretlenir; ölçüt değişince de yeniden puanlanır.
+    def _anahtar(self, aktif):
+        return f"{aktif.surum}/{self.olcut}"
+
+    # Bekleyen döngüyü hemen yeni bir geçişe başlatır (örn. yeni model sürümü geldiğinde).
+    def uyandir(self):
+        self._uyandir.set()
+
+    # Puanlama özetini ve ölçütü döndürür; model yüklenmediyse surum None'dır.
+    def durum(self):
+        aktif = self.model_yoneticisi.guncel()
+        ozet = self.depo.puanlama_ozeti(self._anahtar(aktif) if aktif else '')
+        return {"olcut": self.olcut, "model_surumu": aktif.surum if aktif else None, **ozet}
+
+    # Arka planda geçişleri çalıştıran döngü; hata olursa bekleme süresinden sonra yeniden dener.
+    def _calis(self):
+        while not self._durdur.is_set():
+            try:
+                baslangic = time.perf_counter()
+                puanlanan = self.puanla()
+                if puanlanan:
+                    logger.info(f"{puanlanan} haber puanlandı ({time.perf_counter() - baslangic:.1f} sn)")
+                    continue
+            except Exception as e:
+                logger.error(f"Belirsizlik puanlaması başarısız: {str(e)}")
+            self._uyandir.wait(self.bekleme)
+            self._uyandir.clear()
+
+    # Arka plan puanlamasını başlatır.
+    def baslat(self):
+        if self._isci is None:
+            self._isci = threading.Thread(target=self._calis, name="belirsizlik-puanlayici", daemon=True)
+            self._isci.start()
+
+    # Arka plan puanlamasını durdurur.
+    def durdur(self):
+        self._durdur.set()
+        self._uyandir.set()
+
+# En belirsiz etiketsiz haberleri veren kuyruk. Verilen haberler rezervasyon süresi boyunca ayrılır; böylece
+# aynı anda çalışan etiketleyicilere farklı haberler verilir. Etiketlenen haberin rezervasyonu birak() ile kalkar.
+class EtiketKuyrugu:
+    def __init__(self, depo, rezervasyon_suresi=REZERVASYON_SURESI):
+        self.depo = depo
+        self.rezervasyon_suresi = rezervasyon_suresi
+        self._rezervasyonlar = {}
+        self._kilit = threading.Lock()
+
+    # Rezerve edilmemiş en belirsiz adet haberi döndürür ve rezerve eder.
+    def al(self, adet):
+        with self._kilit:
+            simdi = time.monotonic()
+            self._rezervasyonlar = {k: bitis for k, bitis in self._rezervasyonlar.items() if bitis > simdi}
+            haberler = self.depo.en_belirsizler(adet, haric=self._rezervasyonlar)
+            for haber in haberler:
+                self._rezervasyonlar[haber["ID"]] = simdi + self.rezervasyon_suresi
+            return haberler
+
+    # Haberin rezervasyonunu kaldırır.
+    def birak(self, kimlik):
+        with self._kilit:
+            self._rezervasyonlar.pop(kimlik, None)
+
+def main():
+    parser = argparse.ArgumentParser(description="Etiketsiz haberleri aktif modelle puanlar ve kuyruğun başını gösterir")
+    parser.add_argument('--korpus', default=os.path.join('json_dosyası', 'TRNews.AANews.json'),
+                        help="Etiketlenen korpus dosyası")
+    parser.add_argument('--olcut', choices=OLCUTLER, default=BELIRSIZLIK_OLCUTU, help="Belirsizlik ölçütü")
+    parser.add_argument('--adet', type=int, default=20, help="Gösterilecek haber sayısı")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.korpus):
+        print(f"[HATA] Korpus bulunamadı: {args.korpus}")
+        return 1
+    from model_kayit_defteri import ModelYoneticisi
+
+    model_yoneticisi = ModelYoneticisi(kontrol_araligi=0)
+    if model_yoneticisi.guncel() is None:
+        print("[HATA] Model yüklenemedi (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+    depo = EtiketlemeDeposu(args.korpus, os.environ.get('ETIKETLEME_DB'))
+    depo.hazirla()
+    puanlayici = BelirsizlikPuanlayici(depo, model_yoneticisi, args.olcut)
+    baslangic = time.perf_counter()
+    puanlanan = puanlayici.puanla()
+    print(f"Puanlanan: {puanlanan} haber ({time.perf_counter() - baslangic:.1f} sn), durum: {puanlayici.durum()}\n")
+    for haber in depo.en_belirsizler(args.adet):
+        print(f"{haber['Belirsizlik']:.4f}  {haber['ID']}  {(haber['Title'] or '')[:80]}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
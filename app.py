@@ -1,102 +1,234 @@
 # app.py
 
-from flask import Flask, request, jsonify, render_template, send_from_directory
+from flask import Flask, request, jsonify, render_template, send_from_directory, Response, stream_with_context
 from flask_cors import CORS
 import sqlite3
-import joblib
-import re
 from datetime import datetime
 import os
+import gc
 import logging
 import bcrypt
+import json
+from metin_temizleme import normalize_et
+from model_kayit_defteri import MODEL_ARKA_UCU, ModelYoneticisi, surumleri_listele
+from tahmin_kuyrugu import KuyrukDolu, TahminBirlestirici
+from tahmin_onbellegi import TahminOnbellegi
+from veritabani import (BaglantiHavuzu, ANALIZ_SORGUSU, ANONIM_KULLANICI_ID, semayi_guncelle, fts_dizini_var_mi,
+                        icerik_ozeti_hesapla, haberi_kaydet, oturum_ac, oturum_kullanicisi)
 
 # Flask uygulamasını başlatır ve CORS ayarlarını yapılandırır.
 app = Flask(__name__)
 CORS(app, resources={r"/*": {"origins": "*"}})
 
-# Uygulama genelinde kullanılacak günlük kaydı (logging) yapılandırmasını ayarlar.
-logging.basicConfig(level=logging.DEBUG)
+# /predict-batch isteğinde tek seferde kabul edilecek en fazla haber sayısı.
+MAX_TOPLU_ANALIZ = 200
+
+# /all-users sayfalamasında varsayılan ve izin verilen en büyük sayfa boyutu.
+VARSAYILAN_SAYFA_BOYUTU = 50
+MAX_SAYFA_BOYUTU = 500
+
+# /check-auth ve /register tarafından verilen oturum anahtarlarının geçerlilik süresi (saniye).
+OTURUM_SURESI_SANIYE = int(os.environ.get('OTURUM_SURESI_SANIYE', 30 * 24 * 3600))
+
+# /gecmis-analizler-disa-aktar akışında veritabanından tek seferde okunan satır sayısı.
+DISA_AKTARMA_PARCA_BOYUTU = 500
+
+# Geçmiş analiz yanıtlarında istenebilecek alanlar ve karşılık gelen sütunlar.
+GECMIS_ALANLARI = {
+    "id": "analizler.id",
+    "baslik": "analizler.baslik",
+    "metin": "articles.metin",
+    "durum": "analizler.durum",
+    "derece": "analizler.derece",
+    "tarih": "analizler.tarih",
+    "model_surumu": "analizler.model_surumu"
+}
+
+# Uygulama genelinde kullanılacak günlük kaydı (logging) yapılandırmasını ayarlar. Seviye LOG_SEVIYESI ile
+# seçilir; üretimde (gunicorn.conf.py) istek başına DEBUG kayıtları yazılmaz.
+logging.basicConfig(level=os.environ.get('LOG_SEVIYESI', 'DEBUG').upper())
 logger = logging.getLogger(__name__)
 
-# Önceden eğitilmiş makine öğrenmesi modelini diskten yükler.
-try:
-    model = joblib.load("csv_dosyası/en_iyi_model_xgb.pkl")
-    logger.info("Model başarıyla yüklendi: csv_dosyası/en_iyi_model_xgb.pkl")
-except Exception as e:
-    logger.error(f"Model yüklenemedi: {str(e)}")
-    model = None
-
-# Veritabanına yeni bir bağlantı oluşturur ve döndürür.
+# Eşzamanlı /predict isteklerini kısa süre biriktirip modeli tek matris üzerinde çalıştıran birleştirici.
+# Her istek kendi aldığı model ile tahmin edilir. Bekleme süresi (ms) ve en büyük toplu boyut ortam
+# değişkenleriyle ayarlanabilir. Model çıkarımı birleştiricinin sınırlı sayıdaki tahmin iş parçacığında yapılır;
+# ancak istek iş parçacığı sonucu beklerken (en fazla TAHMIN_ZAMAN_ASIMI) ve veritabanı yazımları sırasında
+# meşgul kalır. Bu yüzden kuyruk, tahmin iş parçacıklarının birkaç tam toplu içinde bitirebileceği kadar
+# metinle sınırlanır; sınır aşılırsa yeni tahmin istekleri beklemeden 503 (Retry-After) ile reddedilir ve
+# istek iş parçacıkları uzun kuyruklar arkasında birikmez.
+TAHMIN_ISCI_SAYISI = int(os.environ.get('TAHMIN_ISCI_SAYISI', 1))
+TAHMIN_MAX_TOPLU_BOYUT = int(os.environ.get('TAHMIN_MAX_TOPLU_BOYUT', 32))
+# TAHMIN_MAX_KUYRUK verilmezse her tahmin iş parçacığı için bu kadar tam toplu bekleyebilir.
+KUYRUK_TOPLU_SAYISI = 4
+tahmin_birlestirici = TahminBirlestirici(
+    lambda metinler, model: model.predict(metinler),
+    max_bekleme_ms=float(os.environ.get('TAHMIN_MAX_BEKLEME_MS', 5)),
+    max_toplu_boyut=TAHMIN_MAX_TOPLU_BOYUT,
+    max_kuyruk=int(os.environ.get('TAHMIN_MAX_KUYRUK', TAHMIN_ISCI_SAYISI * TAHMIN_MAX_TOPLU_BOYUT * KUYRUK_TOPLU_SAYISI)),
+    isci_sayisi=TAHMIN_ISCI_SAYISI,
+    tekrar_dene_saniye=int(os.environ.get('TAHMIN_TEKRAR_DENE_SANIYE', 1))
+)
+
+# Bir tahmin isteğinin sonucunu en fazla bekleme süresi (saniye); aşılırsa istek 503 ile yanıtlanır. Dolu bir
+# kuyruktaki birkaç tam toplunun tahmin süresini (toplu başına onlarca ms) rahatça karşılar; daha uzun
+# beklemek yalnızca istek iş parçacığını tutar.
+TAHMIN_ZAMAN_ASIMI = float(os.environ.get('TAHMIN_ZAMAN_ASIMI', 2))
+
+# Analiz veritabanının yolu (yük testinde ayrı bir veritabanı verilebilir).
+DB_YOLU = os.environ.get('ANALIZ_DB_YOLU', 'analizler.db')
+
+# Tüm rotaların paylaştığı, WAL modunda çalışan SQLite bağlantı havuzu.
+db_havuzu = BaglantiHavuzu(
+    DB_YOLU,
+    max_baglanti=int(os.environ.get('DB_HAVUZ_BOYUTU', 16)),
+    busy_timeout_ms=int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+)
+
+# Havuzdan bir veritabanı bağlantısı ödünç alır; "with get_db_connection() as conn:" şeklinde kullanılır
+# ve blok bittiğinde bağlantı (hata olsa bile) havuza iade edilir.
 def get_db_connection():
-    try:
-        conn = sqlite3.connect('analizler.db', detect_types=sqlite3.PARSE_DECLTYPES)
-        conn.row_factory = sqlite3.Row
-        return conn
-    except sqlite3.Error as e:
-        logger.error(f"Veritabanı bağlantısı açılamadı: {str(e)}")
-        raise Exception("Veritabanına bağlanılamadı, lütfen sistem yöneticisiyle iletişime geçin.")
-
-# Veritabanını başlatır, gerekli tabloları (users, analizler) oluşturur veya günceller.
+    return db_havuzu.baglanti()
+
+# Kullanıcı aramasında FTS5 trigram dizininin kullanılıp kullanılamayacağı; init_db() tarafından belirlenir.
+FTS_AKTIF = False
+
+# Veritabanını başlatır; sürümlü şema göçlerini (tablolar, indeksler, arama dizini) sırayla uygular.
 def init_db():
+    global FTS_AKTIF
     try:
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('''CREATE TABLE IF NOT EXISTS users
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      email TEXT UNIQUE,
-                      isim TEXT,
-                      soyisim TEXT,
-                      yas INTEGER,
-                      sehir TEXT,
-                      password TEXT,
-                      is_admin INTEGER DEFAULT 0)''')
-        c.execute('''CREATE TABLE IF NOT EXISTS analizler
-                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
-                      user_id TEXT,
-                      baslik TEXT,
-                      metin TEXT,
-                      durum TEXT,
-                      derece INTEGER,
-                      tarih TEXT,
-                      UNIQUE(user_id, baslik))''')
-        
-        try:
-            c.execute("ALTER TABLE users ADD COLUMN password TEXT")
-            logger.info("users tablosuna password sütunu eklendi.")
-        except sqlite3.OperationalError:
-            pass
-        try:
-            c.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER DEFAULT 0")
-            logger.info("users tablosuna is_admin sütunu eklendi.")
-        except sqlite3.OperationalError:
-            pass
-        
-        conn.commit()
-        logger.info("Veritabanı başarıyla başlatıldı.")
+        with get_db_connection() as conn:
+            surum = semayi_guncelle(conn)
+            FTS_AKTIF = fts_dizini_var_mi(conn)
+            logger.info(f"Veritabanı başarıyla başlatıldı (şema sürümü: {surum}, FTS5: {FTS_AKTIF}).")
     except Exception as e:
         logger.error(f"Veritabanı başlatılamadı: {str(e)}")
         raise Exception("Veritabanı başlatılamadı, lütfen sistem yöneticisiyle iletişime geçin.")
-    finally:
-        conn.close()
 
 # Uygulama başlatıldığında veritabanının varlığını kontrol eder ve gerekirse başlatır.
-if not os.path.exists('analizler.db'):
+if not os.path.exists(DB_YOLU):
     init_db()
 else:
     init_db() # Mevcut veritabanında tablo/sütun güncellemeleri için tekrar çağrılır.
 
-# Girdi metnini küçük harfe çevirir, noktalama işaretlerini ve sayıları kaldırır.
+# Aynı haberin (temizlenmiş metin + model sürümü) tüm kullanıcılar için tek kez tahmin edilmesini sağlayan önbellek.
+tahmin_onbellegi = TahminOnbellegi(
+    get_db_connection,
+    max_boyut=int(os.environ.get('TAHMIN_ONBELLEK_BOYUTU', 10000)),
+    ttl_saniye=int(os.environ.get('TAHMIN_ONBELLEK_TTL', 7 * 24 * 3600))
+)
+
+# Model sürümü değiştiğinde eski sürüme ait önbellek kayıtlarını temizler.
+def model_degisti(eski_surum, yeni_surum):
+    silinen = tahmin_onbellegi.surum_disindakileri_sil(yeni_surum)
+    logger.info(f"Model sürümü değişti: {eski_surum} -> {yeni_surum} ({silinen} önbellek kaydı silindi)")
+
+# Servis edilen modeli kayıt defterinden (csv_dosyası/modeller) veya eski tek dosyalık modelden yükler ve
+# MODEL_KONTROL_ARALIGI saniyede bir yeni sürüm olup olmadığına bakarak sunucuyu durdurmadan yeni sürüme geçer.
+# Başlangıçta yüklenemeyen model, dosya geldiğinde arka planda yüklenir. Tahmin arka ucu MODEL_ARKA_UCU ile
+# seçilir ("derlenmis", "hizli" veya "joblib"); sürümde o biçim yoksa bir sonrakine, en son joblib'e düşülür.
+model_yoneticisi = ModelYoneticisi(
+    kontrol_araligi=float(os.environ.get('MODEL_KONTROL_ARALIGI', 10)),
+    degisince=model_degisti,
+    arka_uc=MODEL_ARKA_UCU
+)
+
+# Tahmin kuyruğu dolduğunda veya tahmin zaman aşımına uğradığında dönülen 503 yanıtı; istemci
+# Retry-After saniye sonra yeniden denemelidir.
+def yogunluk_yaniti(tekrar_dene_saniye):
+    yanit = jsonify({"error": "Sunucu şu anda yoğun, lütfen biraz sonra tekrar deneyin."})
+    yanit.headers['Retry-After'] = str(tekrar_dene_saniye)
+    return yanit, 503
+
+# Ön çatallamalı (pre-fork) sunucu kancaları (gunicorn.conf.py). Model ve veritabanı şeması ana süreçte bir
+# kez hazırlanır; işçiler çatallanınca model sayfaları copy-on-write ile paylaşılır. Çatallanmadan önce
+# havuzdaki SQLite bağlantıları kapatılır ve o ana kadarki nesneler çöp toplayıcıdan ayrılır (gc.freeze);
+# böylece işçilerdeki çöp toplama turları paylaşılan sayfalara yazıp kopyalanmalarına yol açmaz.
+def catallanmadan_once():
+    db_havuzu.kapat()
+    gc.freeze()
+
+# Çatallandıktan sonra her işçide çağrılır: veritabanı bağlantıları işçide yeniden açılır, tahmin
+# birleştiricisinin ve model izleyicisinin iş parçacıkları işçide yeniden başlatılır.
+def catallandiktan_sonra():
+    db_havuzu.catallandiktan_sonra()
+    tahmin_birlestirici.catallandiktan_sonra()
+    model_yoneticisi.catallandiktan_sonra()
+
+# İşçi kapanırken, devam eden istekler tamamlandıktan sonra çağrılır.
+def kapanis():
+    model_yoneticisi.durdur()
+    db_havuzu.kapat()
+    logger.info(f"İşçi kapandı (pid: {os.getpid()}, tahmin: {tahmin_birlestirici.metrikler()['istek_sayisi']})")
+
+# Girdi metnini eğitimdeki ön işlemeyle aynı şekilde normalize eder: küçük harfe çevirir, noktalama
+# işaretlerini ve sayıları kaldırır, durak kelimeleri ve kısa kelimeleri atar.
 def temizle_metin(metin):
     try:
-        metin = metin.lower()
-        metin = re.sub(r'[^\w\s]', ' ', metin)
-        metin = re.sub(r'\d+', ' ', metin)
-        metin = re.sub(r'\s+', ' ', metin).strip()
-        return metin
+        return normalize_et(metin)
     except Exception as e:
         logger.error(f"Metin temizlenirken hata: {str(e)}")
         raise Exception("Metin işlenirken bir hata oluştu.")
 
+# Admin panelindeki kullanıcı aramasını WHERE koşuluna çevirir. 3 ve daha uzun aramalar FTS5 trigram
+# dizininden yanıtlanır; daha kısa aramalarda (trigram eşleşemez) veya FTS5 yoksa LIKE kullanılır.
+def kullanici_arama_kosulu(search):
+    if not search:
+        return '', []
+    if FTS_AKTIF and len(search) >= 3:
+        return ' WHERE users.id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH ?)', ['"' + search.replace('"', '""') + '"']
+    return ' WHERE email LIKE ? OR isim LIKE ? OR soyisim LIKE ?', [f'%{search}%', f'%{search}%', f'%{search}%']
+
+# Kullanıcı satırından istemciye döndürülen profil bilgilerini üretir.
+def kullanici_profili(user):
+    return {
+        "isim": user['isim'],
+        "soyisim": user['soyisim'],
+        "email": user['email'],
+        "yas": user['yas'],
+        "sehir": user['sehir']
+    }
+
+# İsteği yapan kullanıcının users.id değerini yalnızca oturum anahtarından bulur. Eklenti, /check-auth'un
+# verdiği anahtarı "token" alanında veya "Authorization: Bearer" başlığında gönderir; gövdedeki "user_id"
+# kimlik olarak kabul edilmez. Anahtar yoksa veya geçersizse None döner.
+def istekteki_kullanici(c, data):
+    token = data.get('token')
+    yetki = request.headers.get('Authorization', '')
+    if not token and yetki.startswith('Bearer '):
+        token = yetki[len('Bearer '):].strip()
+    return oturum_kullanicisi(c, token) if token else None
+
+# Kullanıcının admin olup olmadığını döndürür.
+def admin_mi(c, user_id):
+    c.execute('SELECT is_admin FROM users WHERE id = ?', (user_id,))
+    user = c.fetchone()
+    return bool(user and user['is_admin'])
+
+# Profil işlemlerinin hedef kullanıcısını bulur: gövdede "user_id" yoksa oturumdaki kullanıcının kendisidir.
+# Admin paneli başka bir kullanıcıyı tamsayı "user_id" ile hedefler; bunun için oturumdaki kullanıcının admin
+# olması gerekir. (hedef kullanıcı, None) veya (None, hata yanıtı) döndürür.
+def hedef_kullanici(c, data):
+    user_id = istekteki_kullanici(c, data)
+    if user_id is None:
+        return None, (jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401)
+    hedef = data.get('user_id')
+    if hedef is None:
+        return user_id, None
+    if isinstance(hedef, str) and hedef.isdigit():
+        hedef = int(hedef)
+    if not isinstance(hedef, int) or isinstance(hedef, bool):
+        return None, (jsonify({"error": "Kullanıcı kimliği geçersiz! Lütfen geçerli bir kullanıcı seçin."}), 400)
+    if hedef != user_id and not admin_mi(c, user_id):
+        logger.warning(f"Yetkisiz kullanıcı işlemi: {user_id} -> {hedef}")
+        return None, (jsonify({"error": "Bu işlem için yönetici yetkisi gerekli!"}), 403)
+    return hedef, None
+
+# Model çıktısını (0: olumlu, 1-10: olumsuzluk derecesi) durum ve derece bilgisine çevirir.
+def tahmini_yorumla(tahmin):
+    durum = "Olumlu" if tahmin == 0 else "Olumsuz"
+    derece = int(tahmin) if tahmin > 0 else 0
+    return durum, derece
+
 # Yeni bir kullanıcıyı veritabanına kaydeder.
 @app.route('/register', methods=['POST'])
 def register():
@@ -116,23 +248,27 @@ def register():
 
         hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('INSERT INTO users (email, isim, soyisim, yas, sehir, password, is_admin) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                  (email, isim, soyisim, yas, sehir, hashed_password, is_admin))
-        conn.commit()
-        user_id = f"{isim}_{soyisim}_{email}_{yas}_{sehir}"
-        logger.info(f"Kullanıcı kaydedildi: {user_id}, is_admin: {is_admin}")
-        return jsonify({"message": "Kayıt başarılı!", "user_id": user_id, "is_admin": is_admin}), 200
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute('INSERT INTO users (email, isim, soyisim, yas, sehir, password, is_admin) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                      (email, isim, soyisim, yas, sehir, hashed_password, is_admin))
+            user_id = c.lastrowid
+            token = oturum_ac(c, user_id, OTURUM_SURESI_SANIYE)
+            conn.commit()
+            logger.info(f"Kullanıcı kaydedildi: {user_id}, is_admin: {is_admin}")
+            return jsonify({
+                "message": "Kayıt başarılı!",
+                "user_id": user_id,
+                "token": token,
+                "is_admin": is_admin,
+                "kullanici": {"isim": isim, "soyisim": soyisim, "email": email, "yas": yas, "sehir": sehir}
+            }), 200
     except sqlite3.IntegrityError:
         logger.warning(f"Bu e-posta zaten kayıtlı: {email}")
         return jsonify({"error": "Bu e-posta zaten kayıtlı! Lütfen başka bir e-posta kullanın."}), 400
     except Exception as e:
         logger.error(f"Kullanıcı kaydedilirken hata: {str(e)}")
         return jsonify({"error": "Kayıt işlemi sırasında bir hata oluştu, lütfen tekrar deneyin."}), 500
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 # Kullanıcının e-posta ve şifresini veritabanındaki kayıtlarla karşılaştırarak kimliğini doğrular.
 @app.route('/check-auth', methods=['POST'])
@@ -146,64 +282,66 @@ def check_auth():
             logger.warning("E-posta veya şifre eksik")
             return jsonify({"authenticated": False, "error": "E-posta ve şifre gereklidir!"}), 400
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('SELECT isim, soyisim, email, yas, sehir, password, is_admin FROM users WHERE email = ?', (email,))
-        user = c.fetchone()
-
-        if user:
-            isim, soyisim, email, yas, sehir, hashed_password, is_admin = user
-            if bcrypt.checkpw(password.encode('utf-8'), hashed_password):
-                user_id = f"{isim}_{soyisim}_{email}_{yas}_{sehir}"
-                logger.info(f"Kimlik doğrulama başarılı: {user_id}")
-                return jsonify({"authenticated": True, "user_id": user_id, "is_admin": is_admin}), 200
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT id, isim, soyisim, email, yas, sehir, password, is_admin FROM users WHERE email = ?', (email,))
+            user = c.fetchone()
+
+            if user:
+                if bcrypt.checkpw(password.encode('utf-8'), user['password']):
+                    token = oturum_ac(c, user['id'], OTURUM_SURESI_SANIYE)
+                    conn.commit()
+                    logger.info(f"Kimlik doğrulama başarılı: {user['id']}")
+                    return jsonify({
+                        "authenticated": True,
+                        "user_id": user['id'],
+                        "token": token,
+                        "is_admin": user['is_admin'],
+                        "kullanici": kullanici_profili(user)
+                    }), 200
+                else:
+                    logger.warning(f"Şifre yanlış: {email}")
+                    return jsonify({"authenticated": False, "error": "Şifre yanlış! Lütfen tekrar deneyin."}), 401
             else:
-                logger.warning(f"Şifre yanlış: {email}")
-                return jsonify({"authenticated": False, "error": "Şifre yanlış! Lütfen tekrar deneyin."}), 401
-        else:
-            logger.warning(f"E-posta bulunamadı: {email}")
-            return jsonify({"authenticated": False, "error": "Bu e-posta adresiyle kayıtlı bir kullanıcı bulunamadı!"}), 404
+                logger.warning(f"E-posta bulunamadı: {email}")
+                return jsonify({"authenticated": False, "error": "Bu e-posta adresiyle kayıtlı bir kullanıcı bulunamadı!"}), 404
     except Exception as e:
         logger.error(f"Kimlik doğrulama sırasında hata: {str(e)}")
         return jsonify({"authenticated": False, "error": "Kimlik doğrulama sırasında bir hata oluştu, lütfen tekrar deneyin."}), 500
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 # Kullanıcının mevcut şifresini doğruladıktan sonra yeni şifresini veritabanında günceller.
 @app.route('/update-password', methods=['POST'])
 def update_password():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
         current_password = data.get('current_password')
         new_password = data.get('new_password')
 
-        if not all([user_id, current_password, new_password]):
+        if not all([current_password, new_password]):
             logger.warning("Şifre güncellemesi için tüm alanlar doldurulmalı!")
             return jsonify({"error": "Lütfen tüm alanları doldurun!"}), 400
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        email = user_id.split('_')[2]
-        c.execute('SELECT password FROM users WHERE email = ?', (email,))
-        user = c.fetchone()
-
-        if user and bcrypt.checkpw(current_password.encode('utf-8'), user['password']):
-            hashed_new_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
-            c.execute('UPDATE users SET password = ? WHERE email = ?', (hashed_new_password, email))
-            conn.commit()
-            logger.info(f"Şifre güncellendi: {user_id}")
-            return jsonify({"message": "Şifre başarıyla güncellendi!"}), 200
-        else:
-            logger.warning(f"Geçerli şifre yanlış: {user_id}")
-            return jsonify({"error": "Mevcut şifre yanlış! Lütfen doğru şifreyi girin."}), 401
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id = istekteki_kullanici(c, data)
+            if user_id is None:
+                logger.warning("Şifre güncellemesi için geçerli oturum gerekli")
+                return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+            c.execute('SELECT password FROM users WHERE id = ?', (user_id,))
+            user = c.fetchone()
+
+            if user and bcrypt.checkpw(current_password.encode('utf-8'), user['password']):
+                hashed_new_password = bcrypt.hashpw(new_password.encode('utf-8'), bcrypt.gensalt())
+                c.execute('UPDATE users SET password = ? WHERE id = ?', (hashed_new_password, user_id))
+                conn.commit()
+                logger.info(f"Şifre güncellendi: {user_id}")
+                return jsonify({"message": "Şifre başarıyla güncellendi!"}), 200
+            else:
+                logger.warning(f"Geçerli şifre yanlış: {user_id}")
+                return jsonify({"error": "Mevcut şifre yanlış! Lütfen doğru şifreyi girin."}), 401
     except Exception as e:
         logger.error(f"Şifre güncellenirken hata: {str(e)}")
         return jsonify({"error": "Şifre güncelleme sırasında bir hata oluştu, lütfen tekrar deneyin."}), 500
-    finally:
-        if 'conn' in locals():
-            conn.close()
 
 # Gelen metni temizler, model ile tahmin yapar ve sonucu veritabanına kaydeder.
 @app.route('/predict', methods=['POST'])
@@ -211,9 +349,9 @@ def predict():
     try:
         data = request.get_json()
         metin = data.get('text', '').strip()
-        user_id = data.get('user_id', 'anonymous')
         baslik = data.get('title', '').strip()
-        logger.info(f"/predict çağrıldı - user_id: {user_id}, baslik: {baslik[:50]}..., metin: {metin[:50]}...")
+        url = (data.get('url') or '').strip()
+        logger.info(f"/predict çağrıldı - baslik: {baslik[:50]}..., metin: {metin[:50]}...")
 
         if not metin or metin == "Metin bulunamadı":
             logger.warning("Metin boş veya geçersiz!")
@@ -222,51 +360,80 @@ def predict():
         if not baslik:
             baslik = "Başlık bulunamadı (Otomatik)"
 
-        if not model:
+        # İstek boyunca aynı model ve sürüm kullanılır; bu sırada yeni sürüme geçilse bile sonuç tutarlı kalır.
+        aktif = model_yoneticisi.guncel()
+        if not aktif:
             logger.error("Model yüklenemedi!")
             return jsonify({"error": "Analiz modeli yüklenemedi! Lütfen sistem yöneticisiyle iletişime geçin."}), 500
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('SELECT * FROM analizler WHERE user_id = ? AND baslik = ?', (user_id, baslik))
-        mevcut_analiz = c.fetchone()
-
-        if mevcut_analiz:
-            analiz = {
-                "id": mevcut_analiz['id'],
-                "user_id": mevcut_analiz['user_id'],
-                "baslik": mevcut_analiz['baslik'],
-                "metin": mevcut_analiz['metin'],
-                "durum": mevcut_analiz['durum'],
-                "derece": int(mevcut_analiz['derece']),
-                "tarih": mevcut_analiz['tarih'],
-                "error": None
-            }
-            logger.info(f"Mevcut analiz bulundu: {baslik}")
-            conn.close()
-            return jsonify(analiz), 200
-
-        temiz_metin = temizle_metin(metin)
-        tahmin = model.predict([temiz_metin])[0]
-        durum = "Olumlu" if tahmin == 0 else "Olumsuz"
-        derece = int(tahmin) if tahmin > 0 else 0
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            # Oturum anahtarı gönderilmediyse analiz anonim kullanıcıya kaydedilir; anahtarsız "user_id" reddedilir.
+            user_id = istekteki_kullanici(c, data)
+            if user_id is None:
+                if data.get('token') or data.get('user_id') or request.headers.get('Authorization'):
+                    logger.warning("Analiz için gönderilen oturum geçersiz")
+                    return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+                user_id = ANONIM_KULLANICI_ID
+
+            c.execute(ANALIZ_SORGUSU + ' WHERE analizler.user_id = ? AND analizler.baslik = ?', (user_id, baslik))
+            mevcut_analiz = c.fetchone()
+
+            if mevcut_analiz:
+                analiz = {
+                    "id": mevcut_analiz['id'],
+                    "user_id": mevcut_analiz['user_id'],
+                    "baslik": mevcut_analiz['baslik'],
+                    "metin": mevcut_analiz['metin'],
+                    "durum": mevcut_analiz['durum'],
+                    "derece": int(mevcut_analiz['derece']),
+                    "tarih": mevcut_analiz['tarih'],
+                    "model_surumu": mevcut_analiz['model_surumu'],
+                    "error": None
+                }
+                logger.info(f"Mevcut analiz bulundu: {baslik}")
+                return jsonify(analiz), 200
+
+            # Haber daha önce (başka bir kullanıcı tarafından) aynı model sürümüyle kaydedildiyse sonucu yeniden
+            # kullanılır; eski bir sürümle kaydedildiyse yeniden tahmin edilip güncellenir.
+            icerik_ozeti = icerik_ozeti_hesapla(metin)
+            c.execute('SELECT id, durum, derece FROM articles WHERE url = ? AND icerik_ozeti = ? AND model_surumu = ?',
+                      (url, icerik_ozeti, aktif.surum))
+            haber = c.fetchone()
+
+        # Model çıkarımı, bağlantı havuzdan ödünç alınmışken beklememek için veritabanı bloğunun dışında yapılır.
+        if haber:
+            article_id, durum, derece = haber['id'], haber['durum'], int(haber['derece'])
+            logger.info(f"Haber daha önce kaydedilmiş - article_id: {article_id}")
+        else:
+            temiz_metin = temizle_metin(metin)
+            onbellek_anahtari = TahminOnbellegi.anahtar(temiz_metin, aktif.surum)
+            onbellekteki = tahmin_onbellegi.getir(onbellek_anahtari)
+            if onbellekteki:
+                durum, derece = onbellekteki
+                logger.info(f"Tahmin önbellekte bulundu: {baslik}")
+            else:
+                tahmin = tahmin_birlestirici.tahmin_et(temiz_metin, TAHMIN_ZAMAN_ASIMI, aktif.model)
+                durum, derece = tahmini_yorumla(tahmin)
+                tahmin_onbellegi.kaydet(onbellek_anahtari, durum, derece, aktif.surum)
+            article_id = None
 
         tarih = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
-        try:
-            c.execute('''INSERT INTO analizler (user_id, baslik, metin, durum, derece, tarih)
-                        VALUES (?, ?, ?, ?, ?, ?)''',
-                     (user_id, baslik, metin, durum, derece, tarih))
-            conn.commit()
-            c.execute('SELECT id FROM analizler WHERE user_id = ? AND baslik = ?', (user_id, baslik))
-            analiz_id = c.fetchone()['id']
-            logger.info(f"Analiz kaydedildi - ID: {analiz_id}")
-        except sqlite3.IntegrityError:
-            logger.info(f"Bu başlık zaten analiz edilmiş: {baslik}")
-            conn.close()
-            return jsonify({"message": "Bu haber zaten analiz edilmiş."}), 200
-
-        conn.close()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            try:
+                if article_id is None:
+                    article_id = haberi_kaydet(c, url, icerik_ozeti, baslik, metin, durum, derece, tarih, aktif.surum)
+                c.execute('''INSERT INTO analizler (user_id, article_id, baslik, tarih, model_surumu, durum, derece)
+                             VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                         (user_id, article_id, baslik, tarih, aktif.surum, durum, derece))
+                conn.commit()
+                analiz_id = c.lastrowid
+                logger.info(f"Analiz kaydedildi - ID: {analiz_id}")
+            except sqlite3.IntegrityError:
+                logger.info(f"Bu başlık zaten analiz edilmiş: {baslik}")
+                return jsonify({"message": "Bu haber zaten analiz edilmiş."}), 200
 
         analiz = {
             "id": analiz_id,
@@ -276,101 +443,353 @@ def predict():
             "durum": durum,
             "derece": derece,
             "tarih": tarih,
+            "model_surumu": aktif.surum,
             "error": None
         }
         logger.info(f"Analiz tamamlandı: {durum} ({derece}/10)")
         return jsonify(analiz), 200
+    except KuyrukDolu as e:
+        logger.warning("Tahmin kuyruğu dolu, analiz isteği reddedildi")
+        return yogunluk_yaniti(e.tekrar_dene_saniye)
+    except TimeoutError:
+        logger.warning(f"Tahmin {TAHMIN_ZAMAN_ASIMI} saniyede tamamlanmadı")
+        return yogunluk_yaniti(tahmin_birlestirici.tekrar_dene_saniye)
     except Exception as e:
         logger.error(f"Analiz sırasında hata: {str(e)}")
         return jsonify({"error": "Haber analizi yapılamadı, lütfen tekrar deneyin veya sistem yöneticisiyle iletişime geçin."}), 500
 
-# Belirtilen kullanıcının veritabanında kayıtlı tüm analizlerini filtreleyerek döndürür.
+# Tek istekte gelen haber listesini birlikte temizler, tek bir model çağrısıyla tahmin eder
+# ve yeni analizlerin tamamını tek bir işlemde (transaction) veritabanına kaydeder.
+@app.route('/predict-batch', methods=['POST'])
+def predict_batch():
+    try:
+        data = request.get_json()
+        haberler = data if isinstance(data, list) else (data or {}).get('items')
+
+        if not isinstance(haberler, list) or not haberler:
+            logger.warning("Toplu analiz için haber listesi boş veya geçersiz!")
+            return jsonify({"error": "Analiz edilecek haber listesi bulunamadı!"}), 400
+
+        if len(haberler) > MAX_TOPLU_ANALIZ:
+            logger.warning(f"Toplu analiz sınırı aşıldı: {len(haberler)}")
+            return jsonify({"error": f"Tek istekte en fazla {MAX_TOPLU_ANALIZ} haber analiz edilebilir!"}), 400
+
+        aktif = model_yoneticisi.guncel()
+        if not aktif:
+            logger.error("Model yüklenemedi!")
+            return jsonify({"error": "Analiz modeli yüklenemedi! Lütfen sistem yöneticisiyle iletişime geçin."}), 500
+
+        logger.info(f"/predict-batch çağrıldı - haber sayısı: {len(haberler)}")
+
+        # Haberde oturum anahtarı yoksa isteğin üst düzeyindeki değerler kullanılır.
+        ortak_kimlik = {k: data.get(k) for k in ('token', 'user_id')} if isinstance(data, dict) else {}
+
+        with get_db_connection() as conn:
+            c = conn.cursor()
+
+            sonuclar = [None] * len(haberler)
+            yeni_haberler = {}
+            kullanicilar = {}
+            for i, haber in enumerate(haberler):
+                haber = haber if isinstance(haber, dict) else {}
+                metin = str(haber.get('text') or '').strip()
+                baslik = str(haber.get('title') or '').strip() or "Başlık bulunamadı (Otomatik)"
+                url = str(haber.get('url') or '').strip()
+
+                if not metin or metin == "Metin bulunamadı":
+                    sonuclar[i] = {"baslik": baslik, "error": "Metin bulunamadı! Lütfen geçerli bir haber metni sağlayın."}
+                    continue
+
+                kimlik = {k: haber.get(k) or ortak_kimlik.get(k) for k in ('token', 'user_id')}
+                kimlik_anahtari = (kimlik['token'], str(kimlik['user_id']))
+                if kimlik_anahtari not in kullanicilar:
+                    kullanicilar[kimlik_anahtari] = istekteki_kullanici(c, kimlik)
+                user_id = kullanicilar[kimlik_anahtari]
+                if user_id is None:
+                    if kimlik['token'] or kimlik['user_id'] or request.headers.get('Authorization'):
+                        sonuclar[i] = {"baslik": baslik, "error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}
+                        continue
+                    user_id = ANONIM_KULLANICI_ID
+
+                # Aynı istekte tekrar eden haberler yalnızca bir kez analiz edilir.
+                anahtar = (user_id, baslik)
+                if anahtar in yeni_haberler:
+                    yeni_haberler[anahtar]["indeksler"].append(i)
+                    continue
+
+                c.execute(ANALIZ_SORGUSU + ' WHERE analizler.user_id = ? AND analizler.baslik = ?', anahtar)
+                mevcut_analiz = c.fetchone()
+                if mevcut_analiz:
+                    sonuclar[i] = {
+                        "id": mevcut_analiz['id'],
+                        "user_id": mevcut_analiz['user_id'],
+                        "baslik": mevcut_analiz['baslik'],
+                        "metin": mevcut_analiz['metin'],
+                        "durum": mevcut_analiz['durum'],
+                        "derece": int(mevcut_analiz['derece']),
+                        "tarih": mevcut_analiz['tarih'],
+                        "model_surumu": mevcut_analiz['model_surumu'],
+                        "error": None
+                    }
+                    continue
+
+                yeni_haberler[anahtar] = {"metin": metin, "url": url, "icerik_ozeti": icerik_ozeti_hesapla(metin), "indeksler": [i]}
+
+            # Daha önce kaydedilmiş haberlerin sonucu articles tablosundan, kalanlar önbellekten okunur;
+            # ikisinde de bulunmayanlar tek model çağrısıyla birlikte tahmin edilir.
+            sonuc_durumlari = {}
+            eksikler = []
+            for anahtar, haber in yeni_haberler.items():
+                c.execute('SELECT id, durum, derece FROM articles WHERE url = ? AND icerik_ozeti = ? AND model_surumu = ?',
+                          (haber["url"], haber["icerik_ozeti"], aktif.surum))
+                kayitli_haber = c.fetchone()
+                if kayitli_haber:
+                    haber["article_id"] = kayitli_haber['id']
+                    sonuc_durumlari[anahtar] = (kayitli_haber['durum'], int(kayitli_haber['derece']))
+                    continue
+                temiz_metin = temizle_metin(haber["metin"])
+                onbellek_anahtari = TahminOnbellegi.anahtar(temiz_metin, aktif.surum)
+                onbellekteki = tahmin_onbellegi.getir(onbellek_anahtari)
+                if onbellekteki:
+                    sonuc_durumlari[anahtar] = onbellekteki
+                else:
+                    eksikler.append((anahtar, temiz_metin, onbellek_anahtari))
+
+        # Model çıkarımı, bağlantı havuzdan ödünç alınmışken beklememek için veritabanı bloğunun dışında yapılır.
+        if eksikler:
+            tahminler = tahmin_birlestirici.toplu_tahmin_et([temiz_metin for _, temiz_metin, _ in eksikler],
+                                                         TAHMIN_ZAMAN_ASIMI, aktif.model)
+            onbellek_kayitlari = []
+            for (anahtar, _, onbellek_anahtari), tahmin in zip(eksikler, tahminler):
+                durum, derece = tahmini_yorumla(tahmin)
+                sonuc_durumlari[anahtar] = (durum, derece)
+                onbellek_kayitlari.append((onbellek_anahtari, durum, derece))
+            tahmin_onbellegi.toplu_kaydet(onbellek_kayitlari, aktif.surum)
+
+        if yeni_haberler:
+            tarih = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+            with get_db_connection() as conn:
+                c = conn.cursor()
+                with conn:
+                    for (user_id, baslik), (durum, derece) in sonuc_durumlari.items():
+                        haber = yeni_haberler[(user_id, baslik)]
+                        metin = haber["metin"]
+                        article_id = haber.get("article_id") or haberi_kaydet(
+                            c, haber["url"], haber["icerik_ozeti"], baslik, metin, durum, derece, tarih, aktif.surum)
+                        c.execute('''INSERT OR IGNORE INTO analizler (user_id, article_id, baslik, tarih, model_surumu, durum, derece)
+                                     VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                                 (user_id, article_id, baslik, tarih, aktif.surum, durum, derece))
+                        if c.rowcount:
+                            analiz_id = c.lastrowid
+                        else:
+                            # Eşzamanlı bir istek aynı haberi bu arada kaydetmiş olabilir.
+                            c.execute('SELECT id FROM analizler WHERE user_id = ? AND baslik = ?', (user_id, baslik))
+                            analiz_id = c.fetchone()['id']
+                        analiz = {
+                            "id": analiz_id,
+                            "user_id": user_id,
+                            "baslik": baslik,
+                            "metin": metin,
+                            "durum": durum,
+                            "derece": derece,
+                            "tarih": tarih,
+                            "model_surumu": aktif.surum,
+                            "error": None
+                        }
+                        for i in yeni_haberler[(user_id, baslik)]["indeksler"]:
+                            sonuclar[i] = analiz
+
+        logger.info(f"Toplu analiz tamamlandı - toplam: {len(haberler)}, yeni: {len(yeni_haberler)}")
+        return jsonify({"analizler": sonuclar}), 200
+    except KuyrukDolu as e:
+        logger.warning("Tahmin kuyruğu dolu, toplu analiz isteği reddedildi")
+        return yogunluk_yaniti(e.tekrar_dene_saniye)
+    except TimeoutError:
+        logger.warning(f"Toplu tahmin {TAHMIN_ZAMAN_ASIMI} saniyede tamamlanmadı")
+        return yogunluk_yaniti(tahmin_birlestirici.tekrar_dene_saniye)
+    except Exception as e:
+        logger.error(f"Toplu analiz sırasında hata: {str(e)}")
+        return jsonify({"error": "Haberler analiz edilemedi, lütfen tekrar deneyin veya sistem yöneticisiyle iletişime geçin."}), 500
+
+# İstekteki "fields" değerini (virgülle ayrılmış metin veya liste) geçerli alan listesine çevirir.
+# Alan verilmezse tüm alanlar döner; imleç için "id" her zaman eklenir. Bilinmeyen alan varsa ValueError fırlatır.
+def gecmis_alanlarini_coz(fields):
+    if not fields:
+        return list(GECMIS_ALANLARI)
+    if isinstance(fields, str):
+        fields = fields.split(',')
+    alanlar = [str(alan).strip() for alan in fields if str(alan).strip()]
+    bilinmeyenler = [alan for alan in alanlar if alan not in GECMIS_ALANLARI]
+    if bilinmeyenler:
+        raise ValueError(f"Bilinmeyen alan: {', '.join(bilinmeyenler)}")
+    return ['id'] + [alan for alan in dict.fromkeys(alanlar) if alan != 'id']
+
+# Kullanıcının analiz geçmişi için WHERE koşulunu ve parametrelerini filtre türüne göre üretir.
+def gecmis_kosulu(user_id, filter_type):
+    kosul = ' WHERE analizler.user_id = ?'
+    params = [user_id]
+    if filter_type == 'olumlu':
+        kosul += ' AND analizler.durum = ?'
+        params.append('Olumlu')
+    elif filter_type == 'olumsuz':
+        kosul += ' AND analizler.durum = ?'
+        params.append('Olumsuz')
+    return kosul, params
+
+# Geçmiş analizlerin bir sayfasını en yeniden eskiye okur; after_id verilirse o kimlikten eski analizlerle devam eder.
+def gecmis_sayfasi_getir(c, user_id, filter_type, alanlar, after_id, limit):
+    kosul, params = gecmis_kosulu(user_id, filter_type)
+    if after_id:
+        kosul += ' AND analizler.id < ?'
+        params.append(after_id)
+    sutunlar = ', '.join(f"{GECMIS_ALANLARI[alan]} AS {alan}" for alan in alanlar)
+    c.execute(f'SELECT {sutunlar} FROM analizler JOIN articles ON articles.id = analizler.article_id' + kosul +
+              ' ORDER BY analizler.id DESC LIMIT ?', params + [limit])
+    return [
+        {alan: (int(satir[alan]) if alan == 'derece' else satir[alan]) for alan in alanlar}
+        for satir in c.fetchall()
+    ]
+
+# Belirtilen kullanıcının analizlerini imleç tabanlı sayfalarla (after_id, limit) en yeniden eskiye döndürür.
+# İstatistikler ilk sayfada tek bir GROUP BY sorgusuyla hesaplanır; sonraki sayfalarda tekrar hesaplanmaz.
 @app.route('/gecmis-analizler', methods=['POST'])
 def gecmis_analizler():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
         filter_type = data.get('filter_type', 'all')
 
-        if not user_id:
-            logger.warning("Geçmiş analizler için kullanıcı kimliği gerekli")
-            return jsonify({"error": "Kullanıcı kimliği gerekli! Lütfen giriş yapın."}), 400
-
-        conn = get_db_connection()
-        c = conn.cursor()
-        
-        query = 'SELECT * FROM analizler WHERE user_id = ?'
-        params = [user_id]
-        
-        if filter_type == 'olumlu':
-            query += ' AND durum = ?'
-            params.append('Olumlu')
-        elif filter_type == 'olumsuz':
-            query += ' AND durum = ?'
-            params.append('Olumsuz')
-            
-        c.execute(query, params)
-        analizler = c.fetchall()
-
-        analiz_list = [
-            {
-                "id": analiz['id'],
-                "baslik": analiz['baslik'],
-                "metin": analiz['metin'],
-                "durum": analiz['durum'],
-                "derece": int(analiz['derece']),
-                "tarih": analiz['tarih']
-            } for analiz in analizler
-        ]
-
-        istatistikler = {
-            "toplam_analiz": len(analizler),
-            "olumlu_analiz": sum(1 for a in analizler if a['durum'] == 'Olumlu'),
-            "olumsuz_analiz": sum(1 for a in analizler if a['durum'] == 'Olumsuz')
-        }
+        try:
+            alanlar = gecmis_alanlarini_coz(data.get('fields'))
+            after_id = int(data['after_id']) if data.get('after_id') else None
+            limit = min(max(int(data.get('limit') or VARSAYILAN_SAYFA_BOYUTU), 1), MAX_SAYFA_BOYUTU)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Geçmiş analizler için geçersiz parametre: {str(e)}")
+            return jsonify({"error": "Geçersiz sayfalama veya alan parametresi!"}), 400
+
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id = istekteki_kullanici(c, data)
+            if user_id is None:
+                logger.warning("Geçmiş analizler için geçerli oturum gerekli")
+                return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+
+            analiz_list = gecmis_sayfasi_getir(c, user_id, filter_type, alanlar, after_id, limit)
+            yanit = {
+                "analizler": analiz_list,
+                "sonraki_after_id": analiz_list[-1]["id"] if len(analiz_list) == limit else None
+            }
 
-        logger.info(f"Geçmiş analizler alındı - user_id: {user_id}, toplam: {len(analiz_list)}")
-        conn.close()
-        return jsonify({"analizler": analiz_list, "istatistikler": istatistikler}), 200
+            if after_id is None:
+                kosul, params = gecmis_kosulu(user_id, filter_type)
+                c.execute('SELECT analizler.durum, COUNT(*) AS adet FROM analizler' + kosul + ' GROUP BY analizler.durum', params)
+                durum_sayilari = {satir['durum']: satir['adet'] for satir in c.fetchall()}
+                yanit["istatistikler"] = {
+                    "toplam_analiz": sum(durum_sayilari.values()),
+                    "olumlu_analiz": durum_sayilari.get('Olumlu', 0),
+                    "olumsuz_analiz": durum_sayilari.get('Olumsuz', 0)
+                }
+
+            logger.info(f"Geçmiş analizler alındı - user_id: {user_id}, sayfadaki: {len(analiz_list)}, after_id: {after_id}")
+            return jsonify(yanit), 200
     except Exception as e:
         logger.error(f"Geçmiş analizler alınırken hata: {str(e)}")
         return jsonify({"error": "Geçmiş analizler yüklenemedi, lütfen tekrar deneyin."}), 500
 
-# Kullanıcının profil bilgilerini (isim, soyisim, e-posta vb.) veritabanında günceller.
+# Kullanıcının tüm analiz geçmişini dışa aktarmak için akış halinde döndürür ("format": "json" dizi, "jsonl" satır satır).
+# Satırlar parça parça okunur ve her parça için bağlantı ayrı ödünç alınır; bellek kullanımı geçmişin boyutundan bağımsızdır.
+@app.route('/gecmis-analizler-disa-aktar', methods=['POST'])
+def gecmis_analizler_disa_aktar():
+    try:
+        data = request.get_json()
+        filter_type = data.get('filter_type', 'all')
+        bicim = data.get('format', 'json')
+
+        with get_db_connection() as conn:
+            user_id = istekteki_kullanici(conn.cursor(), data)
+        if user_id is None:
+            logger.warning("Dışa aktarma için geçerli oturum gerekli")
+            return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+
+        try:
+            alanlar = gecmis_alanlarini_coz(data.get('fields'))
+        except ValueError as e:
+            logger.warning(f"Dışa aktarma için geçersiz alan: {str(e)}")
+            return jsonify({"error": "Geçersiz alan parametresi!"}), 400
+
+        if bicim not in ('json', 'jsonl'):
+            return jsonify({"error": "Desteklenmeyen dışa aktarma biçimi! (json veya jsonl)"}), 400
+
+        def uret():
+            after_id = None
+            ilk = True
+            if bicim == 'json':
+                yield '['
+            try:
+                while True:
+                    with get_db_connection() as conn:
+                        parca = gecmis_sayfasi_getir(conn.cursor(), user_id, filter_type, alanlar, after_id, DISA_AKTARMA_PARCA_BOYUTU)
+                    for analiz in parca:
+                        satir = json.dumps(analiz, ensure_ascii=False)
+                        if bicim == 'jsonl':
+                            yield satir + '\n'
+                        else:
+                            yield ('' if ilk else ',') + satir
+                        ilk = False
+                    if len(parca) < DISA_AKTARMA_PARCA_BOYUTU:
+                        break
+                    after_id = parca[-1]['id']
+            except Exception as e:
+                logger.error(f"Geçmiş analizler dışa aktarılırken hata: {str(e)}")
+                raise
+            if bicim == 'json':
+                yield ']'
+            logger.info(f"Geçmiş analizler dışa aktarıldı - user_id: {user_id}")
+
+        mimetype = 'application/x-ndjson' if bicim == 'jsonl' else 'application/json'
+        return Response(stream_with_context(uret()), mimetype=mimetype), 200
+    except Exception as e:
+        logger.error(f"Dışa aktarma başlatılırken hata: {str(e)}")
+        return jsonify({"error": "Geçmiş analizler dışa aktarılamadı, lütfen tekrar deneyin."}), 500
+
+# Oturumdaki kullanıcının veya admin panelinde seçilen kullanıcının profil bilgilerini (isim, soyisim,
+# e-posta vb.) veritabanında günceller.
 @app.route('/update-user', methods=['POST'])
 def update_user():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
         new_isim = data.get('new_isim')
         new_soyisim = data.get('new_soyisim')
         new_email = data.get('new_email')
         new_yas = data.get('new_yas')
         new_sehir = data.get('new_sehir')
 
-        if not all([user_id, new_isim, new_soyisim, new_email, new_yas, new_sehir]):
+        if not all([new_isim, new_soyisim, new_email, new_yas, new_sehir]):
             logger.warning("Kullanıcı güncelleme için tüm alanlar doldurulmalı!")
             return jsonify({"error": "Lütfen tüm alanları doldurun!"}), 400
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        old_email = user_id.split('_')[2]
-        c.execute('''UPDATE users 
-                    SET isim = ?, soyisim = ?, email = ?, yas = ?, sehir = ? 
-                    WHERE email = ?''',
-                 (new_isim, new_soyisim, new_email, new_yas, new_sehir, old_email))
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id, hata = hedef_kullanici(c, data)
+            if hata:
+                return hata
+
+            # Analizler users.id ile bağlı olduğundan profil değişikliği yalnızca users satırını günceller.
+            c.execute('''UPDATE users 
+                        SET isim = ?, soyisim = ?, email = ?, yas = ?, sehir = ? 
+                        WHERE id = ?''',
+                     (new_isim, new_soyisim, new_email, new_yas, new_sehir, user_id))
         
-        if c.rowcount == 0:
-            logger.warning(f"Kullanıcı bulunamadı: {user_id}")
-            conn.close()
-            return jsonify({"error": "Kullanıcı bulunamadı! Lütfen geçerli bir kullanıcı seçin."}), 404
-
-        c.execute('UPDATE analizler SET user_id = ? WHERE user_id = ?',
-                 (f"{new_isim}_{new_soyisim}_{new_email}_{new_yas}_{new_sehir}", user_id))
-        conn.commit()
-        logger.info(f"Kullanıcı güncellendi: {user_id} -> {new_isim}_{new_soyisim}_{new_email}_{new_yas}_{new_sehir}")
-        conn.close()
-        return jsonify({"message": "Kullanıcı bilgileri başarıyla güncellendi!"}), 200
+            if c.rowcount == 0:
+                logger.warning(f"Kullanıcı bulunamadı: {user_id}")
+                return jsonify({"error": "Kullanıcı bulunamadı! Lütfen geçerli bir kullanıcı seçin."}), 404
+
+            conn.commit()
+            logger.info(f"Kullanıcı güncellendi: {user_id}")
+            return jsonify({
+                "message": "Kullanıcı bilgileri başarıyla güncellendi!",
+                "kullanici": {"isim": new_isim, "soyisim": new_soyisim, "email": new_email, "yas": new_yas, "sehir": new_sehir}
+            }), 200
     except sqlite3.IntegrityError:
         logger.warning(f"Bu e-posta zaten kayıtlı: {new_email}")
         return jsonify({"error": "Bu e-posta zaten kullanılıyor! Lütfen başka bir e-posta seçin."}), 400
@@ -378,32 +797,29 @@ def update_user():
         logger.error(f"Kullanıcı güncellenirken hata: {str(e)}")
         return jsonify({"error": "Kullanıcı bilgileri güncellenemedi, lütfen tekrar deneyin."}), 500
 
-# Belirtilen kullanıcıyı ve ona ait tüm analizleri veritabanından siler.
+# Oturumdaki kullanıcıyı veya admin panelinde seçilen kullanıcıyı ve ona ait tüm analizleri veritabanından siler.
 @app.route('/delete-user', methods=['POST'])
 def delete_user():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
 
-        if not user_id:
-            logger.warning("Kullanıcı silme için kullanıcı kimliği gerekli")
-            return jsonify({"error": "Kullanıcı kimliği gerekli! Lütfen geçerli bir kullanıcı seçin."}), 400
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id, hata = hedef_kullanici(c, data)
+            if hata:
+                return hata
 
-        conn = get_db_connection()
-        c = conn.cursor()
-        email = user_id.split('_')[2]
-        c.execute('DELETE FROM users WHERE email = ?', (email,))
+            c.execute('DELETE FROM users WHERE id = ?', (user_id,))
         
-        if c.rowcount == 0:
-            logger.warning(f"Kullanıcı bulunamadı: {user_id}")
-            conn.close()
-            return jsonify({"error": "Kullanıcı bulunamadı! Lütfen geçerli bir kullanıcı seçin."}), 404
-
-        c.execute('DELETE FROM analizler WHERE user_id = ?', (user_id,))
-        conn.commit()
-        logger.info(f"Kullanıcı silindi: {user_id}")
-        conn.close()
-        return jsonify({"message": "Kullanıcı ve analizleri başarıyla silindi!"}), 200
+            if c.rowcount == 0:
+                logger.warning(f"Kullanıcı bulunamadı: {user_id}")
+                return jsonify({"error": "Kullanıcı bulunamadı! Lütfen geçerli bir kullanıcı seçin."}), 404
+
+            c.execute('DELETE FROM analizler WHERE user_id = ?', (user_id,))
+            c.execute('DELETE FROM oturumlar WHERE user_id = ?', (user_id,))
+            conn.commit()
+            logger.info(f"Kullanıcı silindi: {user_id}")
+            return jsonify({"message": "Kullanıcı ve analizleri başarıyla silindi!"}), 200
     except Exception as e:
         logger.error(f"Kullanıcı silinirken hata: {str(e)}")
         return jsonify({"error": "Kullanıcı silinemedi, lütfen tekrar deneyin."}), 500
@@ -413,50 +829,59 @@ def delete_user():
 def delete_all():
     try:
         data = request.get_json()
-        user_id = data.get('user_id')
-
-        if not user_id:
-            logger.warning("Tüm analizleri silmek için kullanıcı kimliği gerekli")
-            return jsonify({"error": "Kullanıcı kimliği gerekli! Lütfen giriş yapın."}), 400
-
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('DELETE FROM analizler WHERE user_id = ?', (user_id,))
-        conn.commit()
-        logger.info(f"Tüm analizler silindi: {user_id}")
-        conn.close()
-        return jsonify({"message": "Tüm analizler başarıyla silindi!"}), 200
+
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id = istekteki_kullanici(c, data)
+            if user_id is None:
+                logger.warning("Tüm analizleri silmek için geçerli oturum gerekli")
+                return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+
+            c.execute('DELETE FROM analizler WHERE user_id = ?', (user_id,))
+            conn.commit()
+            logger.info(f"Tüm analizler silindi: {user_id}")
+            return jsonify({"message": "Tüm analizler başarıyla silindi!"}), 200
     except Exception as e:
         logger.error(f"Tüm analizler silinirken hata: {str(e)}")
         return jsonify({"error": "Analizler silinemedi, lütfen tekrar deneyin."}), 500
 
-# Veritabanındaki tüm kullanıcıları analiz sayılarıyla birlikte listeler (admin yetkisi gerektirir).
+# Veritabanındaki kullanıcıları analiz sayılarıyla birlikte sayfa sayfa listeler (admin yetkisi gerektirir).
+# analiz_sayisi, analizler tablosundaki tetikleyicilerle güncel tutulan users sütunundan okunur.
 @app.route('/all-users', methods=['GET'])
 def all_users():
     try:
         search = request.args.get('search', '')
-        conn = get_db_connection()
-        c = conn.cursor()
-        query = '''SELECT isim, soyisim, email, yas, sehir, 
-                         (SELECT COUNT(*) FROM analizler WHERE user_id = 
-                          users.isim || '_' || users.soyisim || '_' || users.email || '_' || users.yas || '_' || users.sehir) as analiz_sayisi
-                  FROM users WHERE email LIKE ? OR isim LIKE ? OR soyisim LIKE ?'''
-        c.execute(query, (f'%{search}%', f'%{search}%', f'%{search}%'))
-        users = c.fetchall()
-
-        user_list = [
-            {
-                "isim": user['isim'],
-                "soyisim": user['soyisim'],
-                "email": user['email'],
-                "yas": user['yas'],
-                "sehir": user['sehir'],
-                "analiz_sayisi": user['analiz_sayisi']
-            } for user in users
-        ]
-        logger.info(f"Tüm kullanıcılar alındı, toplam: {len(user_list)}")
-        conn.close()
-        return jsonify(user_list), 200
+        sayfa = max(request.args.get('page', 1, type=int) or 1, 1)
+        limit = min(max(request.args.get('limit', VARSAYILAN_SAYFA_BOYUTU, type=int) or 1, 1), MAX_SAYFA_BOYUTU)
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            kosul, params = kullanici_arama_kosulu(search)
+            c.execute('SELECT COUNT(*) FROM users' + kosul, params)
+            toplam = c.fetchone()[0]
+
+            c.execute('SELECT id, isim, soyisim, email, yas, sehir, analiz_sayisi FROM users' + kosul +
+                      ' ORDER BY users.id LIMIT ? OFFSET ?', params + [limit, (sayfa - 1) * limit])
+            users = c.fetchall()
+
+            user_list = [
+                {
+                    "id": user['id'],
+                    "isim": user['isim'],
+                    "soyisim": user['soyisim'],
+                    "email": user['email'],
+                    "yas": user['yas'],
+                    "sehir": user['sehir'],
+                    "analiz_sayisi": user['analiz_sayisi']
+                } for user in users
+            ]
+            logger.info(f"Kullanıcılar alındı - sayfa: {sayfa}, sayfadaki: {len(user_list)}, toplam: {toplam}")
+            return jsonify({
+                "kullanicilar": user_list,
+                "toplam": toplam,
+                "sayfa": sayfa,
+                "limit": limit,
+                "toplam_sayfa": (toplam + limit - 1) // limit
+            }), 200
     except Exception as e:
         logger.error(f"Kullanıcılar alınırken hata: {str(e)}")
         return jsonify({"error": "Kullanıcı listesi alınamadı, lütfen tekrar deneyin."}), 500
@@ -465,29 +890,86 @@ def all_users():
 @app.route('/veriler-data', methods=['GET'])
 def veriler_data():
     try:
-        conn = get_db_connection()
-        c = conn.cursor()
-        c.execute('SELECT * FROM analizler ORDER BY tarih DESC LIMIT 1')
-        son_analiz = c.fetchone()
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            c.execute(ANALIZ_SORGUSU + ' ORDER BY analizler.tarih DESC LIMIT 1')
+            son_analiz = c.fetchone()
 
-        if not son_analiz:
-            logger.warning("Kayıtlı analiz bulunamadı")
-            return jsonify({"error": "Henüz analiz yapılmamış! Lütfen önce bir haber analizi yapın."}), 404
+            if not son_analiz:
+                logger.warning("Kayıtlı analiz bulunamadı")
+                return jsonify({"error": "Henüz analiz yapılmamış! Lütfen önce bir haber analizi yapın."}), 404
 
-        analiz = {
-            "baslik": son_analiz['baslik'],
-            "metin": son_analiz['metin'],
-            "durum": son_analiz['durum'],
-            "derece": int(son_analiz['derece']),
-            "tarih": son_analiz['tarih']
-        }
-        logger.info(f"Son analiz alındı: {analiz['baslik']}")
-        conn.close()
-        return jsonify(analiz), 200
+            analiz = {
+                "baslik": son_analiz['baslik'],
+                "metin": son_analiz['metin'],
+                "durum": son_analiz['durum'],
+                "derece": int(son_analiz['derece']),
+                "tarih": son_analiz['tarih']
+            }
+            logger.info(f"Son analiz alındı: {analiz['baslik']}")
+            return jsonify(analiz), 200
     except Exception as e:
         logger.error(f"Veriler alınırken hata: {str(e)}")
         return jsonify({"error": "Son analiz alınamadı, lütfen tekrar deneyin."}), 500
 
+# Tahmin birleştiricisinin toplu boyut dağılımı ve kuyruk bekleme süresi metriklerini döndürür.
+@app.route('/tahmin-metrikleri', methods=['GET'])
+def tahmin_metrikleri():
+    return jsonify(tahmin_birlestirici.metrikler()), 200
+
+# Paylaşılan tahmin önbelleğinin isabet/ıskalama sayaçlarını döndürür.
+@app.route('/onbellek-metrikleri', methods=['GET'])
+def onbellek_metrikleri():
+    return jsonify(tahmin_onbellegi.metrikler()), 200
+
+# Kayıt defterindeki model sürümlerini (tarih, doğruluk, sözlük boyutu) ve servis edilen sürümü döndürür.
+@app.route('/model-surumleri', methods=['GET'])
+def model_surumleri():
+    try:
+        aktif = model_yoneticisi.guncel()
+        return jsonify({
+            "aktif": aktif.meta if aktif else None,
+            "surumler": surumleri_listele()
+        }), 200
+    except Exception as e:
+        logger.error(f"Model sürümleri alınırken hata: {str(e)}")
+        return jsonify({"error": "Model sürümleri alınamadı!"}), 500
+
+# Oturum anahtarının sahibi admin ise modeli yeniden yükler; "surum" verilirse kayıt defterindeki o sürüme geçer.
+# Geçiş sırasında gelen istekler eski modelle yanıtlanmaya devam eder.
+@app.route('/model-yenile', methods=['POST'])
+def model_yenile():
+    try:
+        data = request.get_json(silent=True) or {}
+        with get_db_connection() as conn:
+            c = conn.cursor()
+            user_id = istekteki_kullanici(c, data)
+            yetkili = user_id is not None and admin_mi(c, user_id)
+        if user_id is None:
+            logger.warning("Model yenileme için geçerli oturum gerekli")
+            return jsonify({"error": "Oturum geçersiz veya süresi dolmuş! Lütfen tekrar giriş yapın."}), 401
+        if not yetkili:
+            logger.warning(f"Yetkisiz model yenileme isteği: {user_id}")
+            return jsonify({"error": "Bu işlem için yönetici yetkisi gerekli!"}), 403
+
+        surum = data.get('surum')
+        try:
+            if surum:
+                model_yoneticisi.surume_gec(str(surum))
+            else:
+                model_yoneticisi.yenile(zorla=True)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 404
+
+        aktif = model_yoneticisi.guncel()
+        if not aktif or (surum and aktif.surum != surum):
+            return jsonify({"error": "Model yüklenemedi! Önceki sürüm kullanılmaya devam ediyor."}), 500
+        logger.info(f"Model yenilendi (sürüm: {aktif.surum})")
+        return jsonify({"message": "Model yenilendi.", "aktif": aktif.meta}), 200
+    except Exception as e:
+        logger.error(f"Model yenilenirken hata: {str(e)}")
+        return jsonify({"error": "Model yenilenemedi, lütfen tekrar deneyin."}), 500
+
 # Web arayüzünün ana sayfasını (index.html) render eder.
 @app.route('/')
 def index():
@@ -0,0 +1,96 @@
+# arka_uc_karsilastirma.py
+#
+# Bir model sürümünün tahmin arka uçlarını (model_kayit_defteri.ARKA_UCLAR: joblib Pipeline, hızlı biçim,
+# derlenmiş ağaçlar) aynı test seti üzerinde karşılaştırır. Önce her arka ucun tahminleri joblib Pipeline'ın
+# tahminleriyle haber haber karşılaştırılır; tek bir fark bile varsa hata koduyla çıkılır. Ardından tek
+# haberlik istek gecikmesi (p50/p99, /predict gibi) ve toplu tahmin hızı ölçülür.
+# Test seti, eğitim betiğinin ayırdığı test payıdır (model_kurulumu.egitim_verisini_hazirla); sürümün eksik
+# biçimleri (hızlı, derlenmiş) ölçümden önce üretilir.
+#
+# Kullanım: python arka_uc_karsilastirma.py [--surum v0003] [--veri csv_dosyası/korpus_temiz.parquet]
+#                                           [--gecikme-adet 500] [--toplu-adet 5000]
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from model_kayit_defteri import (ARKA_UCLAR, DERLENMIS_KLASORU, HIZLI_KLASORU, KAYIT_KLASORU, aktif_surum,
+                                 derlenmis_bicimi_ekle, hizli_bicimi_ekle, surumu_arka_ucla_yukle)
+from model_kurulumu import egitim_verisini_hazirla
+
+# Tahmin fonksiyonunu metinler üzerinde tek tek çağırır; istek başına p50 ve p99 süreyi (ms) döndürür.
+def tekli_gecikme(tahmin, metinler):
+    sureler = []
+    for metin in metinler:
+        baslangic = time.perf_counter()
+        tahmin([metin])
+        sureler.append((time.perf_counter() - baslangic) * 1e3)
+    return float(np.percentile(sureler, 50)), float(np.percentile(sureler, 99))
+
+# Tahmin fonksiyonunu bütün metinlerle tek seferde çağırır; saniyedeki haber sayısını döndürür.
+def toplu_hiz(tahmin, metinler):
+    baslangic = time.perf_counter()
+    tahmin(metinler)
+    return len(metinler) / (time.perf_counter() - baslangic)
+
+def main():
+    parser = argparse.ArgumentParser(description="Model tahmin arka uçlarının eşitlik ve gecikme karşılaştırması")
+    parser.add_argument('--surum', help="Model sürümü (verilmezse aktif sürüm)")
+    parser.add_argument('--veri', default="csv_dosyası/korpus_temiz.parquet",
+                        help="'metin' ve 'durum' sütunlu temizlenmiş korpus (Parquet veya CSV)")
+    parser.add_argument('--gecikme-adet', type=int, default=500, help="Tek haberlik gecikme ölçümündeki haber sayısı")
+    parser.add_argument('--toplu-adet', type=int, default=5000, help="Toplu tahmin hızı ölçümündeki haber sayısı")
+    args = parser.parse_args()
+
+    surum = args.surum or aktif_surum()
+    if not surum:
+        print("[HATA] Kayıt defterinde aktif model sürümü yok (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+    if not os.path.exists(args.veri):
+        print(f"[HATA] Veri bulunamadı: {args.veri} (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+    if not os.path.isdir(os.path.join(KAYIT_KLASORU, surum, HIZLI_KLASORU)):
+        print(f"{surum} için hızlı biçim üretiliyor...")
+        hizli_bicimi_ekle(surum)
+    if not os.path.isdir(os.path.join(KAYIT_KLASORU, surum, DERLENMIS_KLASORU)):
+        print(f"{surum} için ağaçlar derleniyor...")
+        try:
+            derlenmis_bicimi_ekle(surum)
+        except Exception as e:
+            print(f"[UYARI] Ağaçlar derlenemedi, derlenmiş arka uç atlanacak: {str(e)}")
+
+    df = pd.read_parquet(args.veri) if args.veri.endswith('.parquet') else pd.read_csv(args.veri)
+    df = df.dropna(subset=["metin", "durum"])
+    df["durum"] = df["durum"].astype(int)
+    metinler = egitim_verisini_hazirla(df)[1].tolist()
+
+    modeller = {}
+    for arka_uc in ARKA_UCLAR:
+        model, kullanilan = surumu_arka_ucla_yukle(surum, arka_uc=arka_uc)
+        if kullanilan != arka_uc:
+            print(f"[UYARI] '{arka_uc}' arka ucu yüklenemedi, karşılaştırmadan çıkarıldı.")
+            continue
+        modeller[arka_uc] = model
+
+    beklenen = modeller['joblib'].predict(metinler)
+    for arka_uc, model in modeller.items():
+        farkli = int((model.predict(metinler) != beklenen).sum())
+        if farkli:
+            print(f"[HATA] {farkli}/{len(metinler)} test haberinde '{arka_uc}' tahmini joblib Pipeline'dan farklı.")
+            return 1
+    print(f"Sürüm: {surum}, {len(modeller)} arka ucun tahminleri {len(metinler)} test haberinde birebir aynı\n")
+
+    print(f"{'Arka uç':<12}{'p50':>10}{'p99':>10}{'toplu (haber/s)':>17}")
+    for arka_uc, model in modeller.items():
+        p50, p99 = tekli_gecikme(model.predict, metinler[:args.gecikme_adet])
+        hiz = toplu_hiz(model.predict, metinler[:args.toplu_adet])
+        print(f"{arka_uc:<12}{p50:>8.3f}ms{p99:>8.3f}ms{hiz:>17.0f}")
+    print("\np50/p99: temizlenmiş metinden tahmine tek haberlik çağrı; sunucuda MODEL_ARKA_UCU ile seçilir.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,246 @@
+# artimli_egitim.py
+#
+# Modeli baştan eğitmek yerine yalnızca son modelden bu yana etiketlenen haberlerle günceller.
+# Yeni etiketler iki kaynaktan toplanır:
+#   - Etiketleme aracının (json_dosyası/app.py) etiketlediği TRNews.AANews.json, etiket günlüğüyle
+#     birleştirilmiş haliyle (etiket_gunlugu.py); son eğitimdeki etiket görüntüsüyle karşılaştırılarak
+#     eklenen/değişen kayıtlar bulunur.
+#   - Sunucunun veritabanındaki (ANALIZ_DB_YOLU, varsayılan analizler.db) analizler tablosu; son eğitimde
+#     görülen en büyük analiz kimliğinden sonraki satırlar.
+#     Bu satırların etiketi modelin kendi tahminidir (derece); model kendi çıktısıyla eğitilmesin diye
+#     varsayılan olarak kullanılmaz, --analizler-dahil ile eklenir.
+# TF-IDF sözlüğü dondurulur (yeniden fit edilmez), kayıtlı XGBClassifier'a yeni ağaçlar eklenerek eğitim
+# sürdürülür ve sonuç model kayıt defterine (model_kayit_defteri.py) yeni bir sürüm olarak eklenir.
+# Yeni örneklerin bir kısmı (--dogrulama-orani) ayrılır; önceki model ile kalan örneklerle güncellenen
+# modelin doğruluğu bu ayrılmış örneklerde ölçülür. Kaydedilen sürüm ise ölçümden sonra ayrılanlar dahil
+# bütün yeni örneklerle temel modelden yeniden güncellenir; böylece hiçbir yeni etiket eğitimden düşmez.
+#
+# Kullanım: python artimli_egitim.py [--tur 20] [--analizler-dahil] [--yayinla]
+#           python artimli_egitim.py --baslat   (tam eğitimden sonra mevcut etiketleri "görüldü" sayar)
+
+import argparse
+import copy
+import json
+import os
+import sqlite3
+import sys
+from collections import Counter
+from datetime import datetime
+
+import joblib
+import numpy as np
+import xgboost
+from sklearn.model_selection import train_test_split
+
+from korpus_yukleyici import DURUM_ALANI, haberi_dogrula, kayitlari_oku
+from metin_temizleme import normalize_et
+from model_kayit_defteri import ESKI_MODEL_YOLU, aktif_surum, surum_adlari, surumu_kaydet, surumu_yukle
+
+DURUM_YOLU = "csv_dosyası/artimli_egitim_durumu.json"
+ETIKET_DOSYASI = "json_dosyası/TRNews.AANews.json"
+# Sunucuyla (app.py) aynı veritabanı.
+VERITABANI_YOLU = os.environ.get('ANALIZ_DB_YOLU', 'analizler.db')
+
+# Güncellemede eklenen varsayılan ağaç (boosting turu) sayısı.
+VARSAYILAN_TUR = 20
+# Yeni örneklerden doğruluk ölçümü için eğitime katılmadan ayrılan oran.
+DOGRULAMA_ORANI = 0.2
+
+# Kayıtlı eğitim durumunu okur; dosya yoksa None döner.
+def durumu_oku(yol=DURUM_YOLU):
+    if not os.path.exists(yol):
+        return None
+    with open(yol, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# Eğitim durumunu önce geçici dosyaya yazıp atomik olarak yerine koyar.
+def durumu_yaz(durum, yol=DURUM_YOLU):
+    os.makedirs(os.path.dirname(os.path.abspath(yol)), exist_ok=True)
+    with open(yol + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(durum, f, ensure_ascii=False)
+    os.replace(yol + ".tmp", yol)
+
+# Etiketleme dosyasındaki her kaydın kimliğini ve etiketini {ID: Durum} görüntüsü olarak döndürür.
+def etiket_goruntusu(dosya_yolu=ETIKET_DOSYASI):
+    if not os.path.exists(dosya_yolu):
+        return {}
+    return {str(kayit.get("ID")): kayit.get(DURUM_ALANI) for kayit in kayitlari_oku(dosya_yolu)
+            if isinstance(kayit, dict) and "ID" in kayit}
+
+# Etiketleme dosyasında önceki görüntüye göre eklenen veya etiketi değişen geçerli haberleri (metin, durum)
+# listesi olarak ve dosyanın güncel görüntüsüyle birlikte döndürür. Dosya bir kez okunur; böylece eğitim
+# sırasında yapılan etiketlemeler bir sonraki çalıştırmaya kalır.
+def yeni_etiketli_haberler(onceki_goruntu, dosya_yolu=ETIKET_DOSYASI):
+    haberler, goruntu = [], {}
+    if not os.path.exists(dosya_yolu):
+        return haberler, goruntu
+    for kayit in kayitlari_oku(dosya_yolu):
+        if not isinstance(kayit, dict) or "ID" not in kayit:
+            continue
+        kimlik, etiket = str(kayit["ID"]), kayit.get(DURUM_ALANI)
+        goruntu[kimlik] = etiket
+        if kimlik in onceki_goruntu and onceki_goruntu[kimlik] == etiket:
+            continue
+        sonuc = haberi_dogrula(kayit)
+        if sonuc:
+            haberler.append(sonuc)
+    return haberler, goruntu
+
+# analizler tablosundaki en büyük analiz kimliğini döndürür; veritabanı yoksa 0 döner.
+def son_analiz_id(vt_yolu=VERITABANI_YOLU):
+    if not os.path.exists(vt_yolu):
+        return 0
+    conn = sqlite3.connect(vt_yolu)
+    try:
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM analizler").fetchone()[0]
+    finally:
+        conn.close()
+
+# (onceki_id, son_id] aralığında eklenen analizlerin haber metinlerini ve sonuçlarını (metin, derece) olarak
+# döndürür. Aynı habere bağlı birden fazla analiz tek örnek sayılır; sonucu en son analizden alınır.
+def yeni_analizler(onceki_id, son_id, vt_yolu=VERITABANI_YOLU):
+    if not os.path.exists(vt_yolu):
+        return []
+    conn = sqlite3.connect(vt_yolu)
+    try:
+        satirlar = conn.execute('''SELECT articles.metin, analizler.derece FROM analizler
+                                   JOIN articles ON articles.id = analizler.article_id
+                                   WHERE analizler.id IN (SELECT MAX(id) FROM analizler WHERE id > ? AND id <= ?
+                                                          GROUP BY article_id)
+                                   AND articles.metin IS NOT NULL AND analizler.derece IS NOT NULL''',
+                                (onceki_id, son_id)).fetchall()
+    finally:
+        conn.close()
+    return [(metin, int(derece)) for metin, derece in satirlar if metin and metin.strip()]
+
+# Yeni örnekleri sabit tohumla eğitim ve doğrulama kısımlarına ayırır; (egitim, dogrulama) döndürür.
+# Her sınıfta en az iki örnek varsa katmanlı ayrılır. Doğrulamaya bir örnek bile düşmüyorsa bütün örnekler
+# eğitimde kullanılır ve doğrulama kısmı boş döner.
+def dogrulama_ayir(haberler, oran=DOGRULAMA_ORANI):
+    dogrulama_sayisi = int(len(haberler) * oran)
+    if dogrulama_sayisi < 1:
+        return haberler, []
+    etiketler = [etiket for _, etiket in haberler]
+    sinif_sayilari = Counter(etiketler)
+    katmanli = (min(sinif_sayilari.values()) >= 2
+                and len(sinif_sayilari) <= dogrulama_sayisi <= len(haberler) - len(sinif_sayilari))
+    return train_test_split(haberler, test_size=dogrulama_sayisi, random_state=42,
+                            stratify=etiketler if katmanli else None)
+
+# Modelin (metin, etiket) örneklerindeki doğruluğunu döndürür; örnek yoksa None döner.
+def dogruluk_olc(pipeline, haberler):
+    if not haberler:
+        return None
+    metinler = [normalize_et(metin) for metin, _ in haberler]
+    return float(np.mean(pipeline.predict(metinler) == np.asarray([etiket for _, etiket in haberler])))
+
+# Mevcut etiketleri ve analizleri "görülmüş" sayan başlangıç durumunu kaydeder. Tam eğitimden
+# (XGBoost-model-egitimi.py) sonra çağrılır; böylece sonraki artımlı eğitim yalnızca yeni etiketleri kullanır.
+# surum verilmezse kayıt defterindeki aktif sürüm (o da yoksa eski tek dosyalık model) temel alınır.
+def baslangic_durumunu_kaydet(surum=None):
+    surum = surum or aktif_surum()
+    durum = {
+        "model_surumu": surum,
+        "son_analiz_id": son_analiz_id(),
+        "etiket_goruntusu": etiket_goruntusu(),
+        "gecmis": [{"model_surumu": surum, "tarih": datetime.now().isoformat(), "tam_egitim": True}]
+    }
+    durumu_yaz(durum)
+    return durum
+
+# Kayıtlı Pipeline'ın (TF-IDF + XGBClassifier) kopyasını, dondurulmuş sözlükle dönüştürülen yeni örnekler
+# üzerinde tur sayısı kadar ek ağaçla eğitir ve güncellenmiş Pipeline'ı döndürür.
+def modeli_guncelle(pipeline, metinler, etiketler, tur=VARSAYILAN_TUR):
+    yeni_pipeline = copy.deepcopy(pipeline)
+    siniflandirici = yeni_pipeline.steps[-1][1]
+    X = yeni_pipeline[:-1].transform(metinler)
+    # Yeni örneklerde bütün sınıflar bulunmayabilir; XGBClassifier.fit sınıfların 0..k aralığını eksiksiz
+    # görmek istediği için eğitim doğrudan booster üzerinden sürdürülür.
+    parametreler = {k: v for k, v in siniflandirici.get_xgb_params().items() if v is not None}
+    veri = xgboost.DMatrix(X, label=np.asarray(etiketler))
+    siniflandirici._Booster = xgboost.train(parametreler, veri, num_boost_round=tur,
+                                            xgb_model=siniflandirici.get_booster())
+    siniflandirici.n_estimators = siniflandirici.get_booster().num_boosted_rounds()
+    return yeni_pipeline
+
+# Durumda kayıtlı temel modeli yükler; sürüm yoksa eski tek dosyalık model kullanılır.
+def temel_modeli_yukle(surum):
+    if surum and surum in surum_adlari():
+        return surumu_yukle(surum)
+    return joblib.load(ESKI_MODEL_YOLU)
+
+def main():
+    parser = argparse.ArgumentParser(description="Yeni etiketlerle artımlı model eğitimi")
+    parser.add_argument('--tur', type=int, default=VARSAYILAN_TUR, help="Eklenecek boosting turu sayısı")
+    parser.add_argument('--analizler-dahil', action='store_true',
+                        help="analizler tablosundaki sonuçları da kullan (etiketleri modelin kendi tahminidir)")
+    parser.add_argument('--min-ornek', type=int, default=1, help="Bu sayıdan az yeni örnek varsa eğitme")
+    parser.add_argument('--dogrulama-orani', type=float, default=DOGRULAMA_ORANI,
+                        help="Doğruluk ölçümü için eğitime katılmadan ayrılan yeni örnek oranı")
+    parser.add_argument('--yayinla', action='store_true',
+                        help="Yeni sürümü servis edilecek sürüm yap (çalışan sunucu kendiliğinden geçer)")
+    parser.add_argument('--baslat', action='store_true',
+                        help="Mevcut etiketleri görülmüş say ve başlangıç durumunu kaydet")
+    args = parser.parse_args()
+
+    durum = durumu_oku()
+    if args.baslat or durum is None:
+        durum = baslangic_durumunu_kaydet()
+        print(f"Başlangıç durumu kaydedildi: {DURUM_YOLU} ({len(durum['etiket_goruntusu'])} etiket, "
+              f"son analiz id: {durum['son_analiz_id']}). Yeni etiketlerden sonra tekrar çalıştırın.")
+        return 0
+
+    haberler, goruntu = yeni_etiketli_haberler(durum["etiket_goruntusu"])
+    print(f"Etiketleme aracından {len(haberler)} yeni/değişen etiket bulundu.")
+    yeni_son_analiz_id = son_analiz_id()
+    if args.analizler_dahil:
+        analizler = yeni_analizler(durum["son_analiz_id"], yeni_son_analiz_id)
+        print(f"analizler tablosundan {len(analizler)} yeni haber bulundu.")
+        haberler.extend(analizler)
+
+    if len(haberler) < args.min_ornek:
+        print(f"Yeterli yeni örnek yok ({len(haberler)} < {args.min_ornek}); model güncellenmedi.")
+        return 0
+
+    egitim, dogrulama = dogrulama_ayir(haberler, args.dogrulama_orani)
+    pipeline = temel_modeli_yukle(durum["model_surumu"])
+    onceki_dogruluk = dogruluk_olc(pipeline, dogrulama)
+
+    sonraki_dogruluk = None
+    if dogrulama:
+        print(f"Doğruluk ölçümü: {len(egitim)} örnekle {args.tur} tur ek eğitim yapılıyor "
+              f"({len(dogrulama)} örnek doğrulamaya ayrıldı)...")
+        olcum_pipeline = modeli_guncelle(pipeline, [normalize_et(metin) for metin, _ in egitim],
+                                         [etiket for _, etiket in egitim], args.tur)
+        sonraki_dogruluk = dogruluk_olc(olcum_pipeline, dogrulama)
+        print(f"Ayrılmış yeni örneklerde doğruluk: {onceki_dogruluk:.3f} -> {sonraki_dogruluk:.3f}")
+    else:
+        print("Doğrulamaya ayrılacak kadar yeni örnek yok; doğruluk ölçülmedi.")
+
+    print(f"Kaydedilecek sürüm bütün {len(haberler)} yeni örnekle {args.tur} tur ek eğitimle güncelleniyor...")
+    yeni_pipeline = modeli_guncelle(pipeline, [normalize_et(metin) for metin, _ in haberler],
+                                    [etiket for _, etiket in haberler], args.tur)
+
+    surum = surumu_kaydet(yeni_pipeline, kaynak="artimli_egitim", aktif_et=args.yayinla, ek_bilgi={
+        "temel_surum": durum["model_surumu"],
+        "yeni_ornek": len(haberler),
+        "dogrulama_ornegi": len(dogrulama),
+        "tur": args.tur,
+        "dogrulamada_dogruluk_once": onceki_dogruluk,
+        "dogrulamada_dogruluk": sonraki_dogruluk
+    })
+    print(f"Model kayıt defterine eklendi: {surum}" + (" (servis edilecek sürüm yapıldı)" if args.yayinla else ""))
+
+    durum.update({
+        "model_surumu": surum,
+        "son_analiz_id": yeni_son_analiz_id,
+        "etiket_goruntusu": goruntu
+    })
+    durum["gecmis"].append({"model_surumu": surum, "tarih": datetime.now().isoformat(),
+                            "yeni_ornek": len(haberler), "dogrulama_ornegi": len(dogrulama), "tur": args.tur,
+                            "dogruluk_once": onceki_dogruluk, "dogruluk_sonra": sonraki_dogruluk})
+    durumu_yaz(durum)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
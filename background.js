@@ -95,7 +95,7 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
     }
 
     if (message.action === "analyzeContent") {
-        chrome.storage.local.get(['userId', 'blockNegativeContent'], (data) => {
+        chrome.storage.local.get(['userId', 'token', 'blockNegativeContent'], (data) => {
             const userId = data.userId;
             const blockNegativeContent = data.blockNegativeContent !== false;
             if (!userId) {
@@ -108,12 +108,21 @@ chrome.runtime.onMessage.addListener((message, sender, sendResponse) => {
             const controller = new AbortController();
             const timeoutId = setTimeout(() => controller.abort(), 10000);
 
-            fetch('http://127.0.0.1:5000/predict', {
+            // Sunucu yoğunken (503) Retry-After kadar bekleyip en fazla iki kez yeniden dener.
+            const analizIste = (kalanDeneme) => fetch('http://127.0.0.1:5000/predict', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ text: content, user_id: userId, title: title }),
+                body: JSON.stringify({ text: content, token: data.token, title: title, url: url }),
                 signal: controller.signal
-            })
+            }).then(res => {
+                if (res.status === 503 && kalanDeneme > 0) {
+                    const bekleme = (parseInt(res.headers.get('Retry-After'), 10) || 1) * 1000;
+                    return new Promise(resolve => setTimeout(resolve, bekleme)).then(() => analizIste(kalanDeneme - 1));
+                }
+                return res;
+            });
+
+            analizIste(2)
                 .then(res => {
                     clearTimeout(timeoutId);
                     if (!res.ok) throw new Error(`HTTP hatası: ${res.status}`);
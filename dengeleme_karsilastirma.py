@@ -0,0 +1,110 @@
+# dengeleme_karsilastirma.py
+#
+# Sınıf dengeleme yöntemlerini (model_kurulumu.DENGELEME_YONTEMLERI) bellek, süre ve doğruluk açısından
+# karşılaştırır. Bütün yöntemler aynı test setiyle ölçülür: korpustaki benzersiz haberlerin katmanlı %20'si.
+# "kopya" yöntemi de burada yalnızca eğitim payına uygulanır; böylece aynı haberin kopyaları test setine
+# sızmaz ve doğruluk farkı yalnızca dengeleme yönteminden gelir. Her yöntem ayrı bir süreçte eğitilir, tepe
+# bellek (RSS) ölçümleri birbirini etkilemez.
+#
+# Kullanım: python dengeleme_karsilastirma.py [--veri csv_dosyası/korpus_temiz.parquet]
+#                                             [--yontemler kopya,satir,agirlik] [--ozellik-asamasi tfidf]
+
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.pipeline import Pipeline
+
+from model_benchmark import bellek_mb
+from model_kurulumu import (DENGELEME_YONTEMLERI, HEDEF_SINIF_ORNEGI, OZELLIK_ASAMALARI, OZELLIK_ASAMASI,
+                            TEST_ORANI, egitim_test_ayir, ornek_agirliklari, ozellik_adimlari, sinif_dengesini_sagla,
+                            xgboost_olustur)
+
+# Temizlenmiş korpusu okur.
+def korpusu_oku(veri_yolu):
+    df = pd.read_parquet(veri_yolu) if veri_yolu.endswith('.parquet') else pd.read_csv(veri_yolu)
+    df = df.dropna(subset=["metin", "durum"])
+    df["durum"] = df["durum"].astype(int)
+    return df
+
+# Bir dengeleme yöntemiyle modeli eğitip ölçer. Ayrı bir süreçte çalıştırılır.
+def yontemi_olc(yontem, veri_yolu, asama):
+    baslangic_bellek = bellek_mb("VmRSS")
+    X_train, X_test, y_train, y_test = egitim_test_ayir(korpusu_oku(veri_yolu))
+    hedef = round(HEDEF_SINIF_ORNEGI * (1 - TEST_ORANI))
+
+    baslangic = time.perf_counter()
+    if yontem == 'kopya':
+        dengeli = sinif_dengesini_sagla(pd.DataFrame({"metin": X_train, "durum": y_train}), hedef)
+        X_train, y_train, agirliklar = dengeli["metin"], dengeli["durum"], None
+    else:
+        agirliklar = ornek_agirliklari(y_train, yontem, hedef)
+    dengeleme_suresi = time.perf_counter() - baslangic
+
+    ozellik = Pipeline(ozellik_adimlari(asama))
+    baslangic = time.perf_counter()
+    X_egitim = ozellik.fit_transform(X_train)
+    vektorlestirme_suresi = time.perf_counter() - baslangic
+
+    model = xgboost_olustur()
+    baslangic = time.perf_counter()
+    model.fit(X_egitim, y_train, sample_weight=agirliklar)
+    egitim_suresi = time.perf_counter() - baslangic
+    y_pred = model.predict(ozellik.transform(X_test))
+
+    tepe_bellek = bellek_mb("VmHWM")
+    return {
+        "egitim_satiri": X_egitim.shape[0],
+        "nnz": int(X_egitim.nnz),
+        "matris_mb": (X_egitim.data.nbytes + X_egitim.indices.nbytes + X_egitim.indptr.nbytes) / 1024 / 1024,
+        "dogruluk": accuracy_score(y_test, y_pred),
+        "makro_f1": f1_score(y_test, y_pred, average='macro', zero_division=0),
+        "dengeleme_s": dengeleme_suresi,
+        "vektorlestirme_s": vektorlestirme_suresi,
+        "egitim_s": egitim_suresi,
+        "tepe_bellek_mb": tepe_bellek,
+        "ek_bellek_mb": tepe_bellek - baslangic_bellek if tepe_bellek is not None else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Sınıf dengeleme yöntemlerinin bellek ve doğruluk karşılaştırması")
+    parser.add_argument('--veri', default="csv_dosyası/korpus_temiz.parquet",
+                        help="'metin' ve 'durum' sütunlu temizlenmiş korpus (Parquet veya CSV)")
+    parser.add_argument('--yontemler', default=",".join(DENGELEME_YONTEMLERI[::-1]),
+                        help=f"Virgülle ayrılmış dengeleme yöntemleri ({', '.join(DENGELEME_YONTEMLERI)})")
+    parser.add_argument('--ozellik-asamasi', default=OZELLIK_ASAMASI, choices=OZELLIK_ASAMALARI)
+    args = parser.parse_args()
+
+    yontemler = [ad.strip() for ad in args.yontemler.split(",") if ad.strip()]
+    bilinmeyen = [ad for ad in yontemler if ad not in DENGELEME_YONTEMLERI]
+    if bilinmeyen:
+        print(f"[HATA] Bilinmeyen dengeleme yöntemi: {', '.join(bilinmeyen)}")
+        return 1
+    if not os.path.exists(args.veri):
+        print(f"[HATA] Veri bulunamadı: {args.veri} (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+
+    sonuclar = []
+    baglam = multiprocessing.get_context("spawn")
+    for yontem in yontemler:
+        print(f"{yontem} eğitiliyor...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=baglam) as havuz:
+            sonuclar.append((yontem, havuz.submit(yontemi_olc, yontem, args.veri, args.ozellik_asamasi).result()))
+
+    print(f"\n{'Yöntem':<10}{'satır':>9}{'nnz':>12}{'matris':>10}{'doğruluk':>10}{'makro F1':>10}"
+          f"{'vektör.':>9}{'eğitim':>9}{'tepe RSS':>11}{'ek RSS':>10}")
+    for yontem, s in sonuclar:
+        print(f"{yontem:<10}{s['egitim_satiri']:>9}{s['nnz']:>12}{s['matris_mb']:>8.1f}MB{s['dogruluk']:>10.4f}"
+              f"{s['makro_f1']:>10.4f}{s['vektorlestirme_s']:>8.1f}s{s['egitim_s']:>8.1f}s"
+              f"{s['tepe_bellek_mb'] or 0:>9.0f}MB{s['ek_bellek_mb'] or 0:>8.0f}MB")
+    print(f"\nTest seti: benzersiz haberlerin %{TEST_ORANI * 100:.0f}'si (bütün yöntemlerde aynı). "
+          "ek RSS: ölçüm sürecinin başlangıcına göre tepe bellek artışı.")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,99 @@
+# derlenmis_model.py
+#
+# Hızlı model biçiminin (hizli_model.py) ağaçlarını Treelite ile C'ye çevirip paylaşımlı kütüphane olarak
+# derleyen isteğe bağlı tahmin arka ucu. Özellik aşaması HizliModel'deki gibi sklearn'süz üretilir, yalnızca
+# dolu sütunlar CSR olarak derlenmiş kütüphaneye verilir; ağaçlar NumPy yerine derlenmiş kodla gezilir.
+# Derlenmiş biçim sürüm klasöründe hızlı biçimin yanında tutulur:
+#     csv_dosyası/modeller/v0003/derlenmis/ayarlar.json   ağaç/sınıf sayısı, derleyici sürümleri
+#     csv_dosyası/modeller/v0003/derlenmis/agaclar.so     tl2cgen ile derlenmiş ağaçlar
+# Derleme için treelite, tl2cgen ve bir C derleyicisi (gcc) gerekir; sunucuda yalnızca tl2cgen gerekir.
+# Kütüphane açılamazsa kayıt defteri (model_kayit_defteri.surumu_yukle) hızlı biçime, o da yoksa joblib'e
+# döner. Çıktı Pipeline.predict ile aynıdır; tests/test_arka_uclar.py küçük bir sürümde, arka_uc_karsilastirma.py
+# gerçek test setinde doğrular.
+#
+# Kullanım: python derlenmis_model.py --surum v0003   (kayıt defterindeki bir sürümü derler)
+
+import argparse
+import json
+import os
+import sys
+import threading
+
+import numpy as np
+import scipy.sparse
+
+from hizli_model import BOOSTER_DOSYASI, HizliModel
+
+DERLENMIS_BICIM_SURUMU = 1
+KUTUPHANE_DOSYASI = 'agaclar.so'
+AYARLAR_DOSYASI = 'ayarlar.json'
+DERLEYICI = os.environ.get('MODEL_DERLEYICI', 'gcc')
+
+# Hızlı biçimdeki booster'ı Treelite ile derleyip klasöre yazar. Yalnızca hızlı biçimin kullandığı ağaçlar
+# (erken durdurmada en iyi tura kadar olanlar) derlenir.
+def derle(hizli_klasor, klasor, derleyici=DERLEYICI):
+    import tl2cgen
+    import treelite
+    import xgboost
+
+    with open(os.path.join(hizli_klasor, 'ayarlar.json'), 'r', encoding='utf-8') as f:
+        hizli_ayarlar = json.load(f)
+    agac_sayisi = len(np.load(os.path.join(hizli_klasor, 'agac_kokler.npy'), mmap_mode='r'))
+    sinif_sayisi = hizli_ayarlar['sinif_sayisi']
+    booster = xgboost.Booster(model_file=os.path.join(hizli_klasor, BOOSTER_DOSYASI))
+    booster = booster[:agac_sayisi // sinif_sayisi]
+
+    os.makedirs(klasor, exist_ok=True)
+    tl2cgen.export_lib(treelite.frontend.from_xgboost(booster), toolchain=derleyici,
+                       libpath=os.path.join(klasor, KUTUPHANE_DOSYASI), params={'parallel_comp': os.cpu_count() or 1})
+    ayarlar = {
+        "bicim_surumu": DERLENMIS_BICIM_SURUMU,
+        "agac_sayisi": agac_sayisi,
+        "sinif_sayisi": sinif_sayisi,
+        "sutun_sayisi": hizli_ayarlar['sutun_sayisi'],
+        "treelite": treelite.__version__,
+        "tl2cgen": tl2cgen.__version__,
+    }
+    with open(os.path.join(klasor, AYARLAR_DOSYASI), 'w', encoding='utf-8') as f:
+        json.dump(ayarlar, f, ensure_ascii=False)
+    return klasor
+
+# Derlenmiş ağaçlarla tahmin yapan model; özellikleri HizliModel üretir, arayüzü Pipeline ile aynıdır.
+# tl2cgen tahmincisi aynı anda tek iş parçacığından çağrılabildiği için çağrılar kilitle sıralanır.
+class DerlenmisModel(HizliModel):
+    def __init__(self, hizli_klasor, klasor):
+        import tl2cgen
+
+        super().__init__(hizli_klasor)
+        with open(os.path.join(klasor, AYARLAR_DOSYASI), 'r', encoding='utf-8') as f:
+            self.derleme_ayarlari = json.load(f)
+        if self.derleme_ayarlari.get("bicim_surumu") != DERLENMIS_BICIM_SURUMU:
+            raise ValueError(f"Desteklenmeyen derlenmiş model biçimi: {self.derleme_ayarlari.get('bicim_surumu')}")
+        if self.derleme_ayarlari['agac_sayisi'] != len(self.kokler):
+            raise ValueError("Derlenmiş kütüphane hızlı biçimdeki ağaçlarla eşleşmiyor.")
+        self._tl2cgen = tl2cgen
+        self._tahminci = tl2cgen.Predictor(os.path.join(klasor, KUTUPHANE_DOSYASI), nthread=1)
+        self._kilit = threading.Lock()
+
+    # Her metin için sınıf başına marjı (ham skor) derlenmiş ağaçlarla hesaplar.
+    def marjlar(self, metinler):
+        data, indices, indptr = self.seyrek_ozellikler(metinler)
+        X = scipy.sparse.csr_matrix((data, indices, indptr), shape=(len(metinler), self.ayarlar['sutun_sayisi']))
+        # tl2cgen dizileri kopyasız (NumPy 2'de copy=False) ve C türleriyle (unsigned int, size_t) okur.
+        X.indices, X.indptr = indices.astype(np.uintc), indptr.astype(np.uintp)
+        veri = self._tl2cgen.DMatrix(X, dtype='float32')
+        with self._kilit:
+            marj = self._tahminci.predict(veri, pred_margin=True)
+        return np.asarray(marj, dtype=np.float32).reshape(len(metinler), -1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıt defterindeki bir model sürümünün ağaçlarını derler")
+    parser.add_argument('--surum', required=True, help="Model sürümü (örn. v0003)")
+    args = parser.parse_args()
+
+    from model_kayit_defteri import derlenmis_bicimi_ekle
+    print(f"Derlenmiş biçim yazıldı: {derlenmis_bicimi_ekle(args.surum)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
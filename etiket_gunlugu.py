@@ -0,0 +1,163 @@
+# etiket_gunlugu.py
+#
+# Etiketleme aracının (json_dosyası/app.py) verdiği etiketler için yalnızca sona eklenen etiket günlüğü.
+# Her etiket korpus dosyasının yanındaki JSON-lines günlüğüne tek satır olarak eklenir:
+#     json_dosyası/TRNews.AANews.json                 -> korpus (JSON dizisi veya JSON-lines)
+#     json_dosyası/TRNews.AANews.etiketler.jsonl      -> {"ID": ..., "Durum": ..., "zaman": ...} satırları
+# Aynı kaydın sonraki etiketi öncekini geçersiz kılar. Korpusu okuyan yükleyiciler (korpus_yukleyici.py)
+# günlüğü korpusla birleştirerek okur; sıkıştırma (sikistir) günlükteki etiketleri korpusa yazıp günlüğü
+# boşaltır. Sıkıştırma sırasında eklenen satırlar yeni günlüğe taşınır; günlük korpusa ikinci kez uygulansa
+# da sonuç değişmediğinden okuyucular hiçbir anda tutarsız etiket görmez.
+# Süreçler arası kilit için fcntl kullanılır; fcntl olmayan sistemlerde kilit yalnızca süreç içindedir.
+#
+# Kullanım: python etiket_gunlugu.py [--korpus json_dosyası/TRNews.AANews.json] [--sikistir]
+
+import argparse
+import json
+import os
+import sys
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+GUNLUK_UZANTISI = '.etiketler.jsonl'
+KIMLIK_ALANI = 'ID'
+DURUM_ALANI = 'Durum'
+
+# Korpus dosyasının etiket günlüğünün yolunu döndürür.
+def gunluk_yolu(korpus_yolu):
+    return os.path.splitext(korpus_yolu)[0] + GUNLUK_UZANTISI
+
+# Günlüğü (istenirse yalnızca ilk boyut baytını) okuyup her kaydın son etiketini {str(ID): Durum} olarak
+# döndürür. Yarım yazılmış veya çözülemeyen satırlar atlanır; günlük yoksa boş sözlük döner.
+def gunluk_etiketleri(yol, boyut=None):
+    etiketler = {}
+    try:
+        with open(yol, 'rb') as f:
+            veri = f.read() if boyut is None else f.read(boyut)
+    except FileNotFoundError:
+        return etiketler
+    for satir in veri.splitlines():
+        try:
+            kayit = json.loads(satir)
+            etiketler[str(kayit[KIMLIK_ALANI])] = kayit[DURUM_ALANI]
+        except (ValueError, KeyError, TypeError):
+            continue
+    return etiketler
+
+# Ham kayıtlara günlükteki son etiketleri uygular; ID'si günlükte olmayan kayıtlar olduğu gibi geçer.
+def etiketleri_uygula(kayitlar, etiketler):
+    for kayit in kayitlar:
+        if etiketler and isinstance(kayit, dict) and str(kayit.get(KIMLIK_ALANI)) in etiketler:
+            kayit[DURUM_ALANI] = etiketler[str(kayit[KIMLIK_ALANI])]
+        yield kayit
+
+# Bir korpus dosyasının etiket günlüğü. ekle() etiketi tek satır yazımıyla günlüğe ekler (korpus yeniden
+# yazılmaz); sikistir() günlüğü korpusa işler. Aynı günlüğü kullanan iş parçacıkları ve süreçler güvenle
+# birlikte yazabilir.
+class EtiketGunlugu:
+    def __init__(self, korpus_yolu, yol=None):
+        self.korpus_yolu = korpus_yolu
+        self.yol = yol or gunluk_yolu(korpus_yolu)
+        self._kilit = threading.Lock()
+        self._sikistirma_kilidi = threading.Lock()
+        # Korpusa işlenmemiş satır sayısı (bu süreçten görülen); sıkıştırma zamanlaması için kullanılır.
+        self.bekleyen = self.satir_sayisi()
+
+    # Süreç içi kilidi ve (varsa) ad dosyasındaki süreçler arası kilidi birlikte tutar.
+    @contextmanager
+    def _kilitli(self, ad='kilit', kilit=None):
+        with kilit or self._kilit:
+            if fcntl is None:
+                yield
+                return
+            with open(f"{self.yol}.{ad}", 'a') as kilit_dosyasi:
+                fcntl.flock(kilit_dosyasi, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(kilit_dosyasi, fcntl.LOCK_UN)
+
+    # Günlükteki satır sayısını döndürür.
+    def satir_sayisi(self):
+        try:
+            with open(self.yol, 'rb') as f:
+                return sum(1 for _ in f)
+        except FileNotFoundError:
+            return 0
+
+    # Kaydın etiketini günlüğe ekler.
+    def ekle(self, kimlik, durum):
+        satir = json.dumps({KIMLIK_ALANI: kimlik, DURUM_ALANI: durum,
+                            "zaman": datetime.now().isoformat(timespec='seconds')}, ensure_ascii=False) + '\n'
+        with self._kilitli():
+            with open(self.yol, 'a', encoding='utf-8') as f:
+                f.write(satir)
+            self.bekleyen += 1
+
+    # Günlükteki etiketleri korpus dosyasına işler ve işlenen satırları günlükten çıkarır; korpusa uygulanan
+    # etiketli kayıt sayısını döndürür. Korpus akış halinde okunup geçici dosyaya aynı biçimde (JSON dizisi ise
+    # indent=4 ile) yazılır ve atomik olarak yerine taşınır; bu sırada ekle() beklemeden çalışmaya devam eder.
+    def sikistir(self):
+        from korpus_yukleyici import json_dizisi_mi, kayitlari_oku
+
+        with self._kilitli('sikistirma.kilit', self._sikistirma_kilidi):
+            with self._kilitli():
+                boyut = os.path.getsize(self.yol) if os.path.exists(self.yol) else 0
+            if not boyut:
+                return 0
+            etiketler = gunluk_etiketleri(self.yol, boyut)
+
+            dizi = json_dizisi_mi(self.korpus_yolu)
+            gecici = f"{self.korpus_yolu}.{os.getpid()}.tmp"
+            uygulanan, sira = 0, -1
+            with open(gecici, 'w', encoding='utf-8') as f:
+                f.write('[' if dizi else '')
+                for sira, kayit in enumerate(kayitlari_oku(self.korpus_yolu, gunluk=False)):
+                    if isinstance(kayit, dict) and str(kayit.get(KIMLIK_ALANI)) in etiketler:
+                        kayit[DURUM_ALANI] = etiketler[str(kayit[KIMLIK_ALANI])]
+                        uygulanan += 1
+                    if dizi:
+                        f.write((',\n    ' if sira else '\n    ')
+                                + json.dumps(kayit, ensure_ascii=False, indent=4).replace('\n', '\n    '))
+                    else:
+                        f.write(json.dumps(kayit, ensure_ascii=False) + '\n')
+                if dizi:
+                    f.write('\n]' if sira >= 0 else ']')
+            os.replace(gecici, self.korpus_yolu)
+
+            # Sıkıştırma sırasında eklenen satırlar yeni günlüğe taşınır.
+            with self._kilitli():
+                with open(self.yol, 'rb') as f:
+                    f.seek(boyut)
+                    kalan = f.read()
+                with open(self.yol + '.tmp', 'wb') as f:
+                    f.write(kalan)
+                os.replace(self.yol + '.tmp', self.yol)
+                self.bekleyen = kalan.count(b'\n')
+            return uygulanan
+
+def main():
+    parser = argparse.ArgumentParser(description="Etiket günlüğünün durumu ve korpusa işlenmesi")
+    parser.add_argument('--korpus', default=os.path.join('json_dosyası', 'TRNews.AANews.json'),
+                        help="Etiketlenen korpus dosyası")
+    parser.add_argument('--sikistir', action='store_true', help="Günlükteki etiketleri korpusa işler")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.korpus):
+        print(f"[HATA] Korpus bulunamadı: {args.korpus}")
+        return 1
+    gunluk = EtiketGunlugu(args.korpus)
+    print(f"Günlük: {gunluk.yol} ({gunluk.satir_sayisi()} satır, "
+          f"{len(gunluk_etiketleri(gunluk.yol))} kayıt)")
+    if args.sikistir:
+        print(f"Korpusa işlenen etiketli kayıt: {gunluk.sikistir()}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
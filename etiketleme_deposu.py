@@ -0,0 +1,186 @@
+# etiketleme_deposu.py
+#
+# Etiketleme aracının (json_dosyası/app.py) haberleri sayfa sayfa sunmak için kullandığı SQLite deposu.
+# Korpus (TRNews.AANews.json) bellekte liste olarak tutulmaz; bir kez akış halinde okunup haberler tablosuna
+# yazılır ve sayfalar (id, durum) indeksleri üzerinden imleç tabanlı (after_id) okunur. Depo korpusun
+# boyutu ve değiştirilme zamanıyla işaretlenir; korpus değişince (ör. etiket günlüğü sıkıştırıldığında)
+# açılışta yeniden kurulur. Etiket günlüğündeki (etiket_gunlugu.py) etiketler açılışta depoya uygulanır;
+# günlük, korpusa işlenene kadar etiketlerin asıl kaynağıdır, depo yalnızca görüntüdür.
+# Aktif öğrenme (aktif_ogrenme.py) için etiketsiz haberlerin model belirsizliği skorları, skoru üreten model
+# sürümüyle birlikte belirsizlik tablosunda tutulur; kuyruk (skor) indeksinden en belirsizden başlayarak okunur.
+
+import os
+
+from etiket_gunlugu import gunluk_etiketleri, gunluk_yolu
+from korpus_yukleyici import MAX_DURUM, MIN_DURUM, kayitlari_oku
+from veritabani import BaglantiHavuzu
+
+# Kurulumda tek işlemde yazılan haber sayısı.
+KURULUM_PARCA_BOYUTU = 5000
+
+# Sayfa filtreleri: bütün haberler, henüz etiketlenmemiş haberler, etiketlenmiş haberler.
+FILTRELER = ('all', 'etiketsiz', 'etiketli')
+
+HABERLER_TABLOSU = '''CREATE TABLE IF NOT EXISTS haberler
+                        (id INTEGER PRIMARY KEY,
+                         baslik TEXT,
+                         metin TEXT,
+                         durum INTEGER)'''
+DURUM_INDEKSI = 'CREATE INDEX IF NOT EXISTS idx_haberler_durum ON haberler (durum, id)'
+DEPO_BILGI_TABLOSU = 'CREATE TABLE IF NOT EXISTS depo_bilgi (anahtar TEXT PRIMARY KEY, deger TEXT)'
+BELIRSIZLIK_TABLOSU = '''CREATE TABLE IF NOT EXISTS belirsizlik
+                           (id INTEGER PRIMARY KEY,
+                            skor REAL NOT NULL,
+                            model_surumu TEXT NOT NULL)'''
+BELIRSIZLIK_INDEKSI = 'CREATE INDEX IF NOT EXISTS idx_belirsizlik_skor ON belirsizlik (skor DESC, id)'
+
+# Etiket değerini 0-10 aralığında tam sayıya çevirir; geçersizse (boş, aralık dışı) None döner.
+def durumu_coz(durum):
+    try:
+        durum_int = int(float(str(durum)))
+    except (ValueError, TypeError):
+        return None
+    return durum_int if MIN_DURUM <= durum_int <= MAX_DURUM else None
+
+# Korpus dosyasının boyut ve değiştirilme zamanından depo işaretini üretir.
+def korpus_imzasi(korpus_yolu):
+    bilgi = os.stat(korpus_yolu)
+    return f"{os.path.abspath(korpus_yolu)}|{bilgi.st_size}|{bilgi.st_mtime_ns}"
+
+# Etiketleme korpusunun SQLite görüntüsü. Bağlantılar veritabani.BaglantiHavuzu ile paylaşılır.
+class EtiketlemeDeposu:
+    def __init__(self, korpus_yolu, db_yolu=None):
+        self.korpus_yolu = korpus_yolu
+        self.db_yolu = db_yolu or os.path.splitext(korpus_yolu)[0] + '.etiketleme.db'
+        self.havuz = BaglantiHavuzu(self.db_yolu)
+
+    # Tabloları oluşturur, korpus değiştiyse depoyu yeniden kurar ve etiket günlüğünü uygular.
+    # Yeniden kurulduysa True döner.
+    def hazirla(self):
+        with self.havuz.baglanti() as conn:
+            conn.execute(HABERLER_TABLOSU)
+            conn.execute(DURUM_INDEKSI)
+            conn.execute(DEPO_BILGI_TABLOSU)
+            conn.execute(BELIRSIZLIK_TABLOSU)
+            conn.execute(BELIRSIZLIK_INDEKSI)
+            conn.commit()
+            satir = conn.execute("SELECT deger FROM depo_bilgi WHERE anahtar = 'korpus'").fetchone()
+            imza = korpus_imzasi(self.korpus_yolu)
+            yeniden_kuruldu = satir is None or satir['deger'] != imza
+            if yeniden_kuruldu:
+                self._kur(conn, imza)
+            etiketler = gunluk_etiketleri(gunluk_yolu(self.korpus_yolu))
+            conn.executemany('UPDATE haberler SET durum = ? WHERE id = ?',
+                             [(durumu_coz(durum), int(kimlik)) for kimlik, durum in etiketler.items()
+                              if kimlik.lstrip('-').isdigit()])
+            conn.commit()
+        return yeniden_kuruldu
+
+    # Korpusu akış halinde okuyup haberler tablosunu baştan yazar. Tamsayı olmayan ID'li kayıtlar atlanır.
+    def _kur(self, conn, imza):
+        conn.execute('DELETE FROM haberler')
+        parca = []
+        for kayit in kayitlari_oku(self.korpus_yolu, gunluk=False):
+            if not isinstance(kayit, dict):
+                continue
+            try:
+                kimlik = int(kayit.get('ID'))
+            except (ValueError, TypeError):
+                continue
+            parca.append((kimlik, kayit.get('Title'), kayit.get('Body'), durumu_coz(kayit.get('Durum'))))
+            if len(parca) >= KURULUM_PARCA_BOYUTU:
+                conn.executemany('INSERT OR REPLACE INTO haberler VALUES (?, ?, ?, ?)', parca)
+                parca = []
+        conn.executemany('INSERT OR REPLACE INTO haberler VALUES (?, ?, ?, ?)', parca)
+        conn.execute("INSERT OR REPLACE INTO depo_bilgi VALUES ('korpus', ?)", (imza,))
+        conn.commit()
+
+    # Haberlerin bir sayfasını ID sırasıyla döndürür; after_id verilirse o ID'den sonrakilerle devam eder.
+    # filter_type FILTRELER'den biridir; durum verilirse yalnızca o etiketteki haberler döner.
+    def sayfa(self, after_id=None, limit=50, filter_type='all', durum=None):
+        if filter_type not in FILTRELER:
+            raise ValueError(f"Bilinmeyen filtre: {filter_type}")
+        kosullar, params = [], []
+        if durum is not None:
+            kosullar.append('durum = ?')
+            params.append(durum)
+        elif filter_type == 'etiketsiz':
+            kosullar.append('durum IS NULL')
+        elif filter_type == 'etiketli':
+            kosullar.append('durum IS NOT NULL')
+        if after_id is not None:
+            kosullar.append('id > ?')
+            params.append(after_id)
+        kosul = (' WHERE ' + ' AND '.join(kosullar)) if kosullar else ''
+        with self.havuz.baglanti() as conn:
+            satirlar = conn.execute(f'SELECT id, baslik, metin, durum FROM haberler{kosul} ORDER BY id LIMIT ?',
+                                    params + [limit]).fetchall()
+        return [{"ID": s['id'], "Title": s['baslik'], "Body": s['metin'], "Durum": s['durum']} for s in satirlar]
+
+    # Etiket dağılımını {durum: adet} olarak döndürür; etiketsiz haberler None anahtarındadır.
+    def ozet(self):
+        with self.havuz.baglanti() as conn:
+            return {s['durum']: s['adet'] for s in
+                    conn.execute('SELECT durum, COUNT(*) AS adet FROM haberler GROUP BY durum').fetchall()}
+
+    # Haberin depoda olup olmadığını döndürür.
+    def var_mi(self, kimlik):
+        with self.havuz.baglanti() as conn:
+            return conn.execute('SELECT 1 FROM haberler WHERE id = ?', (kimlik,)).fetchone() is not None
+
+    # Haberin etiketini depoda günceller.
+    def etiketle(self, kimlik, durum):
+        with self.havuz.baglanti() as conn:
+            conn.execute('UPDATE haberler SET durum = ? WHERE id = ?', (durumu_coz(durum), kimlik))
+            conn.commit()
+
+    # Depo işaretini korpusun güncel haline çeker. Depo zaten güncelken korpus yeniden yazıldığında
+    # (etiket günlüğü sıkıştırıldığında) çağrılır; böylece sonraki açılışta depo boşuna yeniden kurulmaz.
+    def imzayi_yenile(self):
+        with self.havuz.baglanti() as conn:
+            conn.execute("INSERT OR REPLACE INTO depo_bilgi VALUES ('korpus', ?)",
+                         (korpus_imzasi(self.korpus_yolu),))
+            conn.commit()
+
+    # Skoru olmayan veya başka bir model sürümüyle üretilmiş etiketsiz haberlerden en fazla limit tanesini
+    # ID sırasıyla (id, metin) olarak döndürür; after_id verilirse o ID'den sonrakilerle devam eder.
+    def puanlanacaklar(self, model_surumu, after_id=None, limit=2000):
+        with self.havuz.baglanti() as conn:
+            satirlar = conn.execute('''SELECT haberler.id, haberler.metin FROM haberler
+                                      LEFT JOIN belirsizlik ON belirsizlik.id = haberler.id
+                                      WHERE haberler.durum IS NULL AND haberler.id > ?
+                                      AND (belirsizlik.model_surumu IS NULL OR belirsizlik.model_surumu != ?)
+                                      ORDER BY haberler.id LIMIT ?''',
+                                    (-1 if after_id is None else after_id, model_surumu, limit)).fetchall()
+        return [(s['id'], s['metin']) for s in satirlar]
+
+    # (id, skor) çiftlerini skoru üreten model sürümüyle birlikte yazar; eski skorların yerine geçer.
+    def skorlari_kaydet(self, skorlar, model_surumu):
+        with self.havuz.baglanti() as conn:
+            conn.executemany('INSERT OR REPLACE INTO belirsizlik VALUES (?, ?, ?)',
+                             [(kimlik, float(skor), model_surumu) for kimlik, skor in skorlar])
+            conn.commit()
+
+    # Belirsizliği en yüksek etiketsiz haberlerden en fazla limit tanesini döndürür; haric'teki ID'ler atlanır.
+    def en_belirsizler(self, limit=20, haric=()):
+        haric = set(haric)
+        with self.havuz.baglanti() as conn:
+            satirlar = conn.execute('''SELECT haberler.id, haberler.baslik, haberler.metin, belirsizlik.skor,
+                                             belirsizlik.model_surumu
+                                      FROM belirsizlik JOIN haberler ON haberler.id = belirsizlik.id
+                                      WHERE haberler.durum IS NULL
+                                      ORDER BY belirsizlik.skor DESC, belirsizlik.id LIMIT ?''',
+                                    (limit + len(haric),)).fetchall()
+        return [{"ID": s['id'], "Title": s['baslik'], "Body": s['metin'], "Durum": None,
+                 "Belirsizlik": s['skor'], "model_surumu": s['model_surumu']}
+                for s in satirlar if s['id'] not in haric][:limit]
+
+    # Etiketsiz haberlerin kaçının verilen model sürümüyle, kaçının eski bir sürümle puanlandığını döndürür.
+    def puanlama_ozeti(self, model_surumu):
+        with self.havuz.baglanti() as conn:
+            satir = conn.execute('''SELECT COUNT(*) AS etiketsiz,
+                                          SUM(belirsizlik.model_surumu = ?) AS guncel,
+                                          SUM(belirsizlik.model_surumu != ?) AS eski
+                                   FROM haberler LEFT JOIN belirsizlik ON belirsizlik.id = haberler.id
+                                   WHERE haberler.durum IS NULL''', (model_surumu, model_surumu)).fetchone()
+        return {"etiketsiz": satir['etiketsiz'], "guncel": satir['guncel'] or 0, "eski": satir['eski'] or 0}
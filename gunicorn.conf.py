@@ -0,0 +1,45 @@
+# gunicorn.conf.py
+#
+# app.py için üretim sunucusu ayarları (geliştirmede "python app.py" kullanılmaya devam edilir).
+# Ön çatallamalı (pre-fork) çalışır: uygulama, yani model ve veritabanı şeması ana süreçte bir kez yüklenir
+# (preload_app) ve işçiler çatallanınca modelin bellekteki sayfaları copy-on-write ile paylaşılır; N işçi
+# N model kopyası demek değildir. Veritabanı bağlantıları ve arka plan iş parçacıkları çatallandıktan sonra
+# her işçide açılır (app.catallandiktan_sonra). SIGTERM ile kapanışta işçiler yeni istek almayı bırakır ve
+# devam eden /predict çağrılarını graceful_timeout süresi içinde tamamlar.
+# Her işçi birden fazla iş parçacığıyla (gthread) çalışır; böylece aynı işçiye gelen eşzamanlı /predict
+# istekleri tahmin birleştiricisinde (tahmin_kuyrugu.py) tek toplu tahminde birleşir.
+#
+# Kullanım: gunicorn -c gunicorn.conf.py
+#           WEB_ISCI_SAYISI=4 WEB_IS_PARCACIGI_SAYISI=8 WEB_ADRES=0.0.0.0:8000 gunicorn -c gunicorn.conf.py
+
+import multiprocessing
+import os
+
+# Uygulama içe aktarılmadan önce okunduğundan üretimde varsayılan günlük seviyesi burada belirlenir.
+os.environ.setdefault('LOG_SEVIYESI', 'INFO')
+
+wsgi_app = 'app:app'
+bind = os.environ.get('WEB_ADRES', '127.0.0.1:5000')
+workers = int(os.environ.get('WEB_ISCI_SAYISI', multiprocessing.cpu_count()))
+worker_class = 'gthread'
+threads = int(os.environ.get('WEB_IS_PARCACIGI_SAYISI', 8))
+preload_app = True
+timeout = int(os.environ.get('WEB_ZAMAN_ASIMI', 60))
+graceful_timeout = int(os.environ.get('WEB_KAPANIS_SURESI', 30))
+keepalive = 5
+# İşçiler belirli sayıda istekten sonra yenilenir; yeni işçi ana süreçteki modeli yeniden paylaşır.
+max_requests = int(os.environ.get('WEB_MAX_ISTEK', 0))
+max_requests_jitter = max_requests // 10
+loglevel = os.environ['LOG_SEVIYESI'].lower()
+
+def pre_fork(server, worker):
+    import app
+    app.catallanmadan_once()
+
+def post_fork(server, worker):
+    import app
+    app.catallandiktan_sonra()
+
+def worker_exit(server, worker):
+    import app
+    app.kapanis()
@@ -0,0 +1,344 @@
+# hizli_model.py
+#
+# TF-IDF + XGBoost Pipeline'ı için hızlı açılan model biçimi ve yalnızca NumPy ile çalışan yükleyici.
+# joblib ile saklanan Pipeline'ı açmak sklearn'ü (xgboost üzerinden pandas'ı da) içe aktarır ve sözlüğü
+# Python nesneleri halinde unpickle eder; app.py'nin ve her işçi sürecinin açılış süresini bu belirler.
+# Bu biçimde model bir klasörde düz dosyalar olarak tutulur:
+#     ayarlar.json      vektörleştirici ayarları, sınıf sayısı, sınıf başına taban skor
+#     terimler.txt      sözlük terimleri, sütun sırasıyla satır satır (yalnızca TfidfVectorizer)
+#     idf.npy           IDF vektörü (float32); np.load(mmap_mode='r') ile kopyalanmadan açılır
+#     agac_*.npy        bütün ağaçların düğümleri düz diziler halinde (özellik, eşik, çocuklar, eksik değer
+#                       yönü, yaprak değeri) ve ağaçların kullandığı özellik sütunları
+#     booster.ubj       XGBoost'un kendi UBJSON biçiminde booster (inceleme ve yeniden eğitim için)
+# HizliModel sklearn ve xgboost içe aktarmadan özellikleri üretir ve ağaçları NumPy ile değerlendirir;
+# çıktısı Pipeline.predict ile aynıdır. Dışa aktarma (disa_aktar) eğitim tarafında çalışır ve xgboost gerektirir.
+# Desteklenen özellik aşamaları (model_kurulumu.py): TfidfVectorizer ve HashingVectorizer + TfidfTransformer.
+# Özellik özetlemede terimin sütunu sklearn'deki gibi MurmurHash3 ile hesaplanır; sözlük tutulmaz.
+#
+# Kullanım: python hizli_model.py --surum v0003   (kayıt defterindeki bir sürüm için hızlı biçimi üretir)
+
+import argparse
+import functools
+import json
+import os
+import re
+import sys
+from collections import Counter
+
+import numpy as np
+
+BICIM_SURUMU = 1
+AYARLAR_DOSYASI = 'ayarlar.json'
+TERIMLER_DOSYASI = 'terimler.txt'
+BOOSTER_DOSYASI = 'booster.ubj'
+AGAC_DIZILERI = ('ozellik', 'esik', 'sol', 'sag', 'varsayilan_sol', 'yaprak', 'kokler', 'siniflar', 'sutunlar')
+
+# Özellik özetlemede süreç başına önbelleğe alınan en fazla terim sayısı; bellek kullanımı sabit kalır.
+SUTUN_ONBELLEGI = 1 << 16
+
+# sklearn.utils.murmurhash3_32 ile aynı (MurmurHash3 x86 32 bit, işaretli) özet.
+def murmurhash3_32(veri, tohum=0):
+    maske = 0xFFFFFFFF
+    h = tohum & maske
+    blok_sonu = len(veri) & ~3
+    for i in range(0, blok_sonu, 4):
+        k = (int.from_bytes(veri[i:i + 4], 'little') * 0xcc9e2d51) & maske
+        k = (((k << 15) | (k >> 17)) & maske) * 0x1b873593 & maske
+        h ^= k
+        h = ((((h << 13) | (h >> 19)) & maske) * 5 + 0xe6546b64) & maske
+    if len(veri) & 3:
+        k = (int.from_bytes(veri[blok_sonu:], 'little') * 0xcc9e2d51) & maske
+        h ^= (((k << 15) | (k >> 17)) & maske) * 0x1b873593 & maske
+    h ^= len(veri)
+    h = ((h ^ (h >> 16)) * 0x85ebca6b) & maske
+    h = ((h ^ (h >> 13)) * 0xc2b2ae35) & maske
+    h ^= h >> 16
+    return h - (1 << 32) if h & 0x80000000 else h
+
+# Pipeline'ın özellik aşamasını çözer ve bu biçimle birebir taklit edilebilir olup olmadığını denetler.
+# (tür, vektörleştirici, IDF ağırlıklandırıcısı) döndürür; desteklenmeyen yapıda ValueError verir.
+def _ozellik_asamasini_coz(pipeline):
+    adimlar = [adim for _, adim in pipeline.steps[:-1]]
+    if len(adimlar) == 1 and hasattr(adimlar[0], 'vocabulary_') and hasattr(adimlar[0], 'idf_'):
+        tur, vektorlestirici, agirliklandirici = 'tfidf', adimlar[0], adimlar[0]
+    elif (len(adimlar) == 2 and type(adimlar[0]).__name__ == 'HashingVectorizer'
+          and hasattr(adimlar[1], 'idf_')):
+        tur, vektorlestirici, agirliklandirici = 'hashing', adimlar[0], adimlar[1]
+        if vektorlestirici.norm is not None:
+            raise ValueError("HashingVectorizer norm=None olmalıdır; normlama TfidfTransformer'da yapılır.")
+        if vektorlestirici.alternate_sign and agirliklandirici.sublinear_tf:
+            raise ValueError("İşaretli özellik özetleme sublinear_tf ile desteklenmez.")
+    else:
+        raise ValueError("Özellik aşaması TfidfVectorizer veya HashingVectorizer + TfidfTransformer olmalıdır.")
+    ayarlar = vektorlestirici.get_params()
+    if ayarlar['analyzer'] != 'word' or ayarlar['tokenizer'] or ayarlar['preprocessor'] or ayarlar['strip_accents']:
+        raise ValueError("Yalnızca varsayılan kelime çözümleyicili vektörleştiriciler desteklenir.")
+    if agirliklandirici.norm not in ('l1', 'l2', None):
+        raise ValueError(f"Desteklenmeyen norm: {agirliklandirici.norm}")
+    return tur, vektorlestirici, agirliklandirici
+
+# Booster'ın JSON dökümündeki ağaçları düz dizilere çevirir. Yaprakların iki çocuğu da kendisidir; böylece
+# sabit sayıda adımda bütün ağaçlar birlikte yapraklara iner. Düğümlerin özellik numaraları, ağaçların
+# kullandığı sütunların (sutunlar) sırasına çevrilir; tahminde yalnızca bu sütunlar üretilir.
+def _agaclari_duzlestir(model_json, agac_sayisi):
+    agaclar = model_json['learner']['gradient_booster']['model']['trees'][:agac_sayisi]
+    sinif_bilgisi = model_json['learner']['gradient_booster']['model']['tree_info'][:agac_sayisi]
+    ozellik, esik, sol, sag, varsayilan_sol, yaprak, kokler = [], [], [], [], [], [], []
+    max_derinlik = 0
+    for agac in agaclar:
+        if any(agac.get('split_type', [])):
+            raise ValueError("Kategorik bölünmeli ağaçlar desteklenmez.")
+        baslangic = len(ozellik)
+        kokler.append(baslangic)
+        derinlikler = [0] * len(agac['left_children'])
+        for i, (l, r) in enumerate(zip(agac['left_children'], agac['right_children'])):
+            if l == -1:
+                ozellik.append(0)
+                esik.append(0.0)
+                sol.append(baslangic + i)
+                sag.append(baslangic + i)
+                varsayilan_sol.append(True)
+                yaprak.append(agac['split_conditions'][i])
+            else:
+                ozellik.append(agac['split_indices'][i])
+                esik.append(agac['split_conditions'][i])
+                sol.append(baslangic + l)
+                sag.append(baslangic + r)
+                varsayilan_sol.append(bool(agac['default_left'][i]))
+                yaprak.append(0.0)
+                derinlikler[l] = derinlikler[r] = derinlikler[i] + 1
+                max_derinlik = max(max_derinlik, derinlikler[i] + 1)
+    ozellik = np.asarray(ozellik, dtype=np.int64)
+    ic_dugum = np.asarray(sol) != np.arange(len(sol))
+    sutunlar = np.unique(ozellik[ic_dugum]) if ic_dugum.any() else np.zeros(1, dtype=np.int64)
+    return {
+        'ozellik': np.where(ic_dugum, np.searchsorted(sutunlar, ozellik), 0).astype(np.int32),
+        'esik': np.asarray(esik, dtype=np.float32),
+        'sol': np.asarray(sol, dtype=np.int32),
+        'sag': np.asarray(sag, dtype=np.int32),
+        'varsayilan_sol': np.asarray(varsayilan_sol, dtype=bool),
+        'yaprak': np.asarray(yaprak, dtype=np.float32),
+        'kokler': np.asarray(kokler, dtype=np.int32),
+        'siniflar': np.asarray(sinif_bilgisi, dtype=np.int32),
+        'sutunlar': sutunlar.astype(np.int32),
+    }, max_derinlik
+
+# Hiç özelliği olmayan (bütün değerleri eksik) bir satır için ağaç yapraklarının sınıf başına toplamı.
+def _eksik_satir_toplami(diziler, sinif_sayisi):
+    toplam = np.zeros(sinif_sayisi, dtype=np.float32)
+    for kok, sinif in zip(diziler['kokler'], diziler['siniflar']):
+        dugum = kok
+        while diziler['sol'][dugum] != dugum:
+            dugum = diziler['sol'][dugum] if diziler['varsayilan_sol'][dugum] else diziler['sag'][dugum]
+        toplam[sinif] += diziler['yaprak'][dugum]
+    return toplam
+
+# Eğitilmiş Pipeline(özellik aşaması, XGBClassifier) modelini hızlı biçimde klasöre yazar.
+# Desteklenmeyen bir model yapısında ValueError verir.
+def disa_aktar(pipeline, klasor):
+    import scipy.sparse
+    import xgboost
+
+    tur, vektorlestirici, agirliklandirici = _ozellik_asamasini_coz(pipeline)
+    siniflandirici = pipeline.steps[-1][1]
+    sutun_sayisi = len(agirliklandirici.idf_)
+    booster = siniflandirici.get_booster()
+    model_json = json.loads(booster.save_raw('json').decode('utf-8'))
+    amac = model_json['learner']['objective']['name']
+    if model_json['learner']['gradient_booster']['name'] != 'gbtree' or amac not in ('multi:softmax', 'multi:softprob'):
+        raise ValueError(f"Desteklenmeyen booster/amaç: {amac}")
+    sinif_sayisi = int(model_json['learner']['learner_model_param']['num_class'])
+
+    # predict, erken durdurma varsa yalnızca en iyi tura kadar olan ağaçları kullanır.
+    agac_sinirlari = model_json['learner']['gradient_booster']['model']['iteration_indptr']
+    try:
+        tur_sayisi = siniflandirici.best_iteration + 1
+    except AttributeError:
+        tur_sayisi = len(agac_sinirlari) - 1
+    diziler, max_derinlik = _agaclari_duzlestir(model_json, agac_sinirlari[tur_sayisi])
+
+    # Taban skor (base_score) sürüme ve amaca göre farklı saklandığından, hiç özelliği olmayan bir satırın
+    # XGBoost marjından ağaç toplamı çıkarılarak sınıf başına ölçülür.
+    bos_satir = scipy.sparse.csr_matrix((1, sutun_sayisi), dtype=np.float32)
+    marj = booster.predict(xgboost.DMatrix(bos_satir), output_margin=True, iteration_range=(0, tur_sayisi))
+    taban_skor = np.asarray(marj, dtype=np.float32).reshape(-1) - _eksik_satir_toplami(diziler, sinif_sayisi)
+
+    ayarlar = vektorlestirici.get_params()
+    os.makedirs(klasor, exist_ok=True)
+    if tur == 'tfidf':
+        terimler = [None] * sutun_sayisi
+        for terim, sutun in vektorlestirici.vocabulary_.items():
+            terimler[sutun] = terim
+        with open(os.path.join(klasor, TERIMLER_DOSYASI), 'w', encoding='utf-8') as f:
+            f.write('\n'.join(terimler))
+    np.save(os.path.join(klasor, 'idf.npy'), np.asarray(agirliklandirici.idf_, dtype=np.float32))
+    for ad, dizi in diziler.items():
+        np.save(os.path.join(klasor, f'agac_{ad}.npy'), dizi)
+    booster.save_model(os.path.join(klasor, BOOSTER_DOSYASI))
+
+    yeni_ayarlar = {
+        "bicim_surumu": BICIM_SURUMU,
+        "vektorlestirici": tur,
+        "sutun_sayisi": sutun_sayisi,
+        "alternate_sign": bool(ayarlar.get('alternate_sign', False)),
+        "lowercase": ayarlar['lowercase'],
+        "token_pattern": ayarlar['token_pattern'],
+        "ngram_range": list(ayarlar['ngram_range']),
+        "stop_words": sorted(vektorlestirici.get_stop_words() or []),
+        "binary": ayarlar['binary'],
+        "use_idf": agirliklandirici.use_idf,
+        "sublinear_tf": agirliklandirici.sublinear_tf,
+        "norm": agirliklandirici.norm,
+        "sinif_sayisi": sinif_sayisi,
+        "max_derinlik": max_derinlik,
+        "taban_skor": [float(x) for x in taban_skor]
+    }
+    with open(os.path.join(klasor, AYARLAR_DOSYASI), 'w', encoding='utf-8') as f:
+        json.dump(yeni_ayarlar, f, ensure_ascii=False)
+    return klasor
+
+# Hızlı biçimdeki modeli yükleyip Pipeline ile aynı arayüzle (predict) tahmin yapan sınıf.
+class HizliModel:
+    def __init__(self, klasor):
+        with open(os.path.join(klasor, AYARLAR_DOSYASI), 'r', encoding='utf-8') as f:
+            self.ayarlar = json.load(f)
+        if self.ayarlar.get("bicim_surumu") != BICIM_SURUMU:
+            raise ValueError(f"Desteklenmeyen hızlı model biçimi: {self.ayarlar.get('bicim_surumu')}")
+        self.sozluk = None
+        if self.ayarlar.get('vektorlestirici', 'tfidf') == 'tfidf':
+            with open(os.path.join(klasor, TERIMLER_DOSYASI), 'r', encoding='utf-8') as f:
+                self.sozluk = {terim: sutun for sutun, terim in enumerate(f.read().split('\n'))}
+        else:
+            self._hash_sutunu = functools.lru_cache(maxsize=SUTUN_ONBELLEGI)(self._hash_sutunu)
+        self.idf = np.load(os.path.join(klasor, 'idf.npy'), mmap_mode='r')
+        # Ağaç dizileri her tahminde rastgele erişildiği için eşlenmiş dosyadan tek seferde belleğe alınır.
+        for ad in AGAC_DIZILERI:
+            setattr(self, ad, np.array(np.load(os.path.join(klasor, f'agac_{ad}.npy'), mmap_mode='r')))
+
+        self._desen = re.compile(self.ayarlar['token_pattern'])
+        self._durak_kelimeler = frozenset(self.ayarlar['stop_words'])
+        self._sinif_matrisi = np.zeros((len(self.kokler), self.ayarlar['sinif_sayisi']), dtype=np.float32)
+        self._sinif_matrisi[np.arange(len(self.kokler)), self.siniflar] = 1.0
+        self._taban = np.asarray(self.ayarlar['taban_skor'], dtype=np.float32)
+        # Her düğümün [sağ, sol] çocukları yan yana; bir sonraki düğüm 2 * düğüm + sola_git ile tek adımda alınır.
+        self._cocuklar = np.stack([self.sag, self.sol], axis=1).ravel().astype(np.int64)
+        self._ozellik_sutunu = self.ozellik.astype(np.int64)
+
+    # Metni TfidfVectorizer'ın kelime çözümleyicisiyle aynı şekilde terimlere (n-gram) ayırır.
+    def _terimler(self, metin):
+        if self.ayarlar['lowercase']:
+            metin = metin.lower()
+        kelimeler = [k for k in self._desen.findall(metin) if k not in self._durak_kelimeler]
+        en_az, en_cok = self.ayarlar['ngram_range']
+        if en_cok == 1:
+            return kelimeler
+        terimler = kelimeler if en_az == 1 else []
+        for n in range(max(en_az, 2), min(en_cok, len(kelimeler)) + 1):
+            terimler.extend(' '.join(kelimeler[i:i + n]) for i in range(len(kelimeler) - n + 1))
+        return terimler
+
+    # Terimin HashingVectorizer'daki sütununu ve işaretini (+1/-1) döndürür.
+    def _hash_sutunu(self, terim):
+        h = murmurhash3_32(terim.encode('utf-8'))
+        sutun_sayisi = self.ayarlar['sutun_sayisi']
+        sutun = (2147483647 - (sutun_sayisi - 1)) % sutun_sayisi if h == -2147483648 else abs(h) % sutun_sayisi
+        return sutun, (1 if h >= 0 or not self.ayarlar['alternate_sign'] else -1)
+
+    # Metnin {sütun: terim sayısı} sözlüğünü üretir; özellik özetlemede sayılar işaretlidir ve birbirini
+    # götüren çakışmalar sklearn'deki gibi 0 değerli (eksik olmayan) özellik olarak kalır.
+    def _sayilar(self, metin):
+        if self.sozluk is not None:
+            return Counter(self.sozluk[t] for t in self._terimler(metin) if t in self.sozluk)
+        sayilar = {}
+        for terim in self._terimler(metin):
+            sutun, isaret = self._hash_sutunu(terim)
+            sayilar[sutun] = sayilar.get(sutun, 0) + isaret
+        return sayilar
+
+    # Bir metnin TF-IDF satırını (sıralı sütunlar, float32 değerler) döndürür; terimi yoksa None döner.
+    # Ağaç eşikleri eğitim verisindeki değerlerin kendisi olduğundan değerler sklearn ile bit düzeyinde aynı
+    # üretilir: sütunlar sıralı, kareler float32, toplam ve bölme float64 olarak hesaplanıp sonuç float32'ye
+    # yuvarlanır. Normlama bütün sütunlar üzerinden yapılır.
+    def _tfidf_satiri(self, metin):
+        sayilar = self._sayilar(metin)
+        if not sayilar:
+            return None
+        sutunlar = np.fromiter(sorted(sayilar), dtype=np.int64, count=len(sayilar))
+        degerler = np.fromiter((sayilar[s] for s in sutunlar), dtype=np.float32, count=len(sayilar))
+        if self.ayarlar['binary']:
+            degerler = np.ones_like(degerler)
+        elif self.ayarlar['sublinear_tf']:
+            degerler = np.log(degerler) + np.float32(1.0)
+        if self.ayarlar['use_idf']:
+            degerler = degerler * self.idf[sutunlar]
+        if self.ayarlar['norm'] == 'l2':
+            toplam = np.cumsum((degerler * degerler).astype(np.float64))[-1]
+            if toplam != 0:
+                degerler = degerler.astype(np.float64) / np.sqrt(toplam)
+        elif self.ayarlar['norm'] == 'l1':
+            toplam = np.cumsum(np.abs(degerler).astype(np.float64))[-1]
+            if toplam != 0:
+                degerler = degerler.astype(np.float64) / toplam
+        return sutunlar, degerler.astype(np.float32)
+
+    # Metinlerin TF-IDF özelliklerini, yalnızca ağaçların kullandığı sütunlar için yoğun bir matris olarak
+    # döndürür; bulunmayan özellikler, XGBoost'un seyrek girdide yaptığı gibi eksik (NaN) kabul edilir.
+    def ozellikler(self, metinler):
+        X = np.full((len(metinler), len(self.sutunlar)), np.nan, dtype=np.float32)
+        for satir, metin in enumerate(metinler):
+            tfidf = self._tfidf_satiri(metin)
+            if tfidf is None:
+                continue
+            sutunlar, degerler = tfidf
+            konum = np.searchsorted(self.sutunlar, sutunlar)
+            secili = self.sutunlar[np.minimum(konum, len(self.sutunlar) - 1)] == sutunlar
+            X[satir, konum[secili]] = degerler[secili]
+        return X
+
+    # Metinlerin bütün sütunlardaki TF-IDF özelliklerini CSR parçaları (data, indices, indptr) olarak
+    # döndürür; değerler ozellikler ile aynıdır, bulunmayan özellikler saklanmaz.
+    def seyrek_ozellikler(self, metinler):
+        bos = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32))
+        satirlar = [self._tfidf_satiri(metin) or bos for metin in metinler]
+        indptr = np.zeros(len(satirlar) + 1, dtype=np.int64)
+        np.cumsum([len(sutunlar) for sutunlar, _ in satirlar], out=indptr[1:])
+        indices = np.concatenate([bos[0]] + [sutunlar for sutunlar, _ in satirlar]).astype(np.int32)
+        data = np.concatenate([bos[1]] + [degerler for _, degerler in satirlar])
+        return data, indices, indptr
+
+    # Bütün ağaçları birlikte değerlendirip her metin için sınıf başına marjı (ham skor) döndürür.
+    def marjlar(self, metinler):
+        X = self.ozellikler(metinler).ravel()
+        dugum = np.broadcast_to(self.kokler.astype(np.int64), (len(metinler), len(self.kokler))).copy()
+        satir_baslari = (np.arange(len(metinler), dtype=np.int64) * len(self.sutunlar))[:, None]
+        for _ in range(self.ayarlar['max_derinlik']):
+            deger = X.take(satir_baslari + self._ozellik_sutunu.take(dugum))
+            sola = (deger < self.esik.take(dugum)) | (np.isnan(deger) & self.varsayilan_sol.take(dugum))
+            dugum = self._cocuklar.take(2 * dugum + sola)
+        return self.yaprak.take(dugum) @ self._sinif_matrisi + self._taban
+
+    # Pipeline.predict_proba ile aynı şekilde sınıf olasılıklarını (marjların softmax'ı) döndürür.
+    def predict_proba(self, metinler):
+        if not len(metinler):
+            return np.zeros((0, self.ayarlar['sinif_sayisi']), dtype=np.float32)
+        marj = self.marjlar(list(metinler)).astype(np.float64)
+        us = np.exp(marj - marj.max(axis=1, keepdims=True))
+        return (us / us.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    # Pipeline.predict ile aynı şekilde her metin için en yüksek marjlı sınıfı döndürür.
+    def predict(self, metinler):
+        if not len(metinler):
+            return np.zeros(0, dtype=np.int64)
+        return self.marjlar(list(metinler)).argmax(axis=1)
+
+def main():
+    parser = argparse.ArgumentParser(description="Kayıt defterindeki bir model sürümü için hızlı biçimi üretir")
+    parser.add_argument('--surum', required=True, help="Model sürümü (örn. v0003)")
+    args = parser.parse_args()
+
+    from model_kayit_defteri import hizli_bicimi_ekle
+    print(f"Hızlı biçim yazıldı: {hizli_bicimi_ekle(args.surum)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,35 +1,136 @@
 import os
+import sys
+import threading
 from flask import Flask, request, render_template, jsonify
-import json
+
+# Etiket günlüğü ve etiketleme deposu proje kök dizinindedir.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from aktif_ogrenme import BelirsizlikPuanlayici, EtiketKuyrugu
+from etiket_gunlugu import EtiketGunlugu
+from etiketleme_deposu import FILTRELER, EtiketlemeDeposu, durumu_coz
+from model_kayit_defteri import MODEL_ARKA_UCU, ModelYoneticisi
 
 app = Flask(__name__)
 
 # JSON dosyasının yolu
 dosya_yolu = os.path.join('json_dosyası', 'TRNews.AANews.json')
 
-# JSON dosyasını yükle
-with open(dosya_yolu, 'r', encoding='utf-8') as file:
-    json_data = json.load(file)
+# Haberler bellekte tutulmaz; sayfalar JSON dosyasından kurulan SQLite deposundan (etiketleme_deposu.py)
+# okunur. Depo, JSON dosyası değiştiyse açılışta yeniden kurulur.
+etiketleme_deposu = EtiketlemeDeposu(dosya_yolu, os.environ.get('ETIKETLEME_DB'))
+etiketleme_deposu.hazirla()
+
+# Sayfa boyutu sınırları
+VARSAYILAN_SAYFA_BOYUTU = 50
+MAX_SAYFA_BOYUTU = 500
+
+# Etiketler JSON dosyası yeniden yazılmadan etiket günlüğüne (TRNews.AANews.etiketler.jsonl) eklenir.
+# Günlükte SIKISTIRMA_ESIGI satır birikince etiketler arka planda JSON dosyasına işlenir; /compact ile
+# istenildiğinde de işlenebilir.
+etiket_gunlugu = EtiketGunlugu(dosya_yolu)
+SIKISTIRMA_ESIGI = int(os.environ.get('ETIKET_SIKISTIRMA_ESIGI', 1000))
+sikistirma_kilidi = threading.Lock()
+
+# Aktif öğrenme: etiketsiz haberler servis edilen modelle arka planda puanlanır ve /kuyruk en belirsiz
+# haberleri verir (aktif_ogrenme.py). Yeni model sürümü yüklenince eski sürümle puanlanan haberler yeniden
+# puanlanır. AKTIF_OGRENME=0 ile kapatılır.
+AKTIF_OGRENME = os.environ.get('AKTIF_OGRENME', '1') != '0'
+belirsizlik_puanlayici = None
+etiket_kuyrugu = EtiketKuyrugu(etiketleme_deposu)
+if AKTIF_OGRENME:
+    model_yoneticisi = ModelYoneticisi(
+        kontrol_araligi=float(os.environ.get('MODEL_KONTROL_ARALIGI', 60)),
+        degisince=lambda eski_surum, yeni_surum: belirsizlik_puanlayici.uyandir(),
+        arka_uc=MODEL_ARKA_UCU
+    )
+    belirsizlik_puanlayici = BelirsizlikPuanlayici(etiketleme_deposu, model_yoneticisi)
+    belirsizlik_puanlayici.baslat()
 
-# Anasayfa
+# Günlüğü JSON dosyasına işler; aynı anda tek sıkıştırma çalışır.
+def gunlugu_sikistir():
+    with sikistirma_kilidi:
+        islenen = etiket_gunlugu.sikistir()
+        etiketleme_deposu.imzayi_yenile()
+        return islenen
+
+# Anasayfa: haberler sayfa sayfa /haberler üzerinden yüklenir
 @app.route('/')
 def index():
-    return render_template('index.html', data=json_data)
+    return render_template('index.html', sayfa_boyutu=VARSAYILAN_SAYFA_BOYUTU)
+
+# Haberleri ID sırasıyla imleç tabanlı sayfalarla (after_id, limit) döndürür.
+# filter_type: all, etiketsiz, etiketli; durum verilirse yalnızca o etiketteki haberler.
+@app.route('/haberler', methods=['GET'])
+def haberler():
+    try:
+        after_id = request.args.get('after_id') or None
+        if after_id is not None:
+            try:
+                after_id = int(after_id)
+            except ValueError:
+                return jsonify({"error": "Geçersiz imleç!"}), 400
+        limit = min(max(request.args.get('limit', VARSAYILAN_SAYFA_BOYUTU, type=int) or 1, 1), MAX_SAYFA_BOYUTU)
+        filter_type = request.args.get('filter_type', 'all')
+        durum = request.args.get('durum')
+        if filter_type not in FILTRELER or (durum not in (None, '') and durumu_coz(durum) is None):
+            return jsonify({"error": "Geçersiz filtre!"}), 400
+        sayfa = etiketleme_deposu.sayfa(after_id, limit, filter_type, durumu_coz(durum))
+        yanit = {
+            "haberler": sayfa,
+            "sonraki_after_id": sayfa[-1]["ID"] if len(sayfa) == limit else None
+        }
+        if after_id is None:
+            ozet = etiketleme_deposu.ozet()
+            yanit["istatistikler"] = {
+                "toplam": sum(ozet.values()),
+                "etiketsiz": ozet.get(None, 0),
+                "durumlar": {str(d): adet for d, adet in sorted((d, a) for d, a in ozet.items() if d is not None)}
+            }
+        return jsonify(yanit)
+    except Exception as e:
+        app.logger.error(f"Haberler alınırken hata: {str(e)}")
+        return jsonify({"error": "Haberler yüklenemedi, lütfen tekrar deneyin."}), 500
 
-# JSON'u güncelle
+# Belirsizliği en yüksek etiketsiz haberlerden limit tanesini döndürür. Verilen haberler bir süre başka
+# istemcilere verilmez; böylece birlikte çalışan etiketleyiciler aynı haberleri almaz.
+@app.route('/kuyruk', methods=['GET'])
+def kuyruk():
+    if belirsizlik_puanlayici is None:
+        return jsonify({"error": "Aktif öğrenme kapalı."}), 404
+    try:
+        limit = min(max(request.args.get('limit', VARSAYILAN_SAYFA_BOYUTU, type=int) or 1, 1), MAX_SAYFA_BOYUTU)
+        return jsonify({"haberler": etiket_kuyrugu.al(limit), "puanlama": belirsizlik_puanlayici.durum()})
+    except Exception as e:
+        app.logger.error(f"Kuyruk alınırken hata: {str(e)}")
+        return jsonify({"error": "Kuyruk yüklenemedi, lütfen tekrar deneyin."}), 500
+
+# Durumu güncelle: etiket günlüğe tek satır olarak eklenir ve depoda güncellenir
 @app.route('/update', methods=['POST'])
 def update():
     data = request.json
-    for item in json_data:
-        if item['ID'] == data['ID']:
-            item['Durum'] = data['Durum']
-            break
+    try:
+        kimlik = int(data.get('ID'))
+    except (TypeError, ValueError):
+        return jsonify({"error": "Geçersiz ID!"}), 400
+    durum = durumu_coz(data.get('Durum'))
+    if durum is None:
+        return jsonify({"error": "Durum 0-10 arasında bir tam sayı olmalı!"}), 400
+    if not etiketleme_deposu.var_mi(kimlik):
+        return jsonify({"error": "Kayıt bulunamadı."}), 404
+    etiket_gunlugu.ekle(kimlik, durum)
+    etiketleme_deposu.etiketle(kimlik, durum)
+    etiket_kuyrugu.birak(kimlik)
 
-    # JSON'u güncellenmiş haliyle dosyaya kaydet
-    with open(dosya_yolu, 'w', encoding='utf-8') as file:
-        json.dump(json_data, file, ensure_ascii=False, indent=4)
+    if etiket_gunlugu.bekleyen >= SIKISTIRMA_ESIGI and not sikistirma_kilidi.locked():
+        threading.Thread(target=gunlugu_sikistir, name="etiket-sikistirma", daemon=True).start()
 
     return jsonify({"message": "Durum başarıyla güncellendi!"})
 
+# Günlükteki etiketleri hemen JSON dosyasına işle
+@app.route('/compact', methods=['POST'])
+def compact():
+    islenen = gunlugu_sikistir()
+    return jsonify({"message": "Etiketler JSON dosyasına işlendi.", "islenen": islenen})
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,281 @@
+# korpus_yukleyici.py
+#
+# Eğitim betiklerinin haber korpusunu bellekte tamamen tutmadan okuması için akış tabanlı yükleyici.
+# JSON-lines ve JSON dizisi dosyaları parça parça çözülür, "Durum" etiketi okunurken doğrulanır ve
+# temizlenmiş metinler doğrudan diskteki Parquet önbelleğine satır grupları halinde yazılır.
+# Temizleme, metinler parçalar halinde bir süreç havuzuna dağıtılarak çekirdekler arasında paralel yapılır.
+# Etiketleme aracının etiket günlüğü (etiket_gunlugu.py) varsa korpusla birleştirilerek okunur.
+# Parquet yazma/okuma için pyarrow gerekir.
+
+import hashlib
+import inspect
+import json
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from etiket_gunlugu import etiketleri_uygula, gunluk_etiketleri, gunluk_yolu
+import metin_temizleme
+from metin_temizleme import normalize_et
+
+# Kaynak dosyalardaki alan adları ve kabul edilen etiket aralığı.
+METIN_ALANI = "Body"
+DURUM_ALANI = "Durum"
+MIN_DURUM, MAX_DURUM = 0, 10
+
+# Dosyadan tek seferde okunan karakter sayısı ve Parquet'e tek satır grubu olarak yazılan haber sayısı.
+OKUMA_PARCA_BOYUTU = 1 << 20
+YAZMA_PARCA_BOYUTU = 50000
+
+# Temizleme için süreçlere gönderilen parça başına haber sayısı ve varsayılan işçi süreç sayısı
+# (EGITIM_ISCI_SAYISI ortam değişkeni; verilmezse çekirdek sayısı). 1 verilirse temizleme seri yapılır.
+TEMIZLEME_PARCA_BOYUTU = 10000
+ISCI_SAYISI = int(os.environ.get("EGITIM_ISCI_SAYISI", "0")) or os.cpu_count() or 1
+
+# Önbellek biçimi değiştiğinde artırılır; eski önbellekler yeniden üretilir.
+ONBELLEK_SURUMU = 1
+
+# Ham haber kaydından (metin, durum) çiftini üretir; metin boşsa veya durum 0-10 aralığında değilse None döner.
+def haberi_dogrula(haber):
+    if not isinstance(haber, dict):
+        return None
+    metin = str(haber.get(METIN_ALANI) or "").strip()
+    durum = haber.get(DURUM_ALANI, None)
+    if not metin or durum is None:
+        return None
+    try:
+        durum_int = int(float(str(durum)))
+    except (ValueError, TypeError):
+        return None
+    if not MIN_DURUM <= durum_int <= MAX_DURUM:
+        return None
+    return metin, durum_int
+
+# Dosyanın ilk anlamlı karakterine bakarak JSON dizisi mi ('[') yoksa JSON-lines mı olduğunu belirler.
+def json_dizisi_mi(dosya_yolu):
+    with open(dosya_yolu, "r", encoding="utf-8") as f:
+        while True:
+            parca = f.read(4096)
+            if not parca:
+                return False
+            parca = parca.lstrip()
+            if parca:
+                return parca[0] == '['
+
+# JSON-lines dosyasını satır satır okur; çözülemeyen satırlar atlanır.
+def _json_satirlarini_akit(f):
+    for satir in f:
+        satir = satir.strip()
+        if not satir:
+            continue
+        try:
+            yield json.loads(satir)
+        except json.JSONDecodeError:
+            pass
+
+# Üst düzeyi dizi olan bir JSON dosyasının elemanlarını, dosyanın tamamını belleğe almadan tek tek üretir.
+def _json_dizisini_akit(f, parca_boyutu=OKUMA_PARCA_BOYUTU):
+    cozucu = json.JSONDecoder()
+    tampon = f.read(parca_boyutu)
+    dosya_bitti = not tampon
+    konum = 0
+
+    # Tampondaki boşlukları atlar; tampon biterse dosyadan yeni parça okur. Sonraki karakteri döndürür.
+    def sonraki_karakter():
+        nonlocal tampon, konum, dosya_bitti
+        while True:
+            while konum < len(tampon) and tampon[konum].isspace():
+                konum += 1
+            if konum < len(tampon) or dosya_bitti:
+                return tampon[konum] if konum < len(tampon) else ''
+            parca = f.read(parca_boyutu)
+            dosya_bitti = not parca
+            tampon, konum = tampon[konum:] + parca, 0
+
+    if sonraki_karakter() != '[':
+        raise ValueError("JSON dizisi '[' ile başlamıyor.")
+    konum += 1
+    if sonraki_karakter() == ']':
+        return
+
+    while True:
+        sonraki_karakter()
+        try:
+            eleman, son = cozucu.raw_decode(tampon, konum)
+            tamamlandi = son < len(tampon) or dosya_bitti
+        except json.JSONDecodeError:
+            if dosya_bitti:
+                raise
+            tamamlandi = False
+        if not tamamlandi:
+            # Eleman tamponun sonunda bölünmüş olabilir; bir parça daha okuyup yeniden denenir.
+            parca = f.read(parca_boyutu)
+            dosya_bitti = not parca
+            tampon, konum = tampon[konum:] + parca, 0
+            continue
+        yield eleman
+        konum = son
+        ayirici = sonraki_karakter()
+        if ayirici == ',':
+            konum += 1
+        elif ayirici == ']':
+            return
+        else:
+            raise ValueError(f"JSON dizisinde beklenmeyen karakter: {ayirici!r}")
+
+# Dosyadaki ham kayıtları (sözlükler) akış olarak üretir; is_lines_format verilmezse biçim dosyanın ilk
+# karakterinden belirlenir. gunluk True ise dosyanın etiket günlüğündeki son etiketler kayıtlara uygulanır.
+def kayitlari_oku(dosya_yolu, is_lines_format=None, gunluk=True):
+    if not os.path.exists(dosya_yolu):
+        raise FileNotFoundError(f"{dosya_yolu} bulunamadı! Dosya yolunu kontrol et.")
+    if is_lines_format is None:
+        is_lines_format = not json_dizisi_mi(dosya_yolu)
+    etiketler = gunluk_etiketleri(gunluk_yolu(dosya_yolu)) if gunluk else {}
+
+    with open(dosya_yolu, "r", encoding="utf-8") as f:
+        yield from etiketleri_uygula(_json_satirlarini_akit(f) if is_lines_format else _json_dizisini_akit(f),
+                                     etiketler)
+
+# Dosyadaki geçerli haberleri (metin, durum) çiftleri halinde akış olarak üretir.
+def haberleri_oku(dosya_yolu, is_lines_format=None):
+    for haber in kayitlari_oku(dosya_yolu, is_lines_format):
+        sonuc = haberi_dogrula(haber)
+        if sonuc:
+            yield sonuc
+
+# Ortak normalizasyon modülünün (metin_temizleme.py: normalize_et, durak kelimeler, kelime deseni) kaynak
+# kodu özetini döndürür. Temizleyiciler normalize_et'i sarmaladığından yalnızca temizleyicinin kodu özetlenirse
+# normalizasyondaki değişiklikler önbelleği geçersiz kılmaz.
+def normalizasyon_ozeti():
+    return hashlib.sha256(inspect.getsource(metin_temizleme).encode('utf-8')).hexdigest()[:12]
+
+# Kaynak dosyaların (ve varsa etiket günlüklerinin) yolu, boyutu ve değiştirilme zamanı, temizleyicinin adı
+# ve kod özeti ile normalizasyon modülünün kaynak özetinden önbellek anahtarı üretir.
+def korpus_anahtari(kaynaklar, temizleyici):
+    kod = getattr(temizleyici, '__code__', None)
+    kod_ozeti = hashlib.sha256(kod.co_code + repr(kod.co_consts).encode('utf-8')).hexdigest()[:12] if kod else ''
+    parcalar = [f"surum={ONBELLEK_SURUMU}",
+                f"temizleyici={temizleyici.__module__}.{temizleyici.__qualname__}:{kod_ozeti}",
+                f"normalizasyon={normalizasyon_ozeti()}"]
+    for dosya_yolu, is_lines_format in kaynaklar:
+        bilgi = os.stat(dosya_yolu)
+        parcalar.append(f"{os.path.abspath(dosya_yolu)}|{is_lines_format}|{bilgi.st_size}|{bilgi.st_mtime_ns}")
+        if os.path.exists(gunluk_yolu(dosya_yolu)):
+            bilgi = os.stat(gunluk_yolu(dosya_yolu))
+            parcalar.append(f"{os.path.abspath(gunluk_yolu(dosya_yolu))}|{bilgi.st_size}|{bilgi.st_mtime_ns}")
+    return "\n".join(parcalar)
+
+# Parquet dosyasının şema üst verisinde saklanan önbellek anahtarını döndürür; dosya yoksa None döner.
+def _kayitli_anahtar(parquet_yolu):
+    import pyarrow.parquet as pq
+    if not os.path.exists(parquet_yolu):
+        return None
+    try:
+        ust_veri = pq.read_schema(parquet_yolu).metadata or {}
+    except Exception:
+        return None
+    anahtar = ust_veri.get(b"korpus_anahtari")
+    return anahtar.decode("utf-8") if anahtar else None
+
+# Bir parça metni temizler; süreç havuzundaki işçilerde çalışır.
+def _parcayi_temizle(temizleyici, metinler):
+    return [temizleyici(metin) for metin in metinler]
+
+# Kaynaklardaki geçerli haberleri (metinler, durumlar) listeleri halinde, parca_boyutu'luk parçalar olarak üretir.
+def _ham_parcalar(kaynaklar, parca_boyutu):
+    metinler, durumlar = [], []
+    for dosya_yolu, is_lines_format in kaynaklar:
+        for metin, durum in haberleri_oku(dosya_yolu, is_lines_format):
+            metinler.append(metin)
+            durumlar.append(durum)
+            if len(metinler) >= parca_boyutu:
+                yield metinler, durumlar
+                metinler, durumlar = [], []
+    if metinler:
+        yield metinler, durumlar
+
+# Süreç havuzu için başlatma yöntemi. fork varsa o kullanılır: eğitim betiklerinde tanımlanan temizleyiciler
+# (__main__ içindeki fonksiyonlar) çocuk süreçlerde betik yeniden çalıştırılmadan bulunabilir.
+# fork yoksa ve temizleyici __main__ içindeyse None döner; temizleme seri yapılır.
+def _havuz_baglami(temizleyici):
+    if "fork" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("fork")
+    if getattr(temizleyici, "__module__", None) == "__main__":
+        return None
+    return multiprocessing.get_context()
+
+# Ham parçaları temizleyip (temiz metinler, durumlar) olarak, okuma sırasını koruyarak üretir.
+# isci_sayisi > 1 ise parçalar süreç havuzunda paralel temizlenir; bellekte en fazla 2 * isci_sayisi
+# parça bekletilir.
+def _temiz_parcalar(kaynaklar, temizleyici, isci_sayisi, parca_boyutu):
+    ham = _ham_parcalar(kaynaklar, parca_boyutu)
+    baglam = _havuz_baglami(temizleyici) if isci_sayisi > 1 else None
+    if baglam is None:
+        for metinler, durumlar in ham:
+            yield _parcayi_temizle(temizleyici, metinler), durumlar
+        return
+
+    with ProcessPoolExecutor(max_workers=isci_sayisi, mp_context=baglam) as havuz:
+        bekleyenler = deque()
+        for metinler, durumlar in ham:
+            bekleyenler.append((havuz.submit(_parcayi_temizle, temizleyici, metinler), durumlar))
+            if len(bekleyenler) >= 2 * isci_sayisi:
+                gelecek, durumlar = bekleyenler.popleft()
+                yield gelecek.result(), durumlar
+        while bekleyenler:
+            gelecek, durumlar = bekleyenler.popleft()
+            yield gelecek.result(), durumlar
+
+# Kaynak dosyalardaki haberleri akış halinde okuyup temizler ve "metin", "durum" sütunlarıyla Parquet
+# önbelleğine yazar. Temizleme isci_sayisi süreçte paralel yapılır, satır sırası korunur. Bellekte yazılmayı
+# bekleyen en fazla parca_boyutu haber tutulur. Kaynaklar ve temizleyici değişmediyse mevcut önbellek
+# yeniden kullanılır ve temizleme tamamen atlanır. kaynaklar, (dosya_yolu, is_lines_format) çiftlerinden
+# oluşur. Önbelleğin yolunu döndürür.
+def korpusu_hazirla(kaynaklar, parquet_yolu, temizleyici=normalize_et, parca_boyutu=YAZMA_PARCA_BOYUTU,
+                    isci_sayisi=None):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    anahtar = korpus_anahtari(kaynaklar, temizleyici)
+    if _kayitli_anahtar(parquet_yolu) == anahtar:
+        print(f"Korpus önbelleği güncel, yeniden kullanılıyor: {parquet_yolu}")
+        return parquet_yolu
+
+    isci_sayisi = max(1, isci_sayisi or ISCI_SAYISI)
+    temizleme_parca_boyutu = min(TEMIZLEME_PARCA_BOYUTU, parca_boyutu)
+    print(f"Metinler {isci_sayisi} süreçle temizleniyor...")
+
+    sema = pa.schema([("metin", pa.string()), ("durum", pa.int8())], metadata={"korpus_anahtari": anahtar})
+    os.makedirs(os.path.dirname(os.path.abspath(parquet_yolu)), exist_ok=True)
+    gecici_yol = parquet_yolu + ".tmp"
+    toplam = 0
+    with pq.ParquetWriter(gecici_yol, sema) as yazici:
+        metinler, durumlar = [], []
+
+        def parcayi_yaz():
+            yazici.write_table(pa.table({"metin": metinler, "durum": durumlar}, schema=sema))
+            metinler.clear()
+            durumlar.clear()
+
+        for temiz_metinler, parca_durumlari in _temiz_parcalar(kaynaklar, temizleyici, isci_sayisi,
+                                                               temizleme_parca_boyutu):
+            metinler.extend(temiz_metinler)
+            durumlar.extend(parca_durumlari)
+            if len(metinler) >= parca_boyutu:
+                toplam += len(metinler)
+                parcayi_yaz()
+                print(f"{toplam} haber temizlenip önbelleğe yazıldı.")
+        if metinler:
+            toplam += len(metinler)
+            parcayi_yaz()
+    os.replace(gecici_yol, parquet_yolu)
+    print(f"Korpus önbelleği oluşturuldu: {parquet_yolu} ({toplam} haber)")
+    return parquet_yolu
+
+# Parquet önbelleğini satır grupları halinde (pyarrow RecordBatch) okur; tüm korpusu belleğe almadan
+# işlemek isteyen betikler içindir.
+def korpus_parcalari(parquet_yolu, sutunlar=("metin", "durum"), parca_boyutu=YAZMA_PARCA_BOYUTU):
+    import pyarrow.parquet as pq
+    dosya = pq.ParquetFile(parquet_yolu)
+    yield from dosya.iter_batches(batch_size=parca_boyutu, columns=list(sutunlar))
@@ -0,0 +1,30 @@
+# metin_temizleme.py
+#
+# Eğitim (XGBoost-model-egitimi.py) ve servis (app.py) tarafının ortak kullandığı metin normalizasyonu.
+# Aynı fonksiyon iki tarafta da kullanıldığından model, eğitildiği ön işlemeyle birebir aynı girdiyi görür.
+
+import re
+
+# NLTK'nın Türkçe durak kelime listesi (stopwords.words('turkish')); eğitimde olduğu gibi yalnızca
+# 2 harften uzun olanlar tutulur. Kelime başına arama için frozenset kullanılır.
+TURKCE_STOPWORDS = frozenset(kelime for kelime in (
+    'acaba', 'ama', 'aslında', 'az', 'bazı', 'belki', 'biri', 'birkaç', 'birşey', 'biz', 'bu', 'çok',
+    'çünkü', 'da', 'daha', 'de', 'defa', 'diye', 'eğer', 'en', 'gibi', 'hem', 'hep', 'hepsi', 'her',
+    'hiç', 'için', 'ile', 'ise', 'kez', 'ki', 'kim', 'mı', 'mu', 'mü', 'nasıl', 'ne', 'neden', 'nerde',
+    'nerede', 'nereye', 'niçin', 'niye', 'o', 'sanki', 'şey', 'siz', 'şu', 'tüm', 've', 'veya', 'ya', 'yani'
+) if len(kelime) > 2)
+
+# Rakam içermeyen kelime karakteri dizileri. Eski üç aşamalı temizliğin (noktalama -> boşluk,
+# rakam -> boşluk, boşlukları birleştirme) ürettiği kelimelerle aynı kelimeleri tek geçişte bulur.
+KELIME_DESENI = re.compile(r'[^\W\d]+')
+
+# En kısa anlamlı kelime uzunluğu; daha kısa kelimeler eğitimde olduğu gibi atılır.
+MIN_KELIME_UZUNLUGU = 3
+
+# Metni küçük harfe çevirir, tek geçişte kelimelere ayırır; durak kelimeleri ve kısa kelimeleri atarak
+# boşlukla birleştirir.
+def normalize_et(metin):
+    return ' '.join([
+        kelime for kelime in KELIME_DESENI.findall(metin.lower())
+        if len(kelime) >= MIN_KELIME_UZUNLUGU and kelime not in TURKCE_STOPWORDS
+    ])
@@ -0,0 +1,236 @@
+# model_benchmark.py
+#
+# "Model Testleri" klasöründeki model ailelerini (karar ağacı, k-NN, Naive Bayes, Random Forest, SVM,
+# TF-IDF + lojistik regresyon) üretimdeki XGBoost modeliyle aynı koşullarda karşılaştırır:
+#   - Veri, XGBoost-model-egitimi.py'nin yazdığı temizlenmiş korpus önbelleğidir; sınıf dengeleme, eğitim/test
+#     ayrımı ve özellik aşaması (model_kurulumu.py) üretimdekiyle aynıdır. Ağırlıklı dengelemede örnek
+#     ağırlığı desteklemeyen modeller (k-NN) ağırlıksız eğitilir.
+#   - Özellik matrisi bir kez üretilip önbelleğe yazılır (ozellik_onbellegi.py); bütün modeller aynı matrisi
+#     bellek eşlemeli olarak okur, veri değişmedikçe sonraki çalıştırmalar vektörleştirmeyi atlar.
+#   - Her model ayrı bir süreçte eğitilir; böylece tepe bellek (RSS) ölçümleri birbirini etkilemez.
+# Her model için doğruluk, makro/ağırlıklı F1, eğitim süresi, haber başına tahmin gecikmesi (p50/p99,
+# metinden itibaren), toplu tahmin hızı, diskteki model boyutu ve tepe bellek raporlanır; sonuçlar JSON ve
+# Markdown olarak yazılır.
+#
+# Kullanım: python model_benchmark.py [--veri csv_dosyası/korpus_temiz.parquet] [--modeller xgboost,svm]
+#                                     [--ozellik-asamasi tfidf] [--dengeleme satir] [--gecikme-adet 500]
+#                                     [--toplu-adet 5000]
+#                                     [--rapor csv_dosyası/model_benchmark]
+
+import argparse
+import inspect
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, f1_score
+from sklearn.naive_bayes import MultinomialNB
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import Pipeline
+from sklearn.svm import LinearSVC
+from sklearn.tree import DecisionTreeClassifier
+
+from model_kurulumu import (DENGELEME_YONTEMI, DENGELEME_YONTEMLERI, HASH_BITLERI, OZELLIK_ASAMALARI,
+                            OZELLIK_ASAMASI, egitim_verisini_hazirla, ozellik_adimlari, xgboost_olustur)
+from ozellik_onbellegi import dosya_imzasi, onbellek_anahtari, onbellek_klasoru, onbellegi_yaz, seyrek_kaydet, seyrek_yukle
+
+# Karşılaştırılan model aileleri. Ayarlar "Model Testleri" betiklerindeki arama ızgaralarının orta
+# değerleridir. SVM, doğrusal çekirdekli SVC ile aynı modeli çok daha hızlı eğiten LinearSVC ile; lojistik
+# regresyon, çok sınıflı veriyi desteklemeyen liblinear yerine varsayılan çözücüyle kurulur.
+MODEL_AILELERI = {
+    "xgboost": xgboost_olustur,
+    "karar_agaci": lambda: DecisionTreeClassifier(max_depth=20, min_samples_split=5, random_state=42),
+    "knn": lambda: KNeighborsClassifier(n_neighbors=5),
+    "naive_bayes": lambda: MultinomialNB(alpha=1.0),
+    "random_forest": lambda: RandomForestClassifier(n_estimators=200, max_depth=20, random_state=42, n_jobs=-1),
+    "svm": lambda: LinearSVC(class_weight='balanced'),
+    "logreg": lambda: LogisticRegression(max_iter=1000),
+}
+
+# Sürecin o anki (VmRSS) veya tepe (VmHWM) bellek kullanımını MB olarak okur; /proc yoksa None döner.
+def bellek_mb(alan="VmHWM"):
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(satir.split()[1]) for satir in f if satir.startswith(alan + ":")) / 1024
+    except (OSError, StopIteration):
+        return None
+
+# Korpusu üretimdeki gibi dengeleyip ayırır, özellik aşamasını eğitim setinde eğitir ve matrisleri önbelleğe
+# yazar. Aynı girdilerle daha önce üretilmişse mevcut önbellek klasörünü döndürür.
+def ozellikleri_hazirla(veri_yolu, asama, hash_bitleri, dengeleme):
+    girdiler = {
+        "veri": dosya_imzasi(veri_yolu),
+        "ozellik_asamasi": asama,
+        "hash_bitleri": hash_bitleri if asama == 'hashing' else None,
+        "dengeleme": dengeleme,
+    }
+    anahtar = onbellek_anahtari(girdiler)
+    klasor, hazir = onbellek_klasoru(anahtar)
+    if hazir:
+        print(f"Özellik önbelleği kullanılıyor: {klasor}")
+        return klasor
+
+    print("Özellik matrisi üretiliyor...")
+    df = pd.read_parquet(veri_yolu) if veri_yolu.endswith('.parquet') else pd.read_csv(veri_yolu)
+    df = df.dropna(subset=["metin", "durum"])
+    df["durum"] = df["durum"].astype(int)
+    X_train, X_test, y_train, y_test, agirliklar = egitim_verisini_hazirla(df, dengeleme)
+    ozellik = Pipeline(ozellik_adimlari(asama, hash_bitleri))
+
+    def yaz(hedef):
+        seyrek_kaydet(ozellik.fit_transform(X_train), hedef, "X_train")
+        seyrek_kaydet(ozellik.transform(X_test), hedef, "X_test")
+        np.save(os.path.join(hedef, "y_train.npy"), y_train.to_numpy())
+        np.save(os.path.join(hedef, "y_test.npy"), y_test.to_numpy())
+        if agirliklar is not None:
+            np.save(os.path.join(hedef, "w_train.npy"), agirliklar)
+        pd.DataFrame({"metin": X_test.to_numpy()}).to_parquet(os.path.join(hedef, "test_metinleri.parquet"))
+        joblib.dump(ozellik, os.path.join(hedef, "ozellik_asamasi.joblib"))
+
+    klasor = onbellegi_yaz(anahtar, girdiler, yaz)
+    print(f"Özellik önbelleği yazıldı: {klasor}")
+    return klasor
+
+# Bir model ailesini önbellekteki matrisle eğitip ölçer. Ayrı bir süreçte çalıştırılır.
+def modeli_olc(aile, klasor, gecikme_adet, toplu_adet):
+    baslangic_bellek = bellek_mb("VmRSS")
+    X_train, X_test = seyrek_yukle(klasor, "X_train"), seyrek_yukle(klasor, "X_test")
+    y_train, y_test = np.load(os.path.join(klasor, "y_train.npy")), np.load(os.path.join(klasor, "y_test.npy"))
+    metinler = pd.read_parquet(os.path.join(klasor, "test_metinleri.parquet"))["metin"].tolist()
+    ozellik = joblib.load(os.path.join(klasor, "ozellik_asamasi.joblib"))
+
+    agirlik_yolu = os.path.join(klasor, "w_train.npy")
+    agirliklar = np.load(agirlik_yolu) if os.path.exists(agirlik_yolu) else None
+
+    model = MODEL_AILELERI[aile]()
+    if isinstance(model, MultinomialNB) and X_train.data.size and X_train.data.min() < 0:
+        raise ValueError("Naive Bayes negatif özellik değerleriyle (işaretli özetleme) çalışmaz.")
+    agirlikli = agirliklar is not None and 'sample_weight' in inspect.signature(model.fit).parameters
+    baslangic = time.perf_counter()
+    model.fit(X_train, y_train, **({"sample_weight": agirliklar} if agirlikli else {}))
+    egitim_suresi = time.perf_counter() - baslangic
+    y_pred = model.predict(X_test)
+
+    # Gecikme, sunucudaki gibi ham (temizlenmiş) metinden itibaren tek haberlik çağrılarla ölçülür.
+    pipeline = Pipeline(list(ozellik.steps) + [(aile, model)])
+    gecikmeler = []
+    for metin in metinler[:gecikme_adet]:
+        baslangic = time.perf_counter()
+        pipeline.predict([metin])
+        gecikmeler.append((time.perf_counter() - baslangic) * 1e3)
+    toplu = metinler[:toplu_adet]
+    baslangic = time.perf_counter()
+    pipeline.predict(toplu)
+    toplu_hiz = len(toplu) / (time.perf_counter() - baslangic)
+
+    with tempfile.TemporaryDirectory() as gecici:
+        model_yolu = os.path.join(gecici, "model.pkl")
+        joblib.dump(pipeline, model_yolu)
+        disk_boyutu = os.path.getsize(model_yolu)
+
+    tepe_bellek = bellek_mb("VmHWM")
+    return {
+        "agirlikli_egitim": agirlikli,
+        "dogruluk": accuracy_score(y_test, y_pred),
+        "makro_f1": f1_score(y_test, y_pred, average='macro', zero_division=0),
+        "agirlikli_f1": f1_score(y_test, y_pred, average='weighted', zero_division=0),
+        "egitim_s": egitim_suresi,
+        "gecikme_p50_ms": float(np.percentile(gecikmeler, 50)),
+        "gecikme_p99_ms": float(np.percentile(gecikmeler, 99)),
+        "toplu_haber_s": toplu_hiz,
+        "disk_mb": disk_boyutu / 1024 / 1024,
+        "tepe_bellek_mb": tepe_bellek,
+        "ek_bellek_mb": tepe_bellek - baslangic_bellek if tepe_bellek is not None else None,
+    }
+
+# Sonuçları Markdown tablosu olarak döndürür.
+def markdown_raporu(rapor):
+    satirlar = [
+        f"# Model karşılaştırması ({rapor['tarih']})",
+        "",
+        f"Veri: `{rapor['veri']}`, özellik aşaması: {rapor['ozellik_asamasi']}, dengeleme: {rapor['dengeleme']}, "
+        f"eğitim {rapor['egitim_ornek']} / test {rapor['test_ornek']} haber.",
+        "",
+        "| Model | Doğruluk | Makro F1 | Ağırlıklı F1 | Eğitim (s) | p50 (ms) | p99 (ms) | Toplu (haber/s) "
+        "| Disk (MB) | Tepe RSS (MB) |",
+        "|---|---|---|---|---|---|---|---|---|---|",
+    ]
+    for aile, s in rapor["sonuclar"].items():
+        if "hata" in s:
+            satirlar.append(f"| {aile} | hata: {s['hata']} |||||||||")
+            continue
+        satirlar.append(
+            f"| {aile} | {s['dogruluk']:.4f} | {s['makro_f1']:.4f} | {s['agirlikli_f1']:.4f} | {s['egitim_s']:.1f} "
+            f"| {s['gecikme_p50_ms']:.2f} | {s['gecikme_p99_ms']:.2f} | {s['toplu_haber_s']:.0f} "
+            f"| {s['disk_mb']:.1f} | {s['tepe_bellek_mb'] or 0:.0f} |")
+    satirlar += ["", "Gecikme: temizlenmiş metinden tahmine tek haberlik çağrı. "
+                     "Tepe RSS: modelin eğitildiği ayrı sürecin tepe bellek kullanımı."]
+    return "\n".join(satirlar) + "\n"
+
+def main():
+    parser = argparse.ArgumentParser(description="Model ailelerinin doğruluk ve hız karşılaştırması")
+    parser.add_argument('--veri', default="csv_dosyası/korpus_temiz.parquet",
+                        help="'metin' ve 'durum' sütunlu temizlenmiş korpus (Parquet veya CSV)")
+    parser.add_argument('--modeller', default=",".join(MODEL_AILELERI),
+                        help=f"Virgülle ayrılmış model aileleri ({', '.join(MODEL_AILELERI)})")
+    parser.add_argument('--ozellik-asamasi', default=OZELLIK_ASAMASI, choices=OZELLIK_ASAMALARI)
+    parser.add_argument('--hash-bitleri', type=int, default=HASH_BITLERI)
+    parser.add_argument('--dengeleme', default=DENGELEME_YONTEMI, choices=DENGELEME_YONTEMLERI)
+    parser.add_argument('--gecikme-adet', type=int, default=500, help="Tek haberlik gecikme ölçümündeki haber sayısı")
+    parser.add_argument('--toplu-adet', type=int, default=5000, help="Toplu tahmin hızı ölçümündeki haber sayısı")
+    parser.add_argument('--rapor', default="csv_dosyası/model_benchmark",
+                        help="Rapor dosyalarının ön adı (.json ve .md eklenir)")
+    args = parser.parse_args()
+
+    modeller = [ad.strip() for ad in args.modeller.split(",") if ad.strip()]
+    bilinmeyen = [ad for ad in modeller if ad not in MODEL_AILELERI]
+    if bilinmeyen:
+        print(f"[HATA] Bilinmeyen model ailesi: {', '.join(bilinmeyen)}")
+        return 1
+    if not os.path.exists(args.veri):
+        print(f"[HATA] Veri bulunamadı: {args.veri} (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+
+    klasor = ozellikleri_hazirla(args.veri, args.ozellik_asamasi, args.hash_bitleri, args.dengeleme)
+    rapor = {
+        "tarih": datetime.now().isoformat(timespec='seconds'),
+        "veri": args.veri,
+        "ozellik_asamasi": args.ozellik_asamasi,
+        "dengeleme": args.dengeleme,
+        "egitim_ornek": len(np.load(os.path.join(klasor, "y_train.npy"), mmap_mode='r')),
+        "test_ornek": len(np.load(os.path.join(klasor, "y_test.npy"), mmap_mode='r')),
+        "sonuclar": {}
+    }
+    baglam = multiprocessing.get_context("spawn")
+    for aile in modeller:
+        print(f"{aile} eğitiliyor...")
+        with ProcessPoolExecutor(max_workers=1, mp_context=baglam) as havuz:
+            try:
+                rapor["sonuclar"][aile] = havuz.submit(modeli_olc, aile, klasor, args.gecikme_adet,
+                                                       args.toplu_adet).result()
+            except Exception as e:
+                print(f"[HATA] {aile}: {str(e)}")
+                rapor["sonuclar"][aile] = {"hata": str(e)}
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.rapor)), exist_ok=True)
+    with open(args.rapor + ".json", "w", encoding="utf-8") as f:
+        json.dump(rapor, f, ensure_ascii=False, indent=2)
+    markdown = markdown_raporu(rapor)
+    with open(args.rapor + ".md", "w", encoding="utf-8") as f:
+        f.write(markdown)
+    print("\n" + markdown)
+    print(f"Rapor kaydedildi: {args.rapor}.json, {args.rapor}.md")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
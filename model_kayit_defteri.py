@@ -0,0 +1,343 @@
+# model_kayit_defteri.py
+#
+# Sürüm numaralı model kayıt defteri. Her sürüm kendi klasöründe model dosyası ve üst verisiyle
+# (eğitim tarihi, doğruluk, sözlük boyutu, kaynak) tutulur:
+#     csv_dosyası/modeller/v0003/model.pkl
+#     csv_dosyası/modeller/v0003/meta.json
+#     csv_dosyası/modeller/v0003/hizli/     -> hızlı açılan biçim (hizli_model.py), varsa tercih edilir
+#     csv_dosyası/modeller/v0003/derlenmis/ -> isteğe bağlı derlenmiş ağaçlar (derlenmis_model.py)
+#     csv_dosyası/modeller/AKTIF            -> servis edilecek sürümün adı
+# Sürüm klasörü ve AKTIF göstergesi geçici adla yazılıp atomik olarak yerine taşınır; sunucu yarım
+# yazılmış bir modeli hiçbir zaman görmez. Kayıt defteri boşsa eski tek dosyalık model
+# (csv_dosyası/en_iyi_model_xgb.pkl) kullanılır.
+# joblib (dolayısıyla sklearn/xgboost) yalnızca hızlı biçimi olmayan bir model yüklenirken içe aktarılır.
+# Sunucunun kullanacağı arka uç MODEL_ARKA_UCU ile seçilir: "derlenmis", "hizli" (varsayılan) veya "joblib".
+# Seçilen biçim sürümde yoksa veya açılamazsa sıradaki biçime düşülür; MODEL_HIZLI_YUKLEME=0 eski ayar
+# olarak "joblib" seçer.
+
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections import namedtuple
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+KAYIT_KLASORU = os.environ.get('MODEL_KAYIT_KLASORU', 'csv_dosyası/modeller')
+ESKI_MODEL_YOLU = 'csv_dosyası/en_iyi_model_xgb.pkl'
+MODEL_DOSYASI = 'model.pkl'
+META_DOSYASI = 'meta.json'
+AKTIF_DOSYASI = 'AKTIF'
+HIZLI_KLASORU = 'hizli'
+HIZLI_YUKLEME = os.environ.get('MODEL_HIZLI_YUKLEME', '1') != '0'
+DERLENMIS_KLASORU = 'derlenmis'
+ARKA_UCLAR = ('derlenmis', 'hizli', 'joblib')
+MODEL_ARKA_UCU = os.environ.get('MODEL_ARKA_UCU', 'hizli' if HIZLI_YUKLEME else 'joblib')
+SURUM_DESENI = re.compile(r'^v(\d+)$')
+
+# Sunucunun o an kullandığı model ve sürüm kimliği; birlikte tek referans olarak değiştirilir.
+AktifModel = namedtuple('AktifModel', ['model', 'surum', 'meta'])
+
+# Dosya içeriğinin kısa SHA-256 özetini üretir.
+def dosya_ozeti(yol):
+    ozet = hashlib.sha256()
+    with open(yol, 'rb') as f:
+        for parca in iter(lambda: f.read(1 << 20), b''):
+            ozet.update(parca)
+    return ozet.hexdigest()[:12]
+
+# performans_raporu.txt içindeki "Doğruluk (test seti): 0.87" satırından doğruluğu okur; yoksa None döner.
+def dogrulugu_oku(rapor_yolu):
+    if not rapor_yolu or not os.path.exists(rapor_yolu):
+        return None
+    with open(rapor_yolu, 'r', encoding='utf-8') as f:
+        eslesme = re.search(r'Doğruluk[^:]*:\s*([0-9.]+)', f.read())
+    return float(eslesme.group(1)) if eslesme else None
+
+# Pipeline'daki vektörleştiricinin sözlük boyutunu döndürür; sözlük tutmayan vektörleştiricilerde None döner.
+def sozluk_boyutu(pipeline):
+    for _, adim in getattr(pipeline, 'steps', []):
+        sozluk = getattr(adim, 'vocabulary_', None)
+        if sozluk is not None:
+            return len(sozluk)
+    return None
+
+# Kayıt defterindeki sürüm adlarını eskiden yeniye sıralı döndürür.
+def surum_adlari(klasor=KAYIT_KLASORU):
+    if not os.path.isdir(klasor):
+        return []
+    adlar = [ad for ad in os.listdir(klasor)
+             if SURUM_DESENI.match(ad) and os.path.exists(os.path.join(klasor, ad, META_DOSYASI))]
+    return sorted(adlar, key=lambda ad: int(SURUM_DESENI.match(ad).group(1)))
+
+# Bir sonraki sürümün adını (v0001, v0002, ...) üretir.
+def sonraki_surum_adi(klasor=KAYIT_KLASORU):
+    adlar = surum_adlari(klasor)
+    son = int(SURUM_DESENI.match(adlar[-1]).group(1)) if adlar else 0
+    return f"v{son + 1:04d}"
+
+# Sürümün üst verisini okur.
+def meta_oku(surum, klasor=KAYIT_KLASORU):
+    with open(os.path.join(klasor, surum, META_DOSYASI), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+# Kayıt defterindeki bütün sürümlerin üst verilerini eskiden yeniye döndürür.
+def surumleri_listele(klasor=KAYIT_KLASORU):
+    return [meta_oku(surum, klasor) for surum in surum_adlari(klasor)]
+
+# Modeli yeni bir sürüm olarak kaydeder ve sürüm adını döndürür. Doğruluk verilmezse rapor dosyasından okunur.
+# ek_bilgi sözlüğü üst veriye eklenir. aktif_et True ise yeni sürüm servis edilecek sürüm yapılır.
+def surumu_kaydet(pipeline, klasor=KAYIT_KLASORU, dogruluk=None, rapor_yolu=None, kaynak='tam_egitim',
+                  ek_bilgi=None, aktif_et=False):
+    os.makedirs(klasor, exist_ok=True)
+    surum = sonraki_surum_adi(klasor)
+    gecici = os.path.join(klasor, f".{surum}.tmp")
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+
+    import joblib
+    model_yolu = os.path.join(gecici, MODEL_DOSYASI)
+    joblib.dump(pipeline, model_yolu)
+    hizli_bicim = _hizli_bicimi_yaz(pipeline, os.path.join(gecici, HIZLI_KLASORU))
+    if rapor_yolu and os.path.exists(rapor_yolu):
+        shutil.copy2(rapor_yolu, os.path.join(gecici, os.path.basename(rapor_yolu)))
+    meta = {
+        "surum": surum,
+        "tarih": datetime.now().isoformat(timespec='seconds'),
+        "dogruluk": dogruluk if dogruluk is not None else dogrulugu_oku(rapor_yolu),
+        "sozluk_boyutu": sozluk_boyutu(pipeline),
+        "ozellik_asamasi": pipeline.steps[0][0] if hasattr(pipeline, 'steps') else None,
+        "kaynak": kaynak,
+        "ozet": dosya_ozeti(model_yolu),
+        "hizli_bicim": hizli_bicim,
+        **(ek_bilgi or {})
+    }
+    with open(os.path.join(gecici, META_DOSYASI), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    os.rename(gecici, os.path.join(klasor, surum))
+    if aktif_et:
+        aktif_yap(surum, klasor)
+    return surum
+
+# Pipeline'ı hızlı biçimde klasöre yazar; model bu biçimle ifade edilemiyorsa uyarı verip False döner.
+def _hizli_bicimi_yaz(pipeline, hedef):
+    from hizli_model import disa_aktar
+    try:
+        disa_aktar(pipeline, hedef)
+        return True
+    except ValueError as e:
+        shutil.rmtree(hedef, ignore_errors=True)
+        logger.warning(f"Hızlı model biçimi yazılamadı: {str(e)}")
+        return False
+
+# Kayıt defterindeki mevcut bir sürüme sonradan hızlı biçim ekler (ör. bu biçimden önce kaydedilmiş sürümler).
+# Hızlı biçim önce geçici klasöre yazılıp atomik olarak yerine taşınır ve üst veri güncellenir.
+def hizli_bicimi_ekle(surum, klasor=KAYIT_KLASORU):
+    if surum not in surum_adlari(klasor):
+        raise ValueError(f"Model sürümü bulunamadı: {surum}")
+    surum_klasoru = os.path.join(klasor, surum)
+    gecici = os.path.join(surum_klasoru, f".{HIZLI_KLASORU}.tmp")
+    shutil.rmtree(gecici, ignore_errors=True)
+    if not _hizli_bicimi_yaz(surumu_yukle(surum, klasor), gecici):
+        raise ValueError(f"{surum} sürümü hızlı biçimde yazılamıyor.")
+    hedef = os.path.join(surum_klasoru, HIZLI_KLASORU)
+    shutil.rmtree(hedef, ignore_errors=True)
+    os.rename(gecici, hedef)
+
+    _meta_guncelle(surum, klasor, hizli_bicim=True)
+    return hedef
+
+# Mevcut bir sürümün hızlı biçimindeki ağaçları derler (derlenmis_model.py); sürümün hızlı biçimi yoksa önce
+# o üretilir. Derleme geçici klasöre yapılıp atomik olarak yerine taşınır ve üst veri güncellenir.
+def derlenmis_bicimi_ekle(surum, klasor=KAYIT_KLASORU):
+    from derlenmis_model import derle
+    surum_klasoru = os.path.join(klasor, surum)
+    hizli_yol = os.path.join(surum_klasoru, HIZLI_KLASORU)
+    if not os.path.isdir(hizli_yol):
+        hizli_bicimi_ekle(surum, klasor)
+    gecici = os.path.join(surum_klasoru, f".{DERLENMIS_KLASORU}.tmp")
+    shutil.rmtree(gecici, ignore_errors=True)
+    derle(hizli_yol, gecici)
+    hedef = os.path.join(surum_klasoru, DERLENMIS_KLASORU)
+    shutil.rmtree(hedef, ignore_errors=True)
+    os.rename(gecici, hedef)
+    _meta_guncelle(surum, klasor, derlenmis_bicim=True)
+    return hedef
+
+# Sürümün üst verisine alanlar ekler; dosya geçici adla yazılıp atomik olarak yerine taşınır.
+def _meta_guncelle(surum, klasor=KAYIT_KLASORU, **alanlar):
+    meta = meta_oku(surum, klasor)
+    meta.update(alanlar)
+    meta_yolu = os.path.join(klasor, surum, META_DOSYASI)
+    with open(meta_yolu + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+    os.replace(meta_yolu + '.tmp', meta_yolu)
+
+# Servis edilecek sürümü değiştirir; AKTIF göstergesi atomik olarak yazılır.
+def aktif_yap(surum, klasor=KAYIT_KLASORU):
+    if surum not in surum_adlari(klasor):
+        raise ValueError(f"Model sürümü bulunamadı: {surum}")
+    gecici = os.path.join(klasor, AKTIF_DOSYASI + '.tmp')
+    with open(gecici, 'w', encoding='utf-8') as f:
+        f.write(surum)
+    os.replace(gecici, os.path.join(klasor, AKTIF_DOSYASI))
+
+# Servis edilecek sürümün adını döndürür; gösterge yoksa None döner.
+def aktif_surum(klasor=KAYIT_KLASORU):
+    try:
+        with open(os.path.join(klasor, AKTIF_DOSYASI), 'r', encoding='utf-8') as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+# Kayıt defterindeki bir sürümün modelini istenen arka uçla yükler ve (model, arka uç) döndürür. Biçim
+# sürümde yoksa veya açılamazsa (ör. tl2cgen kurulu değil) ARKA_UCLAR sırasıyla sonrakine düşülür;
+# "joblib" sklearn Pipeline'ını yükler.
+def surumu_arka_ucla_yukle(surum, klasor=KAYIT_KLASORU, arka_uc=MODEL_ARKA_UCU):
+    if arka_uc not in ARKA_UCLAR:
+        raise ValueError(f"Bilinmeyen model arka ucu: {arka_uc} (seçenekler: {', '.join(ARKA_UCLAR)})")
+    hizli_yol = os.path.join(klasor, surum, HIZLI_KLASORU)
+    derlenmis_yol = os.path.join(klasor, surum, DERLENMIS_KLASORU)
+    for aday in ARKA_UCLAR[ARKA_UCLAR.index(arka_uc):]:
+        try:
+            if aday == 'derlenmis' and os.path.isdir(derlenmis_yol) and os.path.isdir(hizli_yol):
+                from derlenmis_model import DerlenmisModel
+                return DerlenmisModel(hizli_yol, derlenmis_yol), aday
+            if aday == 'hizli' and os.path.isdir(hizli_yol):
+                from hizli_model import HizliModel
+                return HizliModel(hizli_yol), aday
+        except Exception as e:
+            logger.warning(f"{surum} sürümü '{aday}' arka ucuyla yüklenemedi: {str(e)}")
+    import joblib
+    return joblib.load(os.path.join(klasor, surum, MODEL_DOSYASI)), 'joblib'
+
+# Kayıt defterindeki bir sürümün modelini yükler. hizli True ise MODEL_ARKA_UCU ile seçilen biçim (yoksa
+# sıradaki) döndürülür; aksi halde joblib ile Pipeline yüklenir.
+def surumu_yukle(surum, klasor=KAYIT_KLASORU, hizli=False):
+    return surumu_arka_ucla_yukle(surum, klasor, MODEL_ARKA_UCU if hizli else 'joblib')[0]
+
+# Servis edilecek modeli yükler. Kayıt defterinde aktif sürüm yoksa eski tek dosyalık model yüklenir ve
+# sürüm kimliği olarak dosya özeti kullanılır. Kullanılan arka uç üst veriye "arka_uc" olarak eklenir.
+def aktif_modeli_yukle(klasor=KAYIT_KLASORU, eski_yol=ESKI_MODEL_YOLU, arka_uc=MODEL_ARKA_UCU):
+    surum = aktif_surum(klasor)
+    if surum:
+        model, kullanilan = surumu_arka_ucla_yukle(surum, klasor, arka_uc)
+        return AktifModel(model, surum, {**meta_oku(surum, klasor), "arka_uc": kullanilan})
+    import joblib
+    ozet = dosya_ozeti(eski_yol)
+    return AktifModel(joblib.load(eski_yol), ozet, {"surum": ozet, "kaynak": eski_yol, "arka_uc": 'joblib'})
+
+# Aktif modelin değişip değişmediğini anlamak için ucuz bir imza üretir: AKTIF göstergesinin içeriği,
+# gösterge yoksa eski model dosyasının boyutu ve değiştirilme zamanı.
+def degisiklik_imzasi(klasor=KAYIT_KLASORU, eski_yol=ESKI_MODEL_YOLU):
+    surum = aktif_surum(klasor)
+    if surum:
+        return ('kayit', surum)
+    try:
+        bilgi = os.stat(eski_yol)
+        return ('dosya', bilgi.st_size, bilgi.st_mtime_ns)
+    except FileNotFoundError:
+        return None
+
+# Sunucudaki modeli tutan ve yeni sürüme kesintisiz geçen yönetici. Yeni model istek yolunun dışında
+# yüklenir, ardından (model, sürüm) çifti tek atamayla değiştirilir; devam eden istekler ellerindeki
+# eski çifti kullanarak tamamlanır. kontrol_araligi saniyede bir değişiklik imzasına bakan arka plan
+# iş parçacığı yeni sürümü kendiliğinden yükler; yükleme başarısız olursa eski model kullanılmaya devam eder.
+class ModelYoneticisi:
+    def __init__(self, klasor=KAYIT_KLASORU, eski_yol=ESKI_MODEL_YOLU, kontrol_araligi=10.0, degisince=None,
+                 arka_uc=MODEL_ARKA_UCU):
+        self.klasor = klasor
+        self.eski_yol = eski_yol
+        self.arka_uc = arka_uc
+        self.kontrol_araligi = kontrol_araligi
+        self.degisince = degisince
+        self._aktif = None
+        self._imza = None
+        self._yukleme_kilidi = threading.Lock()
+        self._durdur = threading.Event()
+        self.yenile()
+        self._izlemeyi_baslat()
+
+    # O an servis edilen AktifModel'i döndürür; model hiç yüklenemediyse None döner.
+    def guncel(self):
+        return self._aktif
+
+    # İmza değiştiyse (veya zorla True ise) aktif modeli yeniden yükler. Model değiştiyse True döner.
+    def yenile(self, zorla=False):
+        with self._yukleme_kilidi:
+            imza = degisiklik_imzasi(self.klasor, self.eski_yol)
+            if imza is None or (imza == self._imza and not zorla):
+                return False
+            try:
+                yeni = aktif_modeli_yukle(self.klasor, self.eski_yol, self.arka_uc)
+            except Exception as e:
+                logger.error(f"Model yüklenemedi: {str(e)}")
+                return False
+            eski = self._degistir(yeni, imza)
+        return self._bildir(eski, yeni)
+
+    # Kayıt defterindeki bir sürüme geçer. Sürüm önce yüklenir; AKTIF göstergesi ancak yükleme başarılı
+    # olursa yazılır. Böylece bozuk bir sürüm ne diğer işçilere ne de yeniden başlatmaya yayılır; yükleme
+    # başarısız olursa gösterge ve servis edilen model değişmez. Servis edilen AktifModel'i döndürür.
+    def surume_gec(self, surum):
+        if surum not in surum_adlari(self.klasor):
+            raise ValueError(f"Model sürümü bulunamadı: {surum}")
+        with self._yukleme_kilidi:
+            try:
+                model, kullanilan = surumu_arka_ucla_yukle(surum, self.klasor, self.arka_uc)
+                yeni = AktifModel(model, surum, {**meta_oku(surum, self.klasor), "arka_uc": kullanilan})
+            except Exception as e:
+                logger.error(f"{surum} sürümü yüklenemedi, aktif sürüm değiştirilmedi: {str(e)}")
+                return self.guncel()
+            aktif_yap(surum, self.klasor)
+            eski = self._degistir(yeni, degisiklik_imzasi(self.klasor, self.eski_yol))
+        self._bildir(eski, yeni)
+        return self.guncel()
+
+    # Yüklenen modeli servis edilen model yapar (yükleme kilidi tutulurken çağrılır) ve önceki AktifModel'i
+    # döndürür. Sürüm aynıysa model değiştirilmez.
+    def _degistir(self, yeni, imza):
+        self._imza = imza
+        eski = self._aktif
+        if eski is None or eski.surum != yeni.surum:
+            self._aktif = yeni
+            logger.info(f"Model yüklendi (sürüm: {yeni.surum}, arka uç: {yeni.meta.get('arka_uc')})")
+        return eski
+
+    # Model değiştiyse degisince geri çağrısını bildirir; değiştiyse True döner.
+    def _bildir(self, eski, yeni):
+        if eski is not None and eski.surum == yeni.surum:
+            return False
+        if self.degisince and eski is not None:
+            try:
+                self.degisince(eski.surum, yeni.surum)
+            except Exception as e:
+                logger.error(f"Model değişikliği bildirilirken hata: {str(e)}")
+        return True
+
+    # Süreç çatallandıktan (fork) sonra çocuk süreçte çağrılır: yüklü model üst süreçle (copy-on-write)
+    # paylaşılmaya devam eder, yalnızca kilit ve arka plan kontrolü çocuk süreç için yeniden kurulur.
+    def catallandiktan_sonra(self):
+        self._yukleme_kilidi = threading.Lock()
+        self._durdur = threading.Event()
+        self._izlemeyi_baslat()
+
+    # kontrol_araligi verildiyse arka plan kontrolünü başlatır.
+    def _izlemeyi_baslat(self):
+        if self.kontrol_araligi and self.kontrol_araligi > 0:
+            self._isci = threading.Thread(target=self._izle, name="model-izleyici", daemon=True)
+            self._isci.start()
+
+    # Arka planda değişiklik imzasını düzenli aralıklarla kontrol eden döngü.
+    def _izle(self):
+        while not self._durdur.wait(self.kontrol_araligi):
+            self.yenile()
+
+    # Arka plan kontrolünü durdurur.
+    def durdur(self):
+        self._durdur.set()
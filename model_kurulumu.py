@@ -0,0 +1,125 @@
+# model_kurulumu.py
+#
+# Eğitim betiğinin (XGBoost-model-egitimi.py) ve karşılaştırma betiklerinin ortak kullandığı model kurulumu:
+# sınıf dengeleme, eğitim/test ayrımı ve Pipeline. Sınıf dengeleme yöntemi (DENGELEME_YONTEMI):
+#   satir    haberler bir kez ayrılır; eğitim satırlarının dengeleme çekilişi metin kopyaları yerine satır
+#            numaraları üzerinde yapılır ve her satırın çekilme sayısı XGBoost'a sample_weight olarak verilir
+#            (satırı o kadar kopyalamakla eşdeğer). Bellek benzersiz haber sayısıyla orantılı kalır.
+#   agirlik  çekiliş yapılmaz; her satırın ağırlığı hedef / sınıf boyutudur.
+#   kopya    eski yöntem: sınıf başına DataFrame kopyalanıp tekrarlı örneklenir, ayrım dengelenmiş veride
+#            yapılır (aynı haberin kopyaları hem eğitim hem test setine düşebilir).
+# İki özellik aşaması seçilebilir (OZELLIK_ASAMASI):
+#   tfidf    TfidfVectorizer(max_features=3000); sözlük her süreçte Python sözlüğü olarak tutulur ve
+#            yeniden eğitimde sütun eşlemesi değişir.
+#   hashing  HashingVectorizer (işaretli özellik özetleme, 2**HASH_BITLERI sütun) + TfidfTransformer (IDF
+#            ağırlıkları saklanır). Sözlük yoktur; süreç başına bellek sabittir, sütun eşlemesi hiç
+#            değişmediğinden artımlı eğitimde eğitimde görülmemiş kelimeler de özellik üretir.
+# Her iki Pipeline da yalnızca sklearn sınıflarından oluşur; app.py ve hizli_model.py ikisini de tanır.
+
+import os
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer, TfidfTransformer, TfidfVectorizer
+from sklearn.model_selection import train_test_split
+from sklearn.pipeline import Pipeline
+from xgboost import XGBClassifier
+
+from metin_temizleme import TURKCE_STOPWORDS
+
+OZELLIK_ASAMASI = os.environ.get('OZELLIK_ASAMASI', 'tfidf')
+OZELLIK_ASAMALARI = ('tfidf', 'hashing')
+HASH_BITLERI = int(os.environ.get('HASH_BITLERI', '16'))
+
+DENGELEME_YONTEMI = os.environ.get('DENGELEME_YONTEMI', 'satir')
+DENGELEME_YONTEMLERI = ('satir', 'agirlik', 'kopya')
+
+# Sınıf dengeleme sonrası her sınıfın hedef örnek sayısı ve test setine ayrılan oran.
+HEDEF_SINIF_ORNEGI = 5000
+TEST_ORANI = 0.2
+
+# Servis tarafıyla (app.py) aynı durak kelime kümesi.
+turkish_stop_words = sorted(TURKCE_STOPWORDS)
+
+# Her sınıfı hedef örnek sayısına getirir: büyük sınıflar alt örneklenir, küçük sınıflar tekrarlı örneklenir.
+def sinif_dengesini_sagla(df, hedef=HEDEF_SINIF_ORNEGI, etiket_sutunu="durum"):
+    parcalar = []
+    for etiket in df[etiket_sutunu].unique():
+        sinif = df[df[etiket_sutunu] == etiket]
+        if hedef / len(sinif) < 1:
+            parcalar.append(sinif.sample(n=hedef, random_state=42))
+        else:
+            parcalar.append(sinif.sample(frac=hedef / len(sinif), replace=True, random_state=42))
+    return pd.concat(parcalar).sample(frac=1, random_state=42).reset_index(drop=True)
+
+# Veriyi sabit tohumla katmanlı olarak eğitim ve test setlerine ayırır.
+def egitim_test_ayir(df, metin_sutunu="metin", etiket_sutunu="durum"):
+    return train_test_split(df[metin_sutunu], df[etiket_sutunu], test_size=TEST_ORANI, random_state=42,
+                            stratify=df[etiket_sutunu])
+
+# Eğitim satırları için sınıf dengeleyen örnek ağırlıklarını (float32) döndürür. "satir" yönteminde
+# sinif_dengesini_sagla'daki çekiliş satır numaraları üzerinde yapılır ve ağırlık satırın çekilme sayısıdır;
+# "agirlik" yönteminde ağırlık hedef / sınıf boyutudur. İki yöntemde de sınıf başına ağırlık toplamı hedeftir.
+def ornek_agirliklari(etiketler, yontem, hedef):
+    etiketler = np.asarray(etiketler)
+    agirliklar = np.zeros(len(etiketler), dtype=np.float32)
+    for etiket in pd.unique(etiketler):
+        satirlar = np.flatnonzero(etiketler == etiket)
+        if yontem == 'agirlik':
+            agirliklar[satirlar] = hedef / len(satirlar)
+        else:
+            secilen = np.random.RandomState(42).choice(satirlar, size=hedef, replace=len(satirlar) <= hedef)
+            np.add.at(agirliklar, secilen, 1)
+    return agirliklar
+
+# Eğitim ve test verisini seçilen dengeleme yöntemiyle hazırlar; (X_train, X_test, y_train, y_test,
+# agirliklar) döndürür. "kopya" yönteminde agirliklar None'dır. Ağırlıklı yöntemlerde test seti benzersiz
+# haberlerden oluşur ve eğitim tarafının sınıf hedefi, eski yöntemdeki eğitim payıyla aynıdır.
+def egitim_verisini_hazirla(df, yontem=DENGELEME_YONTEMI, hedef=HEDEF_SINIF_ORNEGI):
+    if yontem not in DENGELEME_YONTEMLERI:
+        raise ValueError(f"Bilinmeyen dengeleme yöntemi: {yontem} (seçenekler: {', '.join(DENGELEME_YONTEMLERI)})")
+    if yontem == 'kopya':
+        return (*egitim_test_ayir(sinif_dengesini_sagla(df, hedef)), None)
+    X_train, X_test, y_train, y_test = egitim_test_ayir(df)
+    return X_train, X_test, y_train, y_test, ornek_agirliklari(y_train, yontem, round(hedef * (1 - TEST_ORANI)))
+
+# Seçilen özellik aşamasının Pipeline adımlarını döndürür.
+def ozellik_adimlari(asama=OZELLIK_ASAMASI, hash_bitleri=HASH_BITLERI):
+    if asama == 'tfidf':
+        return [("tfidf", TfidfVectorizer(
+            stop_words=turkish_stop_words,
+            max_features=3000,
+            ngram_range=(1, 1),
+            dtype=np.float32
+        ))]
+    if asama == 'hashing':
+        return [
+            ("hashing", HashingVectorizer(
+                stop_words=turkish_stop_words,
+                n_features=2 ** hash_bitleri,
+                ngram_range=(1, 1),
+                alternate_sign=True,
+                norm=None,
+                dtype=np.float32
+            )),
+            ("idf", TfidfTransformer())
+        ]
+    raise ValueError(f"Bilinmeyen özellik aşaması: {asama} (seçenekler: {', '.join(OZELLIK_ASAMALARI)})")
+
+# Üretimdeki XGBoost sınıflandırıcısını (eğitilmemiş) döndürür.
+def xgboost_olustur():
+    return XGBClassifier(
+        objective='multi:softmax',
+        num_class=11,
+        eval_metric='mlogloss',
+        random_state=42,
+        tree_method='hist',
+        n_jobs=4,
+        n_estimators=100,
+        max_depth=5,
+        learning_rate=0.1
+    )
+
+# Özellik aşaması ve XGBoost sınıflandırıcısından oluşan eğitilmemiş Pipeline'ı döndürür.
+def pipeline_olustur(asama=OZELLIK_ASAMASI, hash_bitleri=HASH_BITLERI):
+    return Pipeline(ozellik_adimlari(asama, hash_bitleri) + [("xgb", xgboost_olustur())])
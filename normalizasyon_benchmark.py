@@ -0,0 +1,106 @@
+# normalizasyon_benchmark.py
+#
+# Eski metin temizleme fonksiyonları (app.py'deki temizle_metin ve XGBoost-model-egitimi.py'deki temizle)
+# ile ortak metin_temizleme.normalize_et fonksiyonunun haber başına gecikmesini karşılaştırır.
+# Yeni fonksiyonun çıktısı eğitimdeki eski temizle fonksiyonuyla birebir aynı olmalıdır; farklıysa hata verir.
+#
+# Kullanım: python normalizasyon_benchmark.py [--csv csv_dosyası/haberveriseti.csv] [--adet 2000] [--tekrar 5]
+# CSV verilmezse (veya bulunamazsa) sentetik Türkçe haber metinleri üretilir.
+
+import argparse
+import os
+import random
+import re
+import statistics
+import sys
+import time
+
+from metin_temizleme import TURKCE_STOPWORDS, normalize_et
+
+# Eğitim betiğinin kullandığı liste halindeki durak kelimeler (eski davranış).
+ESKI_STOPWORDS = sorted(TURKCE_STOPWORDS)
+
+# app.py'deki eski temizle_metin: her çağrıda desenleri dizgiden çözen üç ayrı re.sub geçişi.
+def eski_servis_temizle(metin):
+    metin = metin.lower()
+    metin = re.sub(r'[^\w\s]', ' ', metin)
+    metin = re.sub(r'\d+', ' ', metin)
+    metin = re.sub(r'\s+', ' ', metin).strip()
+    return metin
+
+# XGBoost-model-egitimi.py'deki eski temizle: aynı üç geçiş ve listede aranan durak kelimeler.
+def eski_egitim_temizle(metin):
+    metin = eski_servis_temizle(metin)
+    kelimeler = [kelime for kelime in metin.split() if kelime not in ESKI_STOPWORDS and len(kelime) > 2]
+    return ' '.join(kelimeler)
+
+# Gerçek veri yoksa kullanılacak, noktalama ve sayı içeren sentetik haber metinleri üretir.
+def sentetik_haberler(adet, tohum=42):
+    rastgele = random.Random(tohum)
+    kelimeler = ['ekonomi', 'deprem', 'İstanbul', 'Ankara', 'açıklama', 'bakanlık', 'yüzde', 'kaza', 'maç',
+                 'seçim', 'öğrenci', 'hastane', 'yangın', 'başarı', 'festival', 'ihracat', 'Türkiye',
+                 'belediye', 'yatırım', 'güvenlik'] + ESKI_STOPWORDS
+    haberler = []
+    for _ in range(adet):
+        parcalar = []
+        for _ in range(rastgele.randint(150, 600)):
+            kelime = rastgele.choice(kelimeler)
+            r = rastgele.random()
+            if r < 0.05:
+                kelime += f" {rastgele.randint(1, 2025)}"
+            elif r < 0.15:
+                kelime += rastgele.choice([',', '.', '!', '?', ':', '"', "'"])
+            parcalar.append(kelime)
+        haberler.append(' '.join(parcalar))
+    return haberler
+
+# CSV dosyasının "metin" sütunundan en fazla adet kadar haber okur.
+def csv_haberleri(yol, adet):
+    import pandas as pd
+    return pd.read_csv(yol, usecols=['metin'], nrows=adet)['metin'].dropna().astype(str).tolist()
+
+# Fonksiyonu tüm haberler üzerinde tekrar sayısı kadar çalıştırır; en iyi turun haber başına süresini (µs) döndürür.
+def olc(fonksiyon, haberler, tekrar):
+    turlar = []
+    for _ in range(tekrar):
+        baslangic = time.perf_counter()
+        for metin in haberler:
+            fonksiyon(metin)
+        turlar.append((time.perf_counter() - baslangic) / len(haberler) * 1e6)
+    return min(turlar), statistics.median(turlar)
+
+def main():
+    parser = argparse.ArgumentParser(description="Metin normalizasyonu mikro karşılaştırması")
+    parser.add_argument('--csv', default=None, help="'metin' sütunu içeren CSV dosyası")
+    parser.add_argument('--adet', type=int, default=2000, help="Ölçülecek haber sayısı")
+    parser.add_argument('--tekrar', type=int, default=5, help="Tekrar sayısı (en iyi tur raporlanır)")
+    args = parser.parse_args()
+
+    if args.csv and os.path.exists(args.csv):
+        haberler = csv_haberleri(args.csv, args.adet)
+        kaynak = args.csv
+    else:
+        haberler = sentetik_haberler(args.adet)
+        kaynak = "sentetik"
+    ortalama_uzunluk = sum(len(h) for h in haberler) / len(haberler)
+    print(f"Veri: {kaynak}, {len(haberler)} haber, ortalama {ortalama_uzunluk:.0f} karakter\n")
+
+    farkli = sum(1 for metin in haberler if normalize_et(metin) != eski_egitim_temizle(metin))
+    if farkli:
+        print(f"[HATA] {farkli} haberde normalize_et çıktısı eğitimdeki temizle çıktısından farklı.")
+        return 1
+
+    sonuclar = [
+        ("eski servis (app.temizle_metin)", olc(eski_servis_temizle, haberler, args.tekrar)),
+        ("eski eğitim (temizle, liste)", olc(eski_egitim_temizle, haberler, args.tekrar)),
+        ("yeni normalize_et", olc(normalize_et, haberler, args.tekrar)),
+    ]
+    print(f"{'Fonksiyon':<34}{'en iyi µs/haber':>17}{'medyan µs/haber':>17}")
+    for ad, (en_iyi, medyan) in sonuclar:
+        print(f"{ad:<34}{en_iyi:>17.1f}{medyan:>17.1f}")
+    print(f"\nEğitim tarafında hızlanma: {sonuclar[1][1][0] / sonuclar[2][1][0]:.2f}x "
+          f"(çıktılar {len(haberler)} haberde birebir aynı)")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
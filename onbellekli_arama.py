@@ -0,0 +1,223 @@
+# onbellekli_arama.py
+#
+# Pipeline(vektörleştirici, model) için özellik önbellekli hiperparametre araması. GridSearchCV her aday ve
+# her katman için vektörleştiriciyi yeniden eğitir; oysa vektörleştirici ayarlarının sayısı azdır (ör. 3x2),
+# model ayarları ise yüzlerce adaydır. Burada her farklı vektörleştirici ayarı her katman için bir kez
+# eğitilir, eğitim/doğrulama matrisleri ozellik_onbellegi.py ile diske yazılır ve model adayları bu bellek
+# eşlemeli matrisler üzerinde (paralel işçiler aynı sayfa önbelleğini paylaşarak) denenir. Önbellek veriye,
+# vektörleştirici ayarına ve katmana göre anahtarlandığından sonraki çalıştırmalar vektörleştirmeyi atlar.
+#
+# Arama yöntemleri:
+#   grid     bütün adaylar bütün katmanlarda denenir (GridSearchCV ile aynı sonuç)
+#   halving  ardışık yarılama (HalvingGridSearchCV gibi): adaylar önce az sayıda eğitim örneğiyle denenir, her
+#            turda en iyi 1/factor'lük kısım factor kat fazla örnekle sonraki tura kalır. Özellikler katmanın
+#            bütün eğitim verisiyle çıkarılır, yalnızca model alt örneklem üzerinde eğitilir.
+# GridSearchCV ile aynı adları taşır (best_params_, best_score_, best_estimator_, cv_results_); betiklerde
+# yerine doğrudan kullanılabilir.
+
+import hashlib
+import itertools
+import math
+import os
+import time
+import warnings
+
+import joblib
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.base import clone
+from sklearn.metrics import get_scorer
+from sklearn.model_selection import StratifiedKFold, train_test_split
+from sklearn.pipeline import Pipeline
+
+from ozellik_onbellegi import ONBELLEK_KLASORU, onbellek_anahtari, onbellek_klasoru, onbellegi_yaz, seyrek_kaydet, seyrek_yukle
+
+ARAMA_YONTEMLERI = ('grid', 'halving')
+
+# Metinlerin ve etiketlerin SHA-256 özetini üretir; önbellek anahtarında veri kimliği olarak kullanılır.
+def veri_ozeti(metinler, etiketler):
+    ozet = hashlib.sha256()
+    for metin in metinler:
+        ozet.update(str(metin).encode('utf-8'))
+        ozet.update(b'\0')
+    ozet.update(np.asarray(etiketler).astype(np.int64).tobytes())
+    return ozet.hexdigest()[:16]
+
+# Parametre ızgarasındaki bütün kombinasyonları sözlük listesi olarak döndürür.
+def izgara_kombinasyonlari(izgara):
+    anahtarlar = sorted(izgara)
+    return [dict(zip(anahtarlar, degerler)) for degerler in itertools.product(*(izgara[a] for a in anahtarlar))]
+
+# Bir model adayını önbellekteki katman matrisleriyle eğitip (doğrulama puanı, hata mesajı) döndürür; eğitim
+# hata verirse GridSearchCV'deki gibi puan NaN olur. satirlar verilirse model yalnızca bu satırlarla eğitilir.
+def _adayi_degerlendir(model, parametreler, klasor, y_egitim, y_dogrulama, satirlar, puanlama):
+    X_egitim, X_dogrulama = seyrek_yukle(klasor, "X_egitim"), seyrek_yukle(klasor, "X_dogrulama")
+    if satirlar is not None:
+        X_egitim, y_egitim = X_egitim[satirlar], y_egitim[satirlar]
+    model = clone(model).set_params(**parametreler)
+    try:
+        model.fit(X_egitim, y_egitim)
+        return float(get_scorer(puanlama)(model, X_dogrulama, y_dogrulama)), None
+    except Exception as e:
+        return np.nan, f"{parametreler}: {str(e)}"
+
+class OnbellekliArama:
+    def __init__(self, pipeline, param_grid, cv=5, scoring='f1_weighted', yontem='grid', factor=3, n_jobs=-1,
+                 verbose=1, onbellek_kok=ONBELLEK_KLASORU, random_state=42):
+        if yontem not in ARAMA_YONTEMLERI:
+            raise ValueError(f"Bilinmeyen arama yöntemi: {yontem} (seçenekler: {', '.join(ARAMA_YONTEMLERI)})")
+        if len(pipeline.steps) != 2:
+            raise ValueError("Pipeline iki adımlı (vektörleştirici, model) olmalıdır.")
+        self.pipeline = pipeline
+        self.param_grid = param_grid
+        self.cv = cv
+        self.scoring = scoring
+        self.yontem = yontem
+        self.factor = factor
+        self.n_jobs = n_jobs
+        self.verbose = verbose
+        self.onbellek_kok = onbellek_kok
+        self.random_state = random_state
+
+    def _yaz(self, mesaj):
+        if self.verbose:
+            print(mesaj)
+
+    # Izgarayı vektörleştirici ayarları ve model ayarları olarak ikiye ayırır (adım adı önekine göre).
+    def _izgarayi_ayir(self):
+        vektor_adi, model_adi = self.pipeline.steps[0][0], self.pipeline.steps[1][0]
+        vektor_izgara, model_izgara = {}, {}
+        for anahtar, degerler in self.param_grid.items():
+            adim, _, parametre = anahtar.partition('__')
+            if adim == vektor_adi:
+                vektor_izgara[parametre] = degerler
+            elif adim == model_adi:
+                model_izgara[parametre] = degerler
+            else:
+                raise ValueError(f"Izgara anahtarı bir Pipeline adımına ait değil: {anahtar}")
+        return vektor_adi, model_adi, izgara_kombinasyonlari(vektor_izgara), izgara_kombinasyonlari(model_izgara)
+
+    # Vektörleştirici ayarını verilen eğitim satırlarında eğitip matrisleri önbelleğe yazar (yoksa) ve
+    # önbellek klasörünü döndürür. dogrulama_satirlari None ise yalnızca eğitilmiş vektörleştirici saklanır.
+    def _ozellikleri_hazirla(self, ozet, vektor_ayari, katman, metinler, egitim_satirlari, dogrulama_satirlari):
+        vektorlestirici = clone(self.pipeline.steps[0][1]).set_params(**vektor_ayari)
+        girdiler = {
+            "veri": ozet,
+            "vektorlestirici": type(vektorlestirici).__name__,
+            "ayarlar": repr(sorted(vektorlestirici.get_params().items())),
+            "katman": katman,
+        }
+        anahtar = onbellek_anahtari(girdiler)
+        klasor, hazir = onbellek_klasoru(anahtar, self.onbellek_kok)
+        if hazir:
+            return klasor
+
+        def yaz(hedef):
+            seyrek_kaydet(vektorlestirici.fit_transform(metinler[egitim_satirlari]), hedef, "X_egitim")
+            if dogrulama_satirlari is not None:
+                seyrek_kaydet(vektorlestirici.transform(metinler[dogrulama_satirlari]), hedef, "X_dogrulama")
+            joblib.dump(vektorlestirici, os.path.join(hedef, "vektorlestirici.joblib"))
+
+        return onbellegi_yaz(anahtar, girdiler, yaz, self.onbellek_kok)
+
+    # Adayları (vektörleştirici ayarı sırası, model ayarı) bütün katmanlarda dener; satir_sayisi verilirse
+    # model her katmanda eğitim verisinin katmanlı bir alt örneklemiyle eğitilir. Aday başına puanları döndürür.
+    def _adaylari_dene(self, adaylar, katman_klasorleri, katmanlar, y, model, model_ayarlari, satir_sayisi):
+        gorevler = []
+        for vektor_sira, model_sira in adaylar:
+            for katman_sira, (egitim, dogrulama) in enumerate(katmanlar):
+                satirlar = None
+                # Katmanlı alt örneklemde dışarıda kalan kısım her sınıftan en az bir örnek alabilmelidir.
+                if satir_sayisi is not None and satir_sayisi <= len(egitim) - len(np.unique(y[egitim])):
+                    satirlar, _ = train_test_split(np.arange(len(egitim)), train_size=satir_sayisi,
+                                                   stratify=y[egitim], random_state=self.random_state)
+                    satirlar = np.sort(satirlar)
+                gorevler.append(delayed(_adayi_degerlendir)(
+                    model, model_ayarlari[model_sira], katman_klasorleri[vektor_sira][katman_sira],
+                    y[egitim], y[dogrulama], satirlar, self.scoring))
+        sonuclar = Parallel(n_jobs=self.n_jobs)(gorevler)
+        hatalar = [hata for _, hata in sonuclar if hata]
+        if hatalar:
+            warnings.warn(f"{len(gorevler)} eğitimden {len(hatalar)} tanesi hata verdi, puanları NaN sayıldı. "
+                          f"İlk hata: {hatalar[0]}")
+        return np.asarray([puan for puan, _ in sonuclar], dtype=np.float64).reshape(len(adaylar), len(katmanlar))
+
+    def fit(self, X, y):
+        baslangic = time.perf_counter()
+        metinler = np.asarray(list(X), dtype=object)
+        y = np.asarray(y)
+        vektor_adi, model_adi, vektor_ayarlari, model_ayarlari = self._izgarayi_ayir()
+        model = self.pipeline.steps[1][1]
+        katmanlar = list(StratifiedKFold(n_splits=self.cv).split(metinler, y))
+        ozet = veri_ozeti(metinler, y)
+
+        self._yaz(f"{len(vektor_ayarlari)} vektörleştirici ayarı x {len(katmanlar)} katman için özellikler "
+                  f"hazırlanıyor (önbellek: {self.onbellek_kok})...")
+        katman_klasorleri = [
+            [self._ozellikleri_hazirla(ozet, vektor_ayari, f"{sira}/{self.cv}", metinler, egitim, dogrulama)
+             for sira, (egitim, dogrulama) in enumerate(katmanlar)]
+            for vektor_ayari in vektor_ayarlari
+        ]
+        self._yaz(f"Özellikler hazır ({time.perf_counter() - baslangic:.1f} s).")
+
+        adaylar = [(v, m) for v in range(len(vektor_ayarlari)) for m in range(len(model_ayarlari))]
+        sonuclar = []
+        if self.yontem == 'grid':
+            self._yaz(f"{len(adaylar)} aday x {len(katmanlar)} katman deneniyor...")
+            puanlar = self._adaylari_dene(adaylar, katman_klasorleri, katmanlar, y, model, model_ayarlari, None)
+            sonuclar.append((0, len(katmanlar[0][0]), adaylar, puanlar))
+        else:
+            en_cok = len(katmanlar[0][0])
+            tur_sayisi = 1 + int(math.floor(math.log(len(adaylar), self.factor))) if len(adaylar) > 1 else 1
+            en_az = max(2 * self.cv * len(np.unique(y)), en_cok // self.factor ** (tur_sayisi - 1))
+            kalan = adaylar
+            for tur in range(tur_sayisi):
+                satir_sayisi = min(en_cok, en_az * self.factor ** tur)
+                self._yaz(f"Tur {tur + 1}/{tur_sayisi}: {len(kalan)} aday, katman başına {satir_sayisi} örnek...")
+                puanlar = self._adaylari_dene(kalan, katman_klasorleri, katmanlar, y, model, model_ayarlari,
+                                              satir_sayisi)
+                sonuclar.append((tur, satir_sayisi, kalan, puanlar))
+                if tur < tur_sayisi - 1:
+                    ortalamalar = np.nan_to_num(puanlar.mean(axis=1), nan=-np.inf)
+                    sira = np.argsort(-ortalamalar, kind='stable')[:max(1, math.ceil(len(kalan) / self.factor))]
+                    kalan = [kalan[i] for i in sorted(sira)]
+
+        # En iyi aday, son turdaki en yüksek ortalama puanlı adaydır.
+        _, _, son_adaylar, son_puanlar = sonuclar[-1]
+        ortalamalar = son_puanlar.mean(axis=1)
+        if np.all(np.isnan(ortalamalar)):
+            raise ValueError("Hiçbir aday eğitilemedi.")
+        vektor_sira, model_sira = son_adaylar[int(np.nanargmax(ortalamalar))]
+        self.best_score_ = float(np.nanmax(ortalamalar))
+        self.best_params_ = {
+            **{f"{vektor_adi}__{k}": v for k, v in vektor_ayarlari[vektor_sira].items()},
+            **{f"{model_adi}__{k}": v for k, v in model_ayarlari[model_sira].items()},
+        }
+        self.cv_results_ = {"params": [], "mean_test_score": [], "std_test_score": [], "iter": [], "n_resources": []}
+        for tur, satir_sayisi, tur_adaylari, puanlar in sonuclar:
+            for (v, m), aday_puanlari in zip(tur_adaylari, puanlar):
+                self.cv_results_["params"].append({
+                    **{f"{vektor_adi}__{k}": deger for k, deger in vektor_ayarlari[v].items()},
+                    **{f"{model_adi}__{k}": deger for k, deger in model_ayarlari[m].items()},
+                })
+                self.cv_results_["mean_test_score"].append(float(np.mean(aday_puanlari)))
+                self.cv_results_["std_test_score"].append(float(np.std(aday_puanlari)))
+                self.cv_results_["iter"].append(tur)
+                self.cv_results_["n_resources"].append(satir_sayisi)
+
+        # En iyi ayarlarla bütün eğitim verisinde son model; vektörleştirici bu aşamada da önbellekten gelir.
+        self._yaz(f"En iyi ayarlar ({self.best_score_:.4f}): {self.best_params_}. Son model eğitiliyor...")
+        tam_klasor = self._ozellikleri_hazirla(ozet, vektor_ayarlari[vektor_sira], "tam", metinler,
+                                               np.arange(len(metinler)), None)
+        son_model = clone(model).set_params(**model_ayarlari[model_sira])
+        son_model.fit(seyrek_yukle(tam_klasor, "X_egitim", bellek_esle=False), y)
+        self.best_estimator_ = Pipeline([
+            (vektor_adi, joblib.load(os.path.join(tam_klasor, "vektorlestirici.joblib"))),
+            (model_adi, son_model),
+        ])
+        self.arama_suresi_ = time.perf_counter() - baslangic
+        self._yaz(f"Arama tamamlandı ({self.arama_suresi_:.1f} s).")
+        return self
+
+    def predict(self, X):
+        return self.best_estimator_.predict(X)
@@ -0,0 +1,107 @@
+# ozellik_karsilastirma.py
+#
+# TF-IDF (sözlüklü) ve özellik özetleme (HashingVectorizer + IDF) aşamalarını aynı veri ve aynı
+# eğitim/test ayrımı üzerinde karşılaştırır: test doğruluğu, eğitim süresi, tek haber ve toplu tahmin
+# gecikmesi ve özellik aşamasının sunucu sürecinde tuttuğu boyut (pickle ve hızlı biçim).
+# Veri, eğitim betiğinin yazdığı temizlenmiş korpus önbelleğidir; sınıf dengeleme ve ayrım eğitimdekiyle aynıdır.
+#
+# Kullanım: python ozellik_karsilastirma.py [--veri csv_dosyası/korpus_temiz.parquet] [--hash-bitleri 16]
+#                                           [--adet 200]
+
+import argparse
+import os
+import pickle
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+import pandas as pd
+from sklearn.metrics import accuracy_score, f1_score
+
+from hizli_model import HizliModel, disa_aktar
+from model_kurulumu import HASH_BITLERI, egitim_verisini_hazirla, pipeline_olustur
+
+# Klasördeki dosyaların toplam boyutunu bayt olarak döndürür.
+def klasor_boyutu(klasor, haric=()):
+    return sum(os.path.getsize(os.path.join(klasor, ad)) for ad in os.listdir(klasor) if ad not in haric)
+
+# Tahmin fonksiyonunu metinler üzerinde tek tek çağırır; istek başına medyan süreyi (ms) döndürür.
+def tekli_gecikme(tahmin, metinler):
+    sureler = []
+    for metin in metinler:
+        baslangic = time.perf_counter()
+        tahmin([metin])
+        sureler.append((time.perf_counter() - baslangic) * 1e3)
+    return statistics.median(sureler)
+
+# Tahmin fonksiyonunu bütün metinlerle tek seferde çağırır; haber başına süreyi (ms) döndürür.
+def toplu_gecikme(tahmin, metinler):
+    baslangic = time.perf_counter()
+    tahmin(metinler)
+    return (time.perf_counter() - baslangic) * 1e3 / len(metinler)
+
+# Bir özellik aşamasıyla modeli eğitir ve ölçümleri sözlük olarak döndürür.
+def degerlendir(asama, hash_bitleri, X_train, X_test, y_train, y_test, agirliklar, adet):
+    pipeline = pipeline_olustur(asama, hash_bitleri)
+    baslangic = time.perf_counter()
+    pipeline.fit(X_train, y_train, **({} if agirliklar is None else {"xgb__sample_weight": agirliklar}))
+    egitim_suresi = time.perf_counter() - baslangic
+    y_pred = pipeline.predict(X_test)
+
+    ornekler = list(X_test[:adet])
+    klasor = tempfile.mkdtemp()
+    try:
+        disa_aktar(pipeline, klasor)
+        hizli = HizliModel(klasor)
+        hizli_boyut = klasor_boyutu(klasor, haric=('booster.ubj',))
+        hizli_tekli = tekli_gecikme(hizli.predict, ornekler)
+    finally:
+        shutil.rmtree(klasor, ignore_errors=True)
+    return {
+        "dogruluk": accuracy_score(y_test, y_pred),
+        "f1": f1_score(y_test, y_pred, average='macro', zero_division=0),
+        "egitim_s": egitim_suresi,
+        "tekli_ms": tekli_gecikme(pipeline.predict, ornekler),
+        "toplu_ms": toplu_gecikme(pipeline.predict, ornekler),
+        "hizli_tekli_ms": hizli_tekli,
+        "ozellik_pickle_kb": len(pickle.dumps(pipeline[:-1])) / 1024,
+        "hizli_kb": hizli_boyut / 1024,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="TF-IDF ve özellik özetleme aşamalarının karşılaştırması")
+    parser.add_argument('--veri', default="csv_dosyası/korpus_temiz.parquet",
+                        help="'metin' ve 'durum' sütunlu temizlenmiş korpus (Parquet veya CSV)")
+    parser.add_argument('--hash-bitleri', type=int, default=HASH_BITLERI, help="Özetlemede sütun sayısı 2**bit")
+    parser.add_argument('--adet', type=int, default=200, help="Gecikme ölçümündeki test haberi sayısı")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.veri):
+        print(f"[HATA] Veri bulunamadı: {args.veri} (önce XGBoost-model-egitimi.py çalıştırılmalı)")
+        return 1
+    df = pd.read_parquet(args.veri) if args.veri.endswith('.parquet') else pd.read_csv(args.veri)
+    df = df.dropna(subset=["metin", "durum"])
+    df["durum"] = df["durum"].astype(int)
+    X_train, X_test, y_train, y_test, agirliklar = egitim_verisini_hazirla(df)
+    print(f"Veri: {args.veri}, eğitim {len(X_train)} / test {len(X_test)} haber\n")
+
+    sonuclar = []
+    for ad, asama in (("tfidf (3000 terim)", "tfidf"), (f"hashing (2**{args.hash_bitleri})", "hashing")):
+        print(f"{ad} eğitiliyor...")
+        sonuclar.append((ad, degerlendir(asama, args.hash_bitleri, X_train, X_test, y_train, y_test, agirliklar,
+                                         args.adet)))
+
+    print(f"\n{'Özellik aşaması':<20}{'doğruluk':>10}{'makro F1':>10}{'eğitim':>9}{'tekli':>10}{'toplu':>10}"
+          f"{'hızlı tekli':>13}{'pickle':>10}{'hızlı biçim':>13}")
+    for ad, s in sonuclar:
+        print(f"{ad:<20}{s['dogruluk']:>10.4f}{s['f1']:>10.4f}{s['egitim_s']:>8.1f}s{s['tekli_ms']:>8.2f}ms"
+              f"{s['toplu_ms']:>8.2f}ms{s['hizli_tekli_ms']:>11.2f}ms{s['ozellik_pickle_kb']:>8.0f}KB"
+              f"{s['hizli_kb']:>11.0f}KB")
+    print("\ntekli: /predict gibi tek haberlik istek (medyan), toplu: haber başına toplu tahmin, "
+          "pickle: özellik aşamasının joblib içindeki boyutu")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,66 @@
+# ozellik_onbellegi.py
+#
+# Karşılaştırma ve hiperparametre arama betiklerinin ortak kullandığı özellik matrisi önbelleği.
+# Seyrek (CSR) matrisler data/indices/indptr parçaları ayrı .npy dosyaları olarak saklanır ve
+# np.load(mmap_mode='r') ile kopyalanmadan açılır; aynı matrisi okuyan süreçler işletim sisteminin sayfa
+# önbelleğini paylaşır. Her önbellek klasörü, girdilerinden üretilen bir anahtarla adlandırılır; girdi
+# değişince (veri dosyası, özellik ayarları) yeni klasör oluşturulur.
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+ONBELLEK_KLASORU = "csv_dosyası/ozellik_onbellegi"
+ONBELLEK_SURUMU = 1
+ANAHTAR_DOSYASI = "anahtar.json"
+
+# Dosyanın yolunu, boyutunu ve değiştirilme zamanını anahtarda kullanılacak biçimde döndürür.
+def dosya_imzasi(yol):
+    bilgi = os.stat(yol)
+    return f"{os.path.abspath(yol)}|{bilgi.st_size}|{bilgi.st_mtime_ns}"
+
+# Önbellek girdilerinden (JSON'a çevrilebilir sözlük) kısa bir anahtar üretir.
+def onbellek_anahtari(girdiler):
+    metin = json.dumps({"surum": ONBELLEK_SURUMU, **girdiler}, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(metin.encode('utf-8')).hexdigest()[:16]
+
+# Seyrek matrisi klasöre <ad>.data.npy, <ad>.indices.npy, <ad>.indptr.npy ve <ad>.shape.json olarak yazar.
+def seyrek_kaydet(X, klasor, ad):
+    X = X.tocsr()
+    X.sort_indices()
+    for parca in ('data', 'indices', 'indptr'):
+        np.save(os.path.join(klasor, f"{ad}.{parca}.npy"), getattr(X, parca))
+    with open(os.path.join(klasor, f"{ad}.shape.json"), 'w', encoding='utf-8') as f:
+        json.dump(list(X.shape), f)
+
+# seyrek_kaydet ile yazılmış matrisi CSR olarak açar; bellek_esle True ise parçalar belleğe kopyalanmaz.
+def seyrek_yukle(klasor, ad, bellek_esle=True):
+    import scipy.sparse
+    mod = 'r' if bellek_esle else None
+    parcalar = [np.load(os.path.join(klasor, f"{ad}.{parca}.npy"), mmap_mode=mod)
+                for parca in ('data', 'indices', 'indptr')]
+    with open(os.path.join(klasor, f"{ad}.shape.json"), 'r', encoding='utf-8') as f:
+        sekil = tuple(json.load(f))
+    return scipy.sparse.csr_matrix(tuple(parcalar), shape=sekil, copy=False)
+
+# Anahtarın önbellek klasörünü döndürür; klasör tamamlanmışsa (anahtar dosyası varsa) hazır True olur.
+def onbellek_klasoru(anahtar, kok=ONBELLEK_KLASORU):
+    klasor = os.path.join(kok, anahtar)
+    return klasor, os.path.exists(os.path.join(klasor, ANAHTAR_DOSYASI))
+
+# Önbellek klasörünü yazar: yaz(gecici_klasor) çağrılır, ardından anahtar dosyası eklenip klasör atomik
+# olarak yerine taşınır. Yarım kalan bir yazım hiçbir zaman hazır önbellek olarak görülmez.
+def onbellegi_yaz(anahtar, girdiler, yaz, kok=ONBELLEK_KLASORU):
+    klasor = os.path.join(kok, anahtar)
+    gecici = os.path.join(kok, f".{anahtar}.tmp")
+    shutil.rmtree(gecici, ignore_errors=True)
+    os.makedirs(gecici)
+    yaz(gecici)
+    with open(os.path.join(gecici, ANAHTAR_DOSYASI), 'w', encoding='utf-8') as f:
+        json.dump({"surum": ONBELLEK_SURUMU, **girdiler}, f, ensure_ascii=False, indent=2, default=str)
+    shutil.rmtree(klasor, ignore_errors=True)
+    os.rename(gecici, klasor)
+    return klasor
@@ -0,0 +1,114 @@
+# soguk_baslangic_benchmark.py
+#
+# Sunucunun (veya her işçi sürecinin) soğuk açılışını karşılaştırır: joblib ile saklanan Pipeline ile
+# hızlı biçimdeki model (hizli_model.HizliModel) ayrı ayrı, her ölçümde yeni bir Python sürecinde
+# içe aktarma + model yükleme + ilk tahmin süreleriyle ve bellek kullanımıyla ölçülür. Hızlı biçimin
+# tahminleri Pipeline ile birebir aynı olmalıdır; farklıysa hata verir.
+#
+# Kullanım: python soguk_baslangic_benchmark.py [--surum v0003] [--csv csv_dosyası/haberveriseti.csv]
+#                                               [--adet 500] [--tekrar 5]
+# Sürüm verilmezse aktif sürüm kullanılır; sürümün hızlı biçimi yoksa önce üretilir.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from metin_temizleme import normalize_et
+from model_kayit_defteri import HIZLI_KLASORU, KAYIT_KLASORU, MODEL_DOSYASI, aktif_surum, hizli_bicimi_ekle
+from normalizasyon_benchmark import csv_haberleri, sentetik_haberler
+
+# Ölçüm sürecinde çalışan kod; sonuçları tek satır JSON olarak yazar.
+OLCUM_KODU = '''
+import json, resource, sys, time
+# ru_maxrss Linux'ta üst süreçten devralındığından tepe bellek varsa /proc'tan (VmHWM) okunur.
+def tepe_bellek_mb():
+    try:
+        with open("/proc/self/status") as f:
+            return next(int(s.split()[1]) for s in f if s.startswith("VmHWM:")) / 1024
+    except (OSError, StopIteration):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+baslangic = time.perf_counter()
+if sys.argv[1] == "joblib":
+    import joblib
+    ice_aktarma = time.perf_counter()
+    model = joblib.load(sys.argv[2])
+else:
+    from hizli_model import HizliModel
+    ice_aktarma = time.perf_counter()
+    model = HizliModel(sys.argv[2])
+yukleme = time.perf_counter()
+model.predict([sys.argv[3]])
+ilk_tahmin = time.perf_counter()
+print(json.dumps({
+    "ice_aktarma": ice_aktarma - baslangic,
+    "yukleme": yukleme - ice_aktarma,
+    "ilk_tahmin": ilk_tahmin - yukleme,
+    "toplam": ilk_tahmin - baslangic,
+    "bellek_mb": tepe_bellek_mb(),
+    "sklearn": "sklearn" in sys.modules
+}))
+'''
+
+# Yükleyiciyi tekrar sayısı kadar ayrı süreçte çalıştırır; her ölçütün medyanını döndürür.
+def olc(yukleyici, yol, ornek_metin, tekrar):
+    olcumler = []
+    for _ in range(tekrar):
+        cikti = subprocess.run([sys.executable, '-c', OLCUM_KODU, yukleyici, yol, ornek_metin],
+                               capture_output=True, text=True, check=True,
+                               cwd=os.path.dirname(os.path.abspath(__file__)))
+        olcumler.append(json.loads(cikti.stdout.strip().splitlines()[-1]))
+    sonuc = {anahtar: statistics.median(o[anahtar] for o in olcumler)
+             for anahtar in ("ice_aktarma", "yukleme", "ilk_tahmin", "toplam", "bellek_mb")}
+    sonuc["sklearn"] = any(o["sklearn"] for o in olcumler)
+    return sonuc
+
+def main():
+    parser = argparse.ArgumentParser(description="Model soğuk açılış karşılaştırması (joblib / hızlı biçim)")
+    parser.add_argument('--surum', default=None, help="Model sürümü (varsayılan: aktif sürüm)")
+    parser.add_argument('--csv', default=None, help="Tahmin eşitliği için 'metin' sütunu içeren CSV dosyası")
+    parser.add_argument('--adet', type=int, default=500, help="Tahmin eşitliği kontrolündeki haber sayısı")
+    parser.add_argument('--tekrar', type=int, default=5, help="Her yükleyici için süreç sayısı (medyan raporlanır)")
+    args = parser.parse_args()
+
+    surum = args.surum or aktif_surum()
+    if not surum:
+        print(f"[HATA] Kayıt defterinde ({KAYIT_KLASORU}) aktif sürüm yok; --surum verin.")
+        return 1
+    model_yolu = os.path.abspath(os.path.join(KAYIT_KLASORU, surum, MODEL_DOSYASI))
+    hizli_yol = os.path.abspath(os.path.join(KAYIT_KLASORU, surum, HIZLI_KLASORU))
+    if not os.path.isdir(hizli_yol):
+        print(f"{surum} için hızlı biçim üretiliyor...")
+        hizli_bicimi_ekle(surum)
+
+    if args.csv and os.path.exists(args.csv):
+        haberler = csv_haberleri(args.csv, args.adet)
+        kaynak = args.csv
+    else:
+        haberler = sentetik_haberler(args.adet)
+        kaynak = "sentetik"
+    metinler = [normalize_et(metin) for metin in haberler]
+
+    import joblib
+    from hizli_model import HizliModel
+    farkli = int((joblib.load(model_yolu).predict(metinler) != HizliModel(hizli_yol).predict(metinler)).sum())
+    if farkli:
+        print(f"[HATA] {farkli}/{len(metinler)} haberde hızlı biçimin tahmini Pipeline'dan farklı.")
+        return 1
+    print(f"Sürüm: {surum}, tahminler {len(metinler)} haberde ({kaynak}) birebir aynı\n")
+
+    sonuclar = [("joblib Pipeline", olc("joblib", model_yolu, metinler[0], args.tekrar)),
+                ("hızlı biçim", olc("hizli", hizli_yol, metinler[0], args.tekrar))]
+    print(f"{'Yükleyici':<18}{'içe aktarma':>13}{'yükleme':>10}{'ilk tahmin':>12}{'toplam':>10}"
+          f"{'bellek MB':>11}  sklearn")
+    for ad, s in sonuclar:
+        print(f"{ad:<18}{s['ice_aktarma'] * 1e3:>11.0f}ms{s['yukleme'] * 1e3:>8.0f}ms"
+              f"{s['ilk_tahmin'] * 1e3:>10.1f}ms{s['toplam'] * 1e3:>8.0f}ms{s['bellek_mb']:>11.0f}"
+              f"  {'yüklendi' if s['sklearn'] else 'yok'}")
+    print(f"\nSoğuk açılışta hızlanma: {sonuclar[0][1]['toplam'] / sonuclar[1][1]['toplam']:.1f}x")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,89 @@
+# sorgu_planlari.py
+#
+# app.py rotalarının çalıştırdığı sorguların EXPLAIN QUERY PLAN çıktılarını kontrol eder.
+# Geçici bir veritabanında tüm şema göçlerini uygular, her sorgunun planını yazdırır ve
+# indeks kullanmadan tablo taraması (SCAN) ya da geçici sıralama (TEMP B-TREE) yapan sorgu
+# varsa sıfırdan farklı çıkış koduyla biter. Aynı denetim tests/test_sorgu_planlari.py ile test
+# takımında da çalışır.
+#
+# Kullanım: python sorgu_planlari.py
+
+import os
+import sqlite3
+import sys
+import tempfile
+
+from veritabani import BaglantiHavuzu, ANALIZ_SORGUSU, semayi_guncelle, fts_dizini_var_mi
+
+# /gecmis-analizler sayfalarının okuduğu sütunlar (tüm alanlar istendiğinde).
+GECMIS_SORGUSU = '''SELECT analizler.id, analizler.baslik, articles.metin, analizler.durum, analizler.derece, analizler.tarih
+                    FROM analizler JOIN articles ON articles.id = analizler.article_id'''
+
+# (rota, sorgu, parametreler[, izin verilen adımlar]) kayıtları; app.py içindeki sorgularla aynı tutulmalıdır.
+ROTA_SORGULARI = [
+    ("/check-auth", 'SELECT id, isim, soyisim, email, yas, sehir, password, is_admin FROM users WHERE email = ?', ('a@b.c',)),
+    ("/check-auth", 'DELETE FROM oturumlar WHERE user_id = ? AND bitis <= ?', (1, 0.0)),
+    ("oturum", 'SELECT user_id FROM oturumlar WHERE token = ? AND bitis > ?', ('t', 0.0)),
+    ("/update-password", 'UPDATE users SET password = ? WHERE id = ?', (b'x', 1)),
+    ("/predict", ANALIZ_SORGUSU + ' WHERE analizler.user_id = ? AND analizler.baslik = ?', (1, 'b')),
+    ("/predict", 'SELECT id, durum, derece FROM articles WHERE url = ? AND icerik_ozeti = ? AND model_surumu = ?', ('', 'h', 'v1')),
+    # Yalnızca model sürümü değiştiğinde bir kez çalışır; bütün tabloyu taraması beklenir.
+    ("model_degisti", 'DELETE FROM tahmin_onbellegi WHERE model_surumu IS NOT ?', ('v1',), ('SCAN tahmin_onbellegi',)),
+    ("/predict", 'SELECT durum, derece, olusturma FROM tahmin_onbellegi WHERE anahtar = ?', ('k',)),
+    ("/gecmis-analizler", GECMIS_SORGUSU + ' WHERE analizler.user_id = ? ORDER BY analizler.id DESC LIMIT ?', (1, 50)),
+    ("/gecmis-analizler", GECMIS_SORGUSU + ''' WHERE analizler.user_id = ? AND analizler.durum = ? AND analizler.id < ?
+                            ORDER BY analizler.id DESC LIMIT ?''', (1, 'Olumlu', 100, 50)),
+    ("/gecmis-analizler", '''SELECT analizler.durum, COUNT(*) AS adet FROM analizler
+                            WHERE analizler.user_id = ? GROUP BY analizler.durum''', (1,)),
+    ("/update-user", 'UPDATE users SET isim = ?, soyisim = ?, email = ?, yas = ?, sehir = ? WHERE id = ?',
+     ('i', 's', 'e', 1, 'c', 1)),
+    ("/delete-user", 'DELETE FROM users WHERE id = ?', (1,)),
+    ("/delete-user", 'DELETE FROM oturumlar WHERE user_id = ?', (1,)),
+    ("/delete-all", 'DELETE FROM analizler WHERE user_id = ?', (1,)),
+    ("analiz_sayaci_ekle", 'UPDATE users SET analiz_sayisi = analiz_sayisi + 1 WHERE id = ?', (1,)),
+    ("/all-users", 'SELECT COUNT(*) FROM users WHERE users.id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH ?)', ('"ali"',)),
+    ("/all-users", '''SELECT id, isim, soyisim, email, yas, sehir, analiz_sayisi FROM users
+                      WHERE users.id IN (SELECT rowid FROM users_fts WHERE users_fts MATCH ?)
+                      ORDER BY users.id LIMIT ? OFFSET ?''', ('"ali"', 50, 0)),
+    ("/veriler-data", ANALIZ_SORGUSU + ' ORDER BY analizler.tarih DESC LIMIT 1', ()),
+]
+
+# Plan satırlarından indeks kullanmayan tablo taramalarını ve geçici sıralamaları ayıklar.
+def sorunlu_adimlar(plan, izinli=()):
+    sorunlar = []
+    for satir in plan:
+        detay = satir['detail']
+        if any(adim in detay for adim in izinli):
+            continue
+        if detay.startswith('SCAN ') and 'USING' not in detay and 'VIRTUAL TABLE' not in detay:
+            sorunlar.append(detay)
+        elif 'USE TEMP B-TREE' in detay:
+            sorunlar.append(detay)
+    return sorunlar
+
+def main():
+    with tempfile.TemporaryDirectory() as klasor:
+        havuz = BaglantiHavuzu(os.path.join(klasor, 'plan.db'), max_baglanti=1)
+        with havuz.baglanti() as conn:
+            surum = semayi_guncelle(conn)
+            print(f"Şema sürümü: {surum}, FTS5: {fts_dizini_var_mi(conn)}\n")
+            hatali = 0
+            for rota, sorgu, parametreler, *izinli in ROTA_SORGULARI:
+                try:
+                    plan = conn.execute('EXPLAIN QUERY PLAN ' + sorgu, parametreler).fetchall()
+                except sqlite3.OperationalError as e:
+                    print(f"[HATA] {rota}: {e}")
+                    hatali += 1
+                    continue
+                sorunlar = sorunlu_adimlar(plan, izinli[0] if izinli else ())
+                print(f"[{'HATA' if sorunlar else 'TAMAM'}] {rota}: {' '.join(sorgu.split())[:90]}")
+                for satir in plan:
+                    print(f"    {satir['detail']}")
+                hatali += bool(sorunlar)
+        havuz.kapat()
+
+    print(f"\n{len(ROTA_SORGULARI) - hatali}/{len(ROTA_SORGULARI)} sorgu indeks kullanıyor.")
+    return 1 if hatali else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -24,12 +24,12 @@ document.addEventListener("DOMContentLoaded", () => {
 
     // Oturum kontrolü
     function checkAuth() {
-        chrome.storage.local.get(["userId", "isAdmin", "loginTime"], (data) => {
-            if (data.userId && data.loginTime && (Date.now() - data.loginTime < 24 * 60 * 60 * 1000)) {
+        chrome.storage.local.get(["userId", "token", "user", "isAdmin", "loginTime"], (data) => {
+            if (data.userId && data.token && data.loginTime && (Date.now() - data.loginTime < 24 * 60 * 60 * 1000)) {
                 console.log("Kullanıcı giriş yapmış:", data.userId);
                 authContainer.style.display = "none";
                 appContainer.style.display = "block";
-                const [isim, soyisim] = data.userId.split("_");
+                const { isim = "", soyisim = "" } = data.user || {};
                 const userNameElement = document.getElementById("user-name");
                 if (userNameElement) userNameElement.textContent = `${isim} ${soyisim}`;
                 switchTab("analiz");
@@ -45,7 +45,7 @@ document.addEventListener("DOMContentLoaded", () => {
                 });
             } else {
                 console.log("Kullanıcı giriş yapmamış.");
-                chrome.storage.local.remove(["userId", "isAdmin", "loginTime"], () => {
+                chrome.storage.local.remove(["userId", "token", "user", "isAdmin", "loginTime"], () => {
                     authContainer.style.display = "block";
                     appContainer.style.display = "none";
                     loginForm.style.display = "block";
@@ -81,7 +81,7 @@ document.addEventListener("DOMContentLoaded", () => {
         if (errorMessage) errorMessage.style.display = "none";
 
         try {
-            const userData = await new Promise((resolve) => chrome.storage.local.get(["userId"], resolve));
+            const userData = await new Promise((resolve) => chrome.storage.local.get(["userId", "token"], resolve));
             if (!userData.userId) {
                 throw new Error("Kullanıcı girişi gerekli!");
             }
@@ -134,7 +134,7 @@ document.addEventListener("DOMContentLoaded", () => {
             const res = await fetch("http://127.0.0.1:5000/predict", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ text: pageData.content, user_id: userData.userId, title: pageData.title }),
+                body: JSON.stringify({ text: pageData.content, token: userData.token, title: pageData.title, url: pageData.url }),
                 signal: controller.signal
             });
             clearTimeout(timeoutId);
@@ -199,13 +199,16 @@ document.addEventListener("DOMContentLoaded", () => {
         });
     }
 
-    // Profil yükleme fonksiyonu
+    // Profil yükleme fonksiyonu (geçmiş, sunucudan imleç tabanlı sayfalarla okunur)
+    // profileCursors[i], i+1. sayfayı getirmek için kullanılan after_id değeridir.
+    let profileCursors = [null];
     async function loadProfile(page = 1, itemsPerPage = 5) {
-        const userData = await new Promise((resolve) => chrome.storage.local.get(["userId"], resolve));
+        const userData = await new Promise((resolve) => chrome.storage.local.get(["userId", "token"], resolve));
         if (!userData.userId) {
             showNotification("Kullanıcı girişi gerekli!", "error");
             return;
         }
+        if (page === 1) profileCursors = [null];
 
         const tableBody = document.querySelector("#gecmis-analizler tbody");
         const pagination = document.getElementById("profile-pagination");
@@ -217,7 +220,13 @@ document.addEventListener("DOMContentLoaded", () => {
             const res = await fetch("http://127.0.0.1:5000/gecmis-analizler", {
                 method: "POST",
                 headers: { "Content-Type": "application/json" },
-                body: JSON.stringify({ user_id: userData.userId, filter_type: "all" })
+                body: JSON.stringify({
+                    token: userData.token,
+                    filter_type: "all",
+                    after_id: profileCursors[page - 1],
+                    limit: itemsPerPage,
+                    fields: "baslik,durum,derece,tarih"
+                })
             });
 
             if (!res.ok) throw new Error(`HTTP hatası: ${res.status}`);
@@ -226,16 +235,8 @@ document.addEventListener("DOMContentLoaded", () => {
             if (tableBody) tableBody.innerHTML = "";
             if (pagination) pagination.innerHTML = "";
 
-            // Sort analyses by date (newest first)
-            const sortedAnalizler = data.analizler.sort((a, b) => 
-                new Date(b.tarih) - new Date(a.tarih)
-            );
-
-            const start = (page - 1) * itemsPerPage;
-            const end = start + itemsPerPage;
-            const paginatedAnalizler = sortedAnalizler.slice(start, end);
-
-            paginatedAnalizler.forEach((analiz) => {
+            // Analizler sunucudan en yeniden eskiye sıralı gelir
+            data.analizler.forEach((analiz) => {
                 const row = document.createElement("tr");
                 row.innerHTML = `
                     <td>${analiz.baslik || "Başlık Yok"}</td>
@@ -247,24 +248,31 @@ document.addEventListener("DOMContentLoaded", () => {
                 if (tableBody) tableBody.appendChild(row);
             });
 
-            if (sortedAnalizler.length === 0) {
+            if (data.analizler.length === 0 && page === 1) {
                 if (tableBody) {
                     tableBody.innerHTML = `<tr><td colspan="3">Geçmiş analiz bulunamadı.</td></tr>`;
                 }
             }
 
-            const totalPages = Math.ceil(sortedAnalizler.length / itemsPerPage);
-            for (let i = 1; i <= totalPages; i++) {
+            profileCursors[page] = data.sonraki_after_id;
+            const addPageButton = (label, target, disabled) => {
                 const button = document.createElement("button");
-                button.textContent = i;
-                button.disabled = i === page;
-                button.addEventListener("click", () => loadProfile(i, itemsPerPage));
+                button.textContent = label;
+                button.disabled = disabled;
+                button.addEventListener("click", () => loadProfile(target, itemsPerPage));
                 if (pagination) pagination.appendChild(button);
+            };
+            if (page > 1 || data.sonraki_after_id) {
+                addPageButton("‹", page - 1, page <= 1);
+                addPageButton(page, page, true);
+                addPageButton("›", page + 1, !data.sonraki_after_id);
             }
 
-            if (toplamAnaliz) toplamAnaliz.textContent = data.istatistikler.toplam_analiz || 0;
-            if (olumluAnaliz) olumluAnaliz.textContent = data.istatistikler.olumlu_analiz || 0;
-            if (olumsuzAnaliz) olumsuzAnaliz.textContent = data.istatistikler.olumsuz_analiz || 0;
+            if (data.istatistikler) {
+                if (toplamAnaliz) toplamAnaliz.textContent = data.istatistikler.toplam_analiz || 0;
+                if (olumluAnaliz) olumluAnaliz.textContent = data.istatistikler.olumlu_analiz || 0;
+                if (olumsuzAnaliz) olumsuzAnaliz.textContent = data.istatistikler.olumsuz_analiz || 0;
+            }
         } catch (error) {
             console.error("Profil yükleme hatası:", error);
             if (tableBody) {
@@ -301,6 +309,8 @@ document.addEventListener("DOMContentLoaded", () => {
                 if (data.authenticated) {
                     chrome.storage.local.set({
                         userId: data.user_id,
+                        token: data.token,
+                        user: data.kullanici,
                         isAdmin: data.is_admin,
                         loginTime: Date.now()
                     }, () => {
@@ -350,6 +360,8 @@ document.addEventListener("DOMContentLoaded", () => {
                 if (res.ok) {
                     chrome.storage.local.set({
                         userId: data.user_id,
+                        token: data.token,
+                        user: data.kullanici,
                         isAdmin: data.is_admin,
                         loginTime: Date.now()
                     }, () => {
@@ -372,7 +384,7 @@ document.addEventListener("DOMContentLoaded", () => {
     const logoutBtn = document.getElementById("logout-btn");
     if (logoutBtn) {
         logoutBtn.addEventListener("click", () => {
-            chrome.storage.local.remove(["userId", "isAdmin", "loginTime", "blockNegativeContent"], () => {
+            chrome.storage.local.remove(["userId", "token", "user", "isAdmin", "loginTime", "blockNegativeContent"], () => {
                 console.log("Çıkış yapıldı, kimlik bilgileri silindi.");
                 checkAuth();
                 showNotification("Çıkış yapıldı!", "success");
@@ -389,8 +401,8 @@ document.addEventListener("DOMContentLoaded", () => {
     if (editProfileBtn) {
         editProfileBtn.addEventListener("click", () => {
             if (editProfileModal) editProfileModal.style.display = "block";
-            chrome.storage.local.get(["userId"], (data) => {
-                const [isim, soyisim, email, yas, sehir] = data.userId.split("_");
+            chrome.storage.local.get(["user"], (data) => {
+                const { isim = "", soyisim = "", email = "", yas = "", sehir = "" } = data.user || {};
                 document.getElementById("edit-isim").value = isim;
                 document.getElementById("edit-soyisim").value = soyisim;
                 document.getElementById("edit-email").value = email;
@@ -416,9 +428,9 @@ document.addEventListener("DOMContentLoaded", () => {
             }
 
             try {
-                const userData = await new Promise((resolve) => chrome.storage.local.get(["userId"], resolve));
+                const userData = await new Promise((resolve) => chrome.storage.local.get(["token"], resolve));
                 const updateData = {
-                    user_id: userData.userId,
+                    token: userData.token,
                     new_isim: newIsim,
                     new_soyisim: newSoyisim,
                     new_email: newEmail,
@@ -432,9 +444,9 @@ document.addEventListener("DOMContentLoaded", () => {
                     body: JSON.stringify(updateData)
                 });
 
+                const updateResult = await res.json();
                 if (!res.ok) {
-                    const errorData = await res.json();
-                    throw new Error(errorData.error || "Kullanıcı güncelleme başarısız");
+                    throw new Error(updateResult.error || "Kullanıcı güncelleme başarısız");
                 }
 
                 if (newPassword) {
@@ -442,7 +454,7 @@ document.addEventListener("DOMContentLoaded", () => {
                         method: "POST",
                         headers: { "Content-Type": "application/json" },
                         body: JSON.stringify({
-                            user_id: userData.userId,
+                            token: userData.token,
                             current_password: currentPassword,
                             new_password: newPassword
                         })
@@ -454,9 +466,8 @@ document.addEventListener("DOMContentLoaded", () => {
                     }
                 }
 
-                const newUserId = `${newIsim}_${newSoyisim}_${newEmail}_${newYas}_${newSehir}`;
                 chrome.storage.local.set({
-                    userId: newUserId,
+                    user: updateResult.kullanici,
                     loginTime: Date.now()
                 }, () => {
                     if (editProfileModal) editProfileModal.style.display = "none";
@@ -481,12 +492,12 @@ document.addEventListener("DOMContentLoaded", () => {
         deleteAllBtn.addEventListener("click", async () => {
             if (!confirm("Tüm analizler silinecek, emin misiniz?")) return;
 
-            const userData = await new Promise((resolve) => chrome.storage.local.get(["userId"], resolve));
+            const userData = await new Promise((resolve) => chrome.storage.local.get(["token"], resolve));
             try {
                 const res = await fetch("http://127.0.0.1:5000/delete-all", {
                     method: "POST",
                     headers: { "Content-Type": "application/json" },
-                    body: JSON.stringify({ user_id: userData.userId })
+                    body: JSON.stringify({ token: userData.token })
                 });
 
                 if (!res.ok) throw new Error("Silme işlemi başarısız");
@@ -1,4 +1,16 @@
 document.addEventListener('DOMContentLoaded', () => {
+    // Admin oturum anahtarı sayfa adresinin #token=... kısmından alınıp sekme boyunca saklanır;
+    // kullanıcı işlemleri bu anahtarla gönderilir, sunucu admin yetkisini anahtarın sahibinden denetler.
+    const adresAnahtari = new URLSearchParams(location.hash.slice(1)).get('token');
+    if (adresAnahtari) {
+        sessionStorage.setItem('adminToken', adresAnahtari);
+        history.replaceState(null, '', location.pathname + location.search);
+    }
+    const adminHeaders = () => ({
+        'Content-Type': 'application/json',
+        'Authorization': `Bearer ${sessionStorage.getItem('adminToken') || ''}`
+    });
+
     // Anlık verileri güncelleme fonksiyonu
     function updateData() {
         console.log("Veriler güncelleniyor...");
@@ -82,11 +94,13 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     });
 
-    // Kullanıcı arama
+    // Kullanıcı arama (her tuş vuruşunda değil, yazma durduktan kısa süre sonra sunucuya sorulur)
     const searchUsers = document.getElementById('search-users');
+    let searchTimer = null;
     if (searchUsers) {
         searchUsers.addEventListener('input', (e) => {
-            loadAllUsers(1, e.target.value);
+            clearTimeout(searchTimer);
+            searchTimer = setTimeout(() => loadAllUsers(1, e.target.value), 300);
         });
     }
 
@@ -98,9 +112,11 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
-    // Tüm kullanıcıları yükleme
+    // Tüm kullanıcıları yükleme (sayfalama sunucu tarafında yapılır)
+    const itemsPerPage = 5;
+    const loadedUsers = new Map();
     function loadAllUsers(page = 1, search = '') {
-        fetch(`http://127.0.0.1:5000/all-users?search=${encodeURIComponent(search)}`, {
+        fetch(`http://127.0.0.1:5000/all-users?search=${encodeURIComponent(search)}&page=${page}&limit=${itemsPerPage}`, {
             method: 'GET'
         })
             .then(response => {
@@ -113,18 +129,16 @@ document.addEventListener('DOMContentLoaded', () => {
                 if (tbody) tbody.innerHTML = '';
                 if (pagination) pagination.innerHTML = '';
 
-                if (userData.length === 0) {
+                const users = userData.kullanicilar || [];
+                if (users.length === 0) {
                     if (tbody) tbody.innerHTML = '<tr><td colspan="7">Henüz kullanıcı yok.</td></tr>';
                     return;
                 }
 
-                const itemsPerPage = 5;
-                const start = (page - 1) * itemsPerPage;
-                const end = start + itemsPerPage;
-                const paginatedData = userData.slice(start, end);
-
-                paginatedData.forEach(user => {
-                    const userId = `${user.isim}_${user.soyisim}_${user.email}_${user.yas}_${user.sehir}`;
+                loadedUsers.clear();
+                users.forEach(user => {
+                    const userId = user.id;
+                    loadedUsers.set(String(userId), user);
                     const row = document.createElement('tr');
                     row.innerHTML = `
                         <td>${user.isim}</td>
@@ -141,14 +155,20 @@ document.addEventListener('DOMContentLoaded', () => {
                     if (tbody) tbody.appendChild(row);
                 });
 
-                const totalPages = Math.ceil(userData.length / itemsPerPage);
-                for (let i = 1; i <= totalPages; i++) {
+                // Çok sayıda sayfa olabileceği için yalnızca önceki/sonraki ve çevredeki sayfa düğmeleri gösterilir.
+                const totalPages = userData.toplam_sayfa;
+                const addPageButton = (label, target, disabled) => {
                     const button = document.createElement('button');
-                    button.textContent = i;
-                    button.addEventListener('click', () => loadAllUsers(i, search));
-                    if (i === page) button.disabled = true;
+                    button.textContent = label;
+                    button.disabled = disabled;
+                    button.addEventListener('click', () => loadAllUsers(target, search));
                     if (pagination) pagination.appendChild(button);
+                };
+                addPageButton('‹', page - 1, page <= 1);
+                for (let i = Math.max(1, page - 2); i <= Math.min(totalPages, page + 2); i++) {
+                    addPageButton(i, i, i === page);
                 }
+                addPageButton('›', page + 1, page >= totalPages);
 
                 document.querySelectorAll('.delete-user-button').forEach(button => {
                     button.addEventListener('click', () => {
@@ -176,11 +196,13 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Kullanıcı silme
     function deleteUser(userId) {
-        if (confirm(`Kullanıcı ${userId} silinecek, emin misiniz?`)) {
+        const user = loadedUsers.get(String(userId));
+        const label = user ? `${user.isim} ${user.soyisim} (${user.email})` : userId;
+        if (confirm(`Kullanıcı ${label} silinecek, emin misiniz?`)) {
             fetch('http://127.0.0.1:5000/delete-user', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({ user_id: userId })
+                headers: adminHeaders(),
+                body: JSON.stringify({ user_id: Number(userId) })
             })
                 .then(response => {
                     if (!response.ok) throw new Error(`HTTP hatası: ${response.status}`);
@@ -196,7 +218,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
     // Kullanıcı düzenleme
     function editUser(userId) {
-        const [isim, soyisim, email, yas, sehir] = userId.split('_');
+        const { isim = '', soyisim = '', email = '', yas = '', sehir = '' } = loadedUsers.get(String(userId)) || {};
         const editModal = document.getElementById('edit-user-modal');
         if (editModal) {
             editModal.style.display = 'block';
@@ -251,9 +273,9 @@ document.addEventListener('DOMContentLoaded', () => {
 
             fetch('http://127.0.0.1:5000/update-user', {
                 method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
+                headers: adminHeaders(),
                 body: JSON.stringify({
-                    user_id: userId,
+                    user_id: Number(userId),
                     new_isim: yeniIsim,
                     new_soyisim: yeniSoyisim,
                     new_email: yeniEmail,
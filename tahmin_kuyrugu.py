@@ -0,0 +1,180 @@
+# tahmin_kuyrugu.py
+
+import threading
+import queue
+import time
+from collections import Counter
+from concurrent.futures import Future, TimeoutError
+
+# Kuyrukta bekleme süresi dağılımı için kullanılan kova sınırları (milisaniye).
+BEKLEME_KOVALARI_MS = (1, 2, 5, 10, 20, 50, 100, 250, 500, 1000)
+BEKLEME_KOVA_ETIKETLERI = [f"<={sinir}" for sinir in BEKLEME_KOVALARI_MS] + [f">{BEKLEME_KOVALARI_MS[-1]}"]
+
+# Tahmin kuyruğu dolduğunda fırlatılır; istek kuyruğa alınmadan reddedilir. tekrar_dene_saniye, istemciye
+# önerilecek bekleme süresidir (HTTP Retry-After).
+class KuyrukDolu(Exception):
+    def __init__(self, tekrar_dene_saniye=1):
+        super().__init__("Tahmin kuyruğu dolu.")
+        self.tekrar_dene_saniye = tekrar_dene_saniye
+
+# Eşzamanlı gelen tahmin isteklerini kısa bir süre biriktirip modele tek matris
+# halinde gönderen, sonucu her çağırana ayrı ayrı teslim eden istek birleştirici.
+# tahmin_fonksiyonu(metinler, model) şeklinde çağrılır; her istek hangi modelle tahmin edileceğini
+# kendisi verir, farklı modellere ait istekler aynı toplu içinde ayrı ayrı tahmin edilir. Böylece model
+# değişirken bir isteğin sonucu önbellek anahtarındaki sürümden başka bir modelle üretilmez.
+# Tahminler istek iş parçacıklarında değil, isci_sayisi kadar tahmin iş parçacığında yapılır. max_kuyruk
+# verilirse bekleyen (kuyruktaki ve tahmin edilmekte olan) metin sayısı bununla sınırlanır; sınır aşılınca
+# yeni istekler beklemeden KuyrukDolu ile reddedilir ve gecikme ani yüklerde de öngörülebilir kalır.
+class TahminBirlestirici:
+    def __init__(self, tahmin_fonksiyonu, max_bekleme_ms=5, max_toplu_boyut=32, max_kuyruk=0, isci_sayisi=1,
+                 tekrar_dene_saniye=1):
+        if max_toplu_boyut < 1:
+            raise ValueError("max_toplu_boyut en az 1 olmalıdır.")
+        if isci_sayisi < 1:
+            raise ValueError("isci_sayisi en az 1 olmalıdır.")
+        self.tahmin_fonksiyonu = tahmin_fonksiyonu
+        self.max_bekleme = max(0.0, max_bekleme_ms) / 1000.0
+        self.max_toplu_boyut = max_toplu_boyut
+        self.max_kuyruk = max_kuyruk
+        self.isci_sayisi = isci_sayisi
+        self.tekrar_dene_saniye = tekrar_dene_saniye
+        self._baslat()
+
+    # Kuyruğu, kilidi ve metrikleri kurar ve tahmin iş parçacıklarını başlatır.
+    def _baslat(self):
+        self._kuyruk = queue.Queue()
+        self._kilit = threading.Lock()
+        self._toplu_boyut_dagilimi = Counter()
+        self._bekleme_kovalari = Counter()
+        self._bekleme_toplam_ms = 0.0
+        self._bekleme_max_ms = 0.0
+        self._istek_sayisi = 0
+        self._bekleme_sayisi = 0
+        self._hata_sayisi = 0
+        self._bekleyen = 0
+        self._reddedilen = 0
+        self._zaman_asimi = 0
+        self._isciler = [threading.Thread(target=self._calistir, name=f"tahmin-birlestirici-{i}", daemon=True)
+                         for i in range(self.isci_sayisi)]
+        for isci in self._isciler:
+            isci.start()
+
+    # Süreç çatallandıktan (fork) sonra çocuk süreçte çağrılır. Çatallanmada yalnızca çağıran iş parçacığı
+    # kopyalandığından tahmin iş parçacıkları, kuyruk ve kilit yeniden kurulur; metrikler sıfırdan başlar.
+    def catallandiktan_sonra(self):
+        self._baslat()
+
+    # Tek bir temizlenmiş metni kuyruğa ekler ve toplu tahmin sonucunu bekleyip döndürür.
+    # Kuyruk doluysa KuyrukDolu, sonuç zaman_asimi saniyede gelmezse TimeoutError fırlatır.
+    def tahmin_et(self, temiz_metin, zaman_asimi=None, model=None):
+        return self.toplu_tahmin_et([temiz_metin], zaman_asimi, model)[0]
+
+    # Temizlenmiş metin listesini tek istek olarak kuyruğa ekler; metinler aynı toplu içinde tahmin edilir.
+    def toplu_tahmin_et(self, temiz_metinler, zaman_asimi=None, model=None):
+        with self._kilit:
+            if self.max_kuyruk and self._bekleyen and self._bekleyen + len(temiz_metinler) > self.max_kuyruk:
+                self._reddedilen += 1
+                raise KuyrukDolu(self.tekrar_dene_saniye)
+            self._bekleyen += len(temiz_metinler)
+        gelecek = Future()
+        self._kuyruk.put((list(temiz_metinler), gelecek, time.perf_counter(), model))
+        try:
+            return gelecek.result(timeout=zaman_asimi)
+        except TimeoutError:
+            # Henüz tahmine başlanmadıysa istek iptal edilir ve tahmin iş parçacığı onu atlar.
+            gelecek.cancel()
+            with self._kilit:
+                self._zaman_asimi += 1
+            raise
+
+    # Kuyruktan istekleri toplayıp süre veya boyut (metin sayısı) sınırı dolunca modele gönderen döngü.
+    def _calistir(self):
+        while True:
+            ilk = self._kuyruk.get()
+            toplu = [ilk]
+            metin_sayisi = len(ilk[0])
+            son_tarih = time.perf_counter() + self.max_bekleme
+            while metin_sayisi < self.max_toplu_boyut:
+                kalan = son_tarih - time.perf_counter()
+                try:
+                    istek = self._kuyruk.get(timeout=kalan) if kalan > 0 else self._kuyruk.get_nowait()
+                except queue.Empty:
+                    break
+                toplu.append(istek)
+                metin_sayisi += len(istek[0])
+            self._toplu_isle(toplu)
+
+    # Biriken istekleri model başına tek çağrıyla tahmin eder ve sonuçları sahiplerine dağıtır.
+    # Zaman aşımıyla iptal edilmiş istekler tahmin edilmeden atlanır.
+    def _toplu_isle(self, toplu):
+        baslangic = time.perf_counter()
+        iptaller = [istek for istek in toplu if not istek[1].set_running_or_notify_cancel()]
+        if iptaller:
+            with self._kilit:
+                self._bekleyen -= sum(len(metinler) for metinler, _, _, _ in iptaller)
+            toplu = [istek for istek in toplu if not istek[1].cancelled()]
+            if not toplu:
+                return
+        bekleme_sureleri = [(baslangic - eklenme) * 1000.0 for _, _, eklenme, _ in toplu]
+        gruplar = {}
+        for istek in toplu:
+            gruplar.setdefault(id(istek[3]), []).append(istek)
+        try:
+            for grup in gruplar.values():
+                tahminler = self.tahmin_fonksiyonu([metin for metinler, _, _, _ in grup for metin in metinler],
+                                                   grup[0][3])
+                bas = 0
+                for metinler, gelecek, _, _ in grup:
+                    gelecek.set_result(list(tahminler[bas:bas + len(metinler)]))
+                    bas += len(metinler)
+            hatali = False
+        except Exception as e:
+            for _, gelecek, _, _ in toplu:
+                if not gelecek.done():
+                    gelecek.set_exception(e)
+            hatali = True
+        finally:
+            with self._kilit:
+                self._bekleyen -= sum(len(metinler) for metinler, _, _, _ in toplu)
+        self._metrik_kaydet(sum(len(metinler) for metinler, _, _, _ in toplu), bekleme_sureleri, hatali)
+
+    # Tamamlanan bir toplu tahminin boyutunu ve isteklerin kuyrukta bekleme sürelerini kaydeder.
+    def _metrik_kaydet(self, boyut, bekleme_sureleri, hatali):
+        with self._kilit:
+            self._toplu_boyut_dagilimi[boyut] += 1
+            self._istek_sayisi += boyut
+            if hatali:
+                self._hata_sayisi += 1
+            self._bekleme_sayisi += len(bekleme_sureleri)
+            for sure in bekleme_sureleri:
+                self._bekleme_toplam_ms += sure
+                self._bekleme_max_ms = max(self._bekleme_max_ms, sure)
+                kova = next((f"<={sinir}" for sinir in BEKLEME_KOVALARI_MS if sure <= sinir), BEKLEME_KOVA_ETIKETLERI[-1])
+                self._bekleme_kovalari[kova] += 1
+
+    # Toplu boyut dağılımı ve kuyruk bekleme süreleri hakkındaki metrikleri döndürür.
+    def metrikler(self):
+        with self._kilit:
+            toplu_sayisi = sum(self._toplu_boyut_dagilimi.values())
+            return {
+                "ayarlar": {
+                    "max_bekleme_ms": self.max_bekleme * 1000.0,
+                    "max_toplu_boyut": self.max_toplu_boyut,
+                    "max_kuyruk": self.max_kuyruk,
+                    "isci_sayisi": self.isci_sayisi
+                },
+                "istek_sayisi": self._istek_sayisi,
+                "toplu_sayisi": toplu_sayisi,
+                "hatali_toplu_sayisi": self._hata_sayisi,
+                "ortalama_toplu_boyut": self._istek_sayisi / toplu_sayisi if toplu_sayisi else 0.0,
+                "toplu_boyut_dagilimi": {str(boyut): adet for boyut, adet in sorted(self._toplu_boyut_dagilimi.items())},
+                "kuyruk_bekleme_ms": {
+                    "ortalama": self._bekleme_toplam_ms / self._bekleme_sayisi if self._bekleme_sayisi else 0.0,
+                    "max": self._bekleme_max_ms,
+                    "dagilim": {kova: self._bekleme_kovalari[kova] for kova in BEKLEME_KOVA_ETIKETLERI if kova in self._bekleme_kovalari}
+                },
+                "kuyruktaki_istek": self._kuyruk.qsize(),
+                "bekleyen_metin": self._bekleyen,
+                "reddedilen_istek": self._reddedilen,
+                "zaman_asimina_ugrayan_istek": self._zaman_asimi
+            }
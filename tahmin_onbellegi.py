@@ -0,0 +1,100 @@
+# tahmin_onbellegi.py
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+# Temizlenmiş metnin özeti ve model sürümü ile anahtarlanan, tüm kullanıcılar arasında paylaşılan
+# tahmin önbelleği. Bellekte boyut ve süre (TTL) sınırlı bir LRU tutar, kalıcı katman olarak
+# veritabanındaki tahmin_onbellegi tablosunu kullanır. baglanti_fonksiyonu, "with" ile kullanılabilen
+# bir bağlantı bağlamı döndürmelidir.
+class TahminOnbellegi:
+    def __init__(self, baglanti_fonksiyonu, max_boyut=10000, ttl_saniye=7 * 24 * 3600):
+        self.baglanti_fonksiyonu = baglanti_fonksiyonu
+        self.max_boyut = max_boyut
+        self.ttl_saniye = ttl_saniye
+        self._bellek = OrderedDict()
+        self._kilit = threading.Lock()
+        self._sayaclar = {"bellek_isabet": 0, "veritabani_isabet": 0, "iskalama": 0, "kayit": 0}
+
+    # Temizlenmiş metin ve model sürümünden önbellek anahtarını (SHA-256) üretir.
+    @staticmethod
+    def anahtar(temiz_metin, model_surumu):
+        return hashlib.sha256(f"{model_surumu}\x00{temiz_metin}".encode('utf-8')).hexdigest()
+
+    # Anahtara ait (durum, derece) sonucunu önce bellekten, yoksa veritabanından getirir; yoksa None döner.
+    def getir(self, anahtar):
+        simdi = time.time()
+        with self._kilit:
+            kayit = self._bellek.get(anahtar)
+            if kayit and kayit[1] > simdi:
+                self._bellek.move_to_end(anahtar)
+                self._sayaclar["bellek_isabet"] += 1
+                return kayit[0]
+            if kayit:
+                del self._bellek[anahtar]
+
+        with self.baglanti_fonksiyonu() as conn:
+            c = conn.cursor()
+            c.execute('SELECT durum, derece, olusturma FROM tahmin_onbellegi WHERE anahtar = ?', (anahtar,))
+            satir = c.fetchone()
+
+        with self._kilit:
+            if satir and satir['olusturma'] + self.ttl_saniye > simdi:
+                sonuc = (satir['durum'], int(satir['derece']))
+                self._bellege_ekle(anahtar, sonuc, satir['olusturma'] + self.ttl_saniye)
+                self._sayaclar["veritabani_isabet"] += 1
+                return sonuc
+            self._sayaclar["iskalama"] += 1
+        return None
+
+    # Yeni bir tahmin sonucunu hem belleğe hem de kalıcı tabloya yazar.
+    def kaydet(self, anahtar, durum, derece, model_surumu):
+        self.toplu_kaydet([(anahtar, durum, derece)], model_surumu)
+
+    # Birden fazla (anahtar, durum, derece) sonucunu tek veritabanı işlemiyle önbelleğe yazar.
+    def toplu_kaydet(self, kayitlar, model_surumu):
+        if not kayitlar:
+            return
+        simdi = time.time()
+        with self._kilit:
+            for anahtar, durum, derece in kayitlar:
+                self._bellege_ekle(anahtar, (durum, derece), simdi + self.ttl_saniye)
+            self._sayaclar["kayit"] += len(kayitlar)
+
+        with self.baglanti_fonksiyonu() as conn:
+            conn.executemany('''INSERT OR REPLACE INTO tahmin_onbellegi (anahtar, durum, derece, model_surumu, olusturma)
+                                VALUES (?, ?, ?, ?, ?)''',
+                             [(anahtar, durum, derece, model_surumu, simdi) for anahtar, durum, derece in kayitlar])
+            conn.commit()
+
+    # Model sürümü değiştiğinde çağrılır; bellekteki kayıtları boşaltır ve kalıcı tablodan başka sürümlere ait
+    # kayıtları siler. Silinen kalıcı kayıt sayısını döndürür.
+    def surum_disindakileri_sil(self, model_surumu):
+        with self._kilit:
+            self._bellek.clear()
+        with self.baglanti_fonksiyonu() as conn:
+            silinen = conn.execute('DELETE FROM tahmin_onbellegi WHERE model_surumu IS NOT ?', (model_surumu,)).rowcount
+            conn.commit()
+        return silinen
+
+    # Kilit altında çağrılır; kaydı LRU sonuna ekler ve boyut sınırı aşılırsa en eski kaydı atar.
+    def _bellege_ekle(self, anahtar, sonuc, bitis):
+        self._bellek[anahtar] = (sonuc, bitis)
+        self._bellek.move_to_end(anahtar)
+        while len(self._bellek) > self.max_boyut:
+            self._bellek.popitem(last=False)
+
+    # İsabet/ıskalama sayaçlarını ve bellekteki kayıt sayısını döndürür.
+    def metrikler(self):
+        with self._kilit:
+            istek = self._sayaclar["bellek_isabet"] + self._sayaclar["veritabani_isabet"] + self._sayaclar["iskalama"]
+            isabet = self._sayaclar["bellek_isabet"] + self._sayaclar["veritabani_isabet"]
+            return {
+                **self._sayaclar,
+                "isabet_orani": isabet / istek if istek else 0.0,
+                "bellekteki_kayit": len(self._bellek),
+                "max_boyut": self.max_boyut,
+                "ttl_saniye": self.ttl_saniye
+            }
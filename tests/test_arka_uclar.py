@@ -0,0 +1,85 @@
+# Model tahmin arka uçları: hızlı biçim ve derlenmiş ağaçlar, joblib Pipeline ile aynı tahminleri ve (tolerans
+# içinde) aynı sınıf olasılıklarını vermeli. arka_uc_karsilastirma.py'nin eşitlik denetiminin küçük bir
+# sürümdeki karşılığıdır.
+
+import os
+import random
+import shutil
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_kayit_defteri import (derlenmis_bicimi_ekle, hizli_bicimi_ekle, surumu_arka_ucla_yukle,  # noqa: E402
+                                 surumu_kaydet)
+from model_kurulumu import pipeline_olustur  # noqa: E402
+
+SINIF_SAYISI = 11
+KELIMELER = ["ekonomi", "spor", "siyaset", "sağlık", "eğitim", "teknoloji", "kültür", "hava", "trafik", "yargı",
+             "tarım", "enerji", "turizm", "bilim", "sanat", "maç", "borsa", "seçim", "hastane", "okul"]
+
+
+# Her sınıfın kendine özgü kelimeleri ve ortak gürültü kelimeleri olan küçük bir korpus üretir.
+def kucuk_korpus(adet=440, tohum=42):
+    rastgele = random.Random(tohum)
+    metinler, etiketler = [], []
+    for i in range(adet):
+        etiket = i % SINIF_SAYISI
+        ozgu = [f"sinif{etiket}kelime{j}" for j in range(3)]
+        kelimeler = rastgele.sample(ozgu, 2) + rastgele.sample(KELIMELER, 4)
+        rastgele.shuffle(kelimeler)
+        metinler.append(" ".join(kelimeler))
+        etiketler.append(etiket)
+    return metinler, np.array(etiketler)
+
+
+@pytest.fixture(scope="module", params=['tfidf', 'hashing'])
+def surum(request, tmp_path_factory):
+    klasor = str(tmp_path_factory.mktemp(f"modeller_{request.param}"))
+    metinler, etiketler = kucuk_korpus()
+    pipeline = pipeline_olustur(request.param, hash_bitleri=12)
+    pipeline.set_params(xgb__n_estimators=20, xgb__n_jobs=1)
+    pipeline.fit(metinler, etiketler)
+    surum = surumu_kaydet(pipeline, klasor, dogruluk=1.0)
+    hizli_bicimi_ekle(surum, klasor)
+    return klasor, surum
+
+
+@pytest.fixture(scope="module")
+def test_metinleri():
+    metinler, _ = kucuk_korpus(adet=110, tohum=7)
+    # Eğitimde görülmemiş kelimeler ve boş metin de aynı sonucu vermeli.
+    return metinler + ["hiç görülmemiş kelimeler", ""]
+
+
+def arka_ucla_yukle(klasor, surum, arka_uc):
+    model, kullanilan = surumu_arka_ucla_yukle(surum, klasor, arka_uc)
+    assert kullanilan == arka_uc
+    return model
+
+
+def test_hizli_joblib_ile_ayni(surum, test_metinleri):
+    klasor, ad = surum
+    beklenen = arka_ucla_yukle(klasor, ad, 'joblib')
+    hizli = arka_ucla_yukle(klasor, ad, 'hizli')
+
+    np.testing.assert_array_equal(hizli.predict(test_metinleri), beklenen.predict(test_metinleri))
+    np.testing.assert_allclose(hizli.predict_proba(test_metinleri), beklenen.predict_proba(test_metinleri),
+                               rtol=1e-4, atol=1e-5)
+
+
+def test_derlenmis_joblib_ile_ayni(surum, test_metinleri):
+    pytest.importorskip("treelite")
+    pytest.importorskip("tl2cgen")
+    if shutil.which(os.environ.get('MODEL_DERLEYICI', 'gcc')) is None:
+        pytest.skip("C derleyicisi yok")
+    klasor, ad = surum
+    derlenmis_bicimi_ekle(ad, klasor)
+    beklenen = arka_ucla_yukle(klasor, ad, 'joblib')
+    derlenmis = arka_ucla_yukle(klasor, ad, 'derlenmis')
+
+    np.testing.assert_array_equal(derlenmis.predict(test_metinleri), beklenen.predict(test_metinleri))
+    np.testing.assert_allclose(derlenmis.predict_proba(test_metinleri), beklenen.predict_proba(test_metinleri),
+                               rtol=1e-4, atol=1e-5)
@@ -0,0 +1,60 @@
+# Göç 5 (kullanıcı kimliğinin users.id tamsayısına çevrilmesi): eski analizlerin hiçbiri kaybolmamalı.
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from veritabani import ANONIM_KULLANICI_ID, GOCLER, semayi_guncelle  # noqa: E402
+
+
+# Göç 5'ten önceki şemada (sürüm 4), verilen (id, user_id, baslik) analizleriyle bir veritabanı hazırlar.
+def eski_veritabani(yol, analizler):
+    conn = sqlite3.connect(yol)
+    conn.row_factory = sqlite3.Row
+    for surum, goc in GOCLER[:4]:
+        goc(conn)
+        conn.execute(f'PRAGMA user_version = {surum}')
+    conn.execute("INSERT INTO users (isim, soyisim, email, yas, sehir, password) VALUES ('Ali', 'Kaya', 'ali@ornek.com', 30, 'Ankara', 'x')")
+    for analiz_id, user_id, baslik in analizler:
+        conn.execute("INSERT INTO articles (url, icerik_ozeti, baslik, metin, durum, derece, tarih) VALUES ('', ?, ?, ?, 'Olumlu', 0, '2024-01-01')",
+                     (f'ozet{analiz_id}', baslik, f'metin {analiz_id}'))
+        conn.execute('INSERT INTO analizler (id, user_id, article_id, baslik, tarih) VALUES (?, ?, last_insert_rowid(), ?, ?)',
+                     (analiz_id, user_id, baslik, '2024-01-01'))
+    conn.commit()
+    return conn
+
+
+def test_eslesmeyen_kimliklerin_cakisan_analizleri_korunur(tmp_path):
+    conn = eski_veritabani(str(tmp_path / 'analizler.db'), [
+        (1, 'anonymous', 'Ortak başlık'),
+        (5, 'Veli_Can_veli@ornek.com_40_İzmir', 'Ortak başlık'),
+        (7, 'Ayse_Demir_ayse@ornek.com_25_Bursa', 'Ortak başlık'),
+        (8, 'Ali_Kaya_ali@ornek.com_30_Ankara', 'Ortak başlık'),
+    ])
+    semayi_guncelle(conn)
+
+    analizler = {satir['id']: satir for satir in conn.execute('SELECT id, user_id, article_id, durum FROM analizler')}
+    assert sorted(analizler) == [1, 5, 7, 8]
+    assert analizler[1]['user_id'] == ANONIM_KULLANICI_ID
+    assert analizler[8]['user_id'] == 1
+    assert len({analizler[i]['user_id'] for i in analizler}) == 4
+    assert all(analiz['durum'] == 'Olumlu' for analiz in analizler.values())
+    assert conn.execute('SELECT COUNT(*) FROM articles WHERE id NOT IN (SELECT article_id FROM analizler)').fetchone()[0] == 0
+    yer_tutucu = conn.execute('SELECT soyisim, password, analiz_sayisi FROM users WHERE id = ?', (analizler[7]['user_id'],)).fetchone()
+    assert tuple(yer_tutucu) == ('Ayse_Demir_ayse@ornek.com_25_Bursa', None, 1)
+
+
+def test_cakisan_anonim_analizlerde_goc_geri_alinir(tmp_path):
+    conn = eski_veritabani(str(tmp_path / 'analizler.db'), [
+        (1, 'anonymous', 'Ortak başlık'),
+        (2, None, 'Ortak başlık'),
+    ])
+    with pytest.raises(sqlite3.IntegrityError):
+        semayi_guncelle(conn)
+
+    assert conn.execute('PRAGMA user_version').fetchone()[0] == 4
+    assert conn.execute('SELECT COUNT(*) FROM analizler').fetchone()[0] == 2
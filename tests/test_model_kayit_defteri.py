@@ -0,0 +1,59 @@
+# Model kayıt defteri: bozuk bir sürüme geçiş AKTIF göstergesini ve servis edilen modeli değiştirmemeli.
+
+import os
+import sys
+
+import pytest
+from sklearn.dummy import DummyClassifier
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.pipeline import Pipeline
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from model_kayit_defteri import (AKTIF_DOSYASI, MODEL_DOSYASI, ModelYoneticisi, aktif_surum,  # noqa: E402
+                                 surumu_kaydet)
+
+
+def kucuk_model():
+    return Pipeline([("vektor", CountVectorizer()), ("siniflandirici", DummyClassifier())]).fit(
+        ["iyi haber", "kötü haber", "güzel gün"], [0, 1, 0])
+
+
+@pytest.fixture
+def kayit_defteri(tmp_path):
+    klasor = str(tmp_path / 'modeller')
+    saglam = surumu_kaydet(kucuk_model(), klasor, dogruluk=1.0, aktif_et=True)
+    bozuk = surumu_kaydet(kucuk_model(), klasor, dogruluk=1.0)
+    with open(os.path.join(klasor, bozuk, MODEL_DOSYASI), 'wb') as f:
+        f.write(b'bozuk model')
+    return klasor, saglam, bozuk
+
+
+def test_bozuk_surume_geciste_aktif_degismez(kayit_defteri):
+    klasor, saglam, bozuk = kayit_defteri
+    yonetici = ModelYoneticisi(klasor, eski_yol=os.path.join(klasor, 'yok.pkl'), kontrol_araligi=0, arka_uc='joblib')
+    assert yonetici.guncel().surum == saglam
+
+    assert yonetici.surume_gec(bozuk).surum == saglam
+    assert aktif_surum(klasor) == saglam
+
+    # Göstergeyi izleyen başka bir işçi de sağlam sürümde kalır.
+    baska_isci = ModelYoneticisi(klasor, eski_yol=os.path.join(klasor, 'yok.pkl'), kontrol_araligi=0, arka_uc='joblib')
+    assert baska_isci.guncel().surum == saglam
+
+
+def test_saglam_surume_gecilir(kayit_defteri):
+    klasor, saglam, _ = kayit_defteri
+    yeni = surumu_kaydet(kucuk_model(), klasor, dogruluk=1.0)
+    yonetici = ModelYoneticisi(klasor, eski_yol=os.path.join(klasor, 'yok.pkl'), kontrol_araligi=0, arka_uc='joblib')
+    assert yonetici.surume_gec(yeni).surum == yeni
+    with open(os.path.join(klasor, AKTIF_DOSYASI), encoding='utf-8') as f:
+        assert f.read() == yeni
+
+
+def test_olmayan_surum_reddedilir(kayit_defteri):
+    klasor, saglam, _ = kayit_defteri
+    yonetici = ModelYoneticisi(klasor, eski_yol=os.path.join(klasor, 'yok.pkl'), kontrol_araligi=0, arka_uc='joblib')
+    with pytest.raises(ValueError):
+        yonetici.surume_gec('v9999')
+    assert aktif_surum(klasor) == saglam
@@ -0,0 +1,44 @@
+# /model-yenile yetki denetimi: yönetici yetkisi yalnızca oturum anahtarının sahibinden okunur.
+
+import os
+import sys
+import tempfile
+
+import pytest
+
+PROJE_KLASORU = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJE_KLASORU)
+os.environ.setdefault('ANALIZ_DB_YOLU', os.path.join(tempfile.mkdtemp(), 'analizler.db'))
+os.environ.setdefault('LOG_SEVIYESI', 'WARNING')
+
+import app as uygulama  # noqa: E402
+
+
+@pytest.fixture(scope='module')
+def istemci():
+    return uygulama.app.test_client()
+
+
+def kullanici_olustur(istemci, email, is_admin):
+    yanit = istemci.post('/register', json={"email": email, "isim": "Ad", "soyisim": "Soyad", "yas": 30,
+                                            "sehir": "Ankara", "password": "parola", "is_admin": is_admin})
+    assert yanit.status_code == 200
+    return yanit.get_json()
+
+
+def test_anahtarsiz_user_id_reddedilir(istemci):
+    admin = kullanici_olustur(istemci, 'admin-anahtarsiz@ornek.com', 1)
+    yanit = istemci.post('/model-yenile', json={"user_id": admin['user_id']})
+    assert yanit.status_code in (401, 403)
+
+
+def test_admin_olmayan_anahtar_reddedilir(istemci):
+    admin = kullanici_olustur(istemci, 'admin-hedef@ornek.com', 1)
+    kullanici = kullanici_olustur(istemci, 'kullanici@ornek.com', 0)
+    yanit = istemci.post('/model-yenile', json={"token": kullanici['token'], "user_id": admin['user_id']})
+    assert yanit.status_code == 403
+
+
+def test_gecersiz_anahtar_reddedilir(istemci):
+    yanit = istemci.post('/model-yenile', headers={"Authorization": "Bearer gecersiz"})
+    assert yanit.status_code == 401
@@ -0,0 +1,30 @@
+# Sorgu planları: uç noktaların sıcak sorguları güncel şemada tam tablo taraması veya geçici B-ağacı
+# sıralaması yapmadan indeks kullanmalı (sorgu_planlari.ROTA_SORGULARI).
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sorgu_planlari import ROTA_SORGULARI, sorunlu_adimlar  # noqa: E402
+from veritabani import BaglantiHavuzu, semayi_guncelle  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def baglanti(tmp_path_factory):
+    havuz = BaglantiHavuzu(str(tmp_path_factory.mktemp("plan") / 'plan.db'), max_baglanti=1)
+    with havuz.baglanti() as conn:
+        semayi_guncelle(conn)
+        yield conn
+    havuz.kapat()
+
+
+@pytest.mark.parametrize("rota, sorgu, parametreler, izinli",
+                         [(rota, sorgu, parametreler, izinli[0] if izinli else ())
+                          for rota, sorgu, parametreler, *izinli in ROTA_SORGULARI],
+                         ids=[rota for rota, *_ in ROTA_SORGULARI])
+def test_sorgu_indeks_kullanir(baglanti, rota, sorgu, parametreler, izinli):
+    plan = baglanti.execute('EXPLAIN QUERY PLAN ' + sorgu, parametreler).fetchall()
+    assert sorunlu_adimlar(plan, izinli) == [], "\n".join(satir['detail'] for satir in plan)
@@ -0,0 +1,432 @@
+# veritabani.py
+
+import hashlib
+import logging
+import queue
+import secrets
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# SQLite bağlantılarını yeniden kullanan, WAL modunda çalışan bağlantı havuzu.
+# Her istek bir bağlantıyı "with havuz.baglanti() as conn:" ile ödünç alır; blok bitince
+# yarım kalan işlem geri alınır ve bağlantı kapatılmadan havuza geri konur. Aynı iş parçacığı
+# içinde iç içe ödünç almalar aynı bağlantıyı paylaşır.
+class BaglantiHavuzu:
+    def __init__(self, db_yolu, max_baglanti=8, busy_timeout_ms=5000, synchronous='NORMAL', cache_size_kb=16384):
+        self.db_yolu = db_yolu
+        self.max_baglanti = max_baglanti
+        self.busy_timeout_ms = busy_timeout_ms
+        self.synchronous = synchronous
+        self.cache_size_kb = cache_size_kb
+        self._bos_baglantilar = queue.LifoQueue()
+        self._acik_baglanti_sayisi = 0
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+
+    # Yeni bir bağlantı açar ve WAL, meşgul bekleme süresi, senkronizasyon ve önbellek ayarlarını uygular.
+    def _yeni_baglanti(self):
+        conn = sqlite3.connect(self.db_yolu, detect_types=sqlite3.PARSE_DECLTYPES,
+                               timeout=self.busy_timeout_ms / 1000.0, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout_ms)}')
+        conn.execute(f'PRAGMA synchronous={self.synchronous}')
+        conn.execute(f'PRAGMA cache_size=-{int(self.cache_size_kb)}')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        return conn
+
+    # Havuzdan boşta bir bağlantı alır; yoksa ve sınır aşılmadıysa yenisini açar, aşıldıysa bekler.
+    def _al(self):
+        try:
+            return self._bos_baglantilar.get_nowait()
+        except queue.Empty:
+            pass
+        with self._kilit:
+            yeni_acilabilir = self._acik_baglanti_sayisi < self.max_baglanti
+            if yeni_acilabilir:
+                self._acik_baglanti_sayisi += 1
+        if yeni_acilabilir:
+            try:
+                return self._yeni_baglanti()
+            except Exception:
+                with self._kilit:
+                    self._acik_baglanti_sayisi -= 1
+                raise
+        try:
+            return self._bos_baglantilar.get(timeout=self.busy_timeout_ms / 1000.0)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Havuzda boş veritabanı bağlantısı kalmadı.")
+
+    # Bir bağlantıyı bağlam yöneticisi olarak ödünç verir ve iş bitince havuza iade eder.
+    @contextmanager
+    def baglanti(self):
+        mevcut = getattr(self._yerel, 'conn', None)
+        if mevcut is not None:
+            yield mevcut
+            return
+
+        conn = self._al()
+        self._yerel.conn = conn
+        try:
+            yield conn
+        finally:
+            self._yerel.conn = None
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._bos_baglantilar.put(conn)
+            except sqlite3.Error:
+                conn.close()
+                with self._kilit:
+                    self._acik_baglanti_sayisi -= 1
+
+    # Süreç çatallandıktan (fork) sonra çocuk süreçte çağrılır. Üst süreçten kalan bağlantılar SQLite'ta
+    # süreçler arasında paylaşılamadığından kapatılmadan bırakılır; çocuk kendi bağlantılarını açar.
+    def catallandiktan_sonra(self):
+        self._bos_baglantilar = queue.LifoQueue()
+        self._acik_baglanti_sayisi = 0
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+
+    # Havuzda boşta bekleyen tüm bağlantıları kapatır (kapanışta veya süreç çatallanmadan önce).
+    def kapat(self):
+        while True:
+            try:
+                conn = self._bos_baglantilar.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._kilit:
+                self._acik_baglanti_sayisi -= 1
+
+# Kayıtlı kullanıcılar tablosu.
+USERS_TABLOSU = '''CREATE TABLE IF NOT EXISTS users
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      email TEXT UNIQUE,
+                      isim TEXT,
+                      soyisim TEXT,
+                      yas INTEGER,
+                      sehir TEXT,
+                      password TEXT,
+                      is_admin INTEGER DEFAULT 0)'''
+
+# Her haberin gövdesini ve model sonucunu bir kez tutan tablo; URL ve içerik özeti ile tekilleştirilir.
+ARTICLES_TABLOSU = '''CREATE TABLE IF NOT EXISTS articles
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      url TEXT NOT NULL DEFAULT '',
+                      icerik_ozeti TEXT NOT NULL,
+                      baslik TEXT,
+                      metin TEXT,
+                      durum TEXT,
+                      derece INTEGER,
+                      tarih TEXT,
+                      UNIQUE(url, icerik_ozeti))'''
+
+# Kullanıcı ile analiz edilen haber arasındaki ince bağlantı tablosunun ilk hali; kullanıcıyı
+# "isim_soyisim_email_yas_sehir" dizgisiyle tutar. Yalnızca 1-4. göçler tarafından kullanılır.
+ANALIZLER_TABLOSU_V1 = '''CREATE TABLE IF NOT EXISTS analizler
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id TEXT,
+                      article_id INTEGER REFERENCES articles(id),
+                      baslik TEXT,
+                      tarih TEXT,
+                      UNIQUE(user_id, baslik))'''
+
+# Kullanıcı ile analiz edilen haber arasındaki ince bağlantı tablosu. user_id, users.id değeridir;
+# giriş yapmadan yapılan analizler ANONIM_KULLANICI_ID ile saklanır.
+ANALIZLER_TABLOSU = '''CREATE TABLE IF NOT EXISTS analizler
+                     (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                      user_id INTEGER NOT NULL,
+                      article_id INTEGER REFERENCES articles(id),
+                      baslik TEXT,
+                      tarih TEXT,
+                      UNIQUE(user_id, baslik))'''
+
+# Giriş yapmamış (anonim) kullanıcıların analizlerinin bağlandığı kullanıcı kimliği.
+ANONIM_KULLANICI_ID = 0
+
+# /check-auth ve /register tarafından verilen oturum anahtarları.
+OTURUMLAR_TABLOSU = '''CREATE TABLE IF NOT EXISTS oturumlar
+                     (token TEXT PRIMARY KEY,
+                      user_id INTEGER NOT NULL,
+                      bitis REAL NOT NULL)'''
+
+# Temizlenmiş metin + model sürümüne göre paylaşılan tahmin önbelleğinin kalıcı katmanı.
+TAHMIN_ONBELLEGI_TABLOSU = '''CREATE TABLE IF NOT EXISTS tahmin_onbellegi
+                     (anahtar TEXT PRIMARY KEY,
+                      durum TEXT,
+                      derece INTEGER,
+                      model_surumu TEXT,
+                      olusturma REAL)'''
+
+# Analiz satırlarını bağlı oldukları haberin metniyle ve analizin kendi sonucuyla birlikte döndüren ortak sorgu.
+ANALIZ_SORGUSU = '''SELECT analizler.id, analizler.user_id, analizler.baslik, articles.metin,
+                          analizler.durum, analizler.derece, analizler.tarih, analizler.model_surumu
+                   FROM analizler JOIN articles ON articles.id = analizler.article_id'''
+
+# Haber metninin içerik özetini (SHA-256) üretir; articles tablosunda haberi tekilleştirmek için kullanılır.
+def icerik_ozeti_hesapla(metin):
+    return hashlib.sha256(metin.encode('utf-8')).hexdigest()
+
+# Haberi articles tablosuna (yoksa) ekler ve haberin kimliğini döndürür. Haber zaten kayıtlıysa satırı
+# değiştirilmez: articles.durum/derece haberi ilk kaydeden model sürümünün sonucudur ve aynı sürümle gelen
+# isteklerde yeniden kullanılır. Her analizin kendi sonucu analizler satırında saklanır.
+def haberi_kaydet(c, url, icerik_ozeti, baslik, metin, durum, derece, tarih, model_surumu=None):
+    c.execute('''INSERT OR IGNORE INTO articles (url, icerik_ozeti, baslik, metin, durum, derece, tarih, model_surumu)
+                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)''',
+              (url, icerik_ozeti, baslik, metin, durum, derece, tarih, model_surumu))
+    if c.rowcount:
+        return c.lastrowid
+    c.execute('SELECT id FROM articles WHERE url = ? AND icerik_ozeti = ?', (url, icerik_ozeti))
+    return c.fetchone()['id']
+
+# Metni her satırda tekrar tutan eski analizler tablosunu articles + bağlantı tablosu yapısına dönüştürür.
+def analizleri_haberlere_tasi(conn):
+    logger.info("analizler tablosu articles tablosuna taşınıyor...")
+    c = conn.cursor()
+    okuyucu = conn.cursor()
+    c.execute('ALTER TABLE analizler RENAME TO analizler_eski')
+    c.execute(ANALIZLER_TABLOSU_V1)
+    okuyucu.execute('SELECT id, user_id, baslik, metin, durum, derece, tarih FROM analizler_eski ORDER BY id')
+    tasinan = 0
+    for satir in okuyucu:
+        metin = satir['metin'] or ''
+        # Bu göç model_surumu sütunundan önce çalıştığı için haberi_kaydet yerine ilk şemaya göre yazılır.
+        icerik_ozeti = icerik_ozeti_hesapla(metin)
+        c.execute('''INSERT OR IGNORE INTO articles (url, icerik_ozeti, baslik, metin, durum, derece, tarih)
+                     VALUES ('', ?, ?, ?, ?, ?, ?)''',
+                  (icerik_ozeti, satir['baslik'], metin, satir['durum'], satir['derece'], satir['tarih']))
+        c.execute("SELECT id FROM articles WHERE url = '' AND icerik_ozeti = ?", (icerik_ozeti,))
+        article_id = c.fetchone()['id']
+        c.execute('INSERT INTO analizler (id, user_id, article_id, baslik, tarih) VALUES (?, ?, ?, ?, ?)',
+                  (satir['id'], satir['user_id'], article_id, satir['baslik'], satir['tarih']))
+        tasinan += 1
+    c.execute('DROP TABLE analizler_eski')
+    logger.info(f"{tasinan} analiz articles tablosuna bağlandı.")
+
+# Göç 1: temel tablolar, eski sürümlerden kalan eksik sütunlar ve metni satır başına tutan şemadan taşıma.
+# Sürüm takibinden önce oluşturulmuş veritabanlarında da güvenle çalışacak şekilde tekrarlanabilirdir.
+def _goc_temel_sema(conn):
+    c = conn.cursor()
+    c.execute(USERS_TABLOSU)
+    c.execute(ARTICLES_TABLOSU)
+    c.execute(ANALIZLER_TABLOSU_V1)
+    c.execute(TAHMIN_ONBELLEGI_TABLOSU)
+
+    c.execute("PRAGMA table_info(users)")
+    users_sutunlari = [sutun['name'] for sutun in c.fetchall()]
+    if 'password' not in users_sutunlari:
+        c.execute("ALTER TABLE users ADD COLUMN password TEXT")
+        logger.info("users tablosuna password sütunu eklendi.")
+    if 'is_admin' not in users_sutunlari:
+        c.execute("ALTER TABLE users ADD COLUMN is_admin INTEGER DEFAULT 0")
+        logger.info("users tablosuna is_admin sütunu eklendi.")
+
+    c.execute("PRAGMA table_info(analizler)")
+    if 'metin' in [sutun['name'] for sutun in c.fetchall()]:
+        analizleri_haberlere_tasi(conn)
+
+# Göç 2: rota sorgularının kullandığı ikincil indeksler ve kullanıcı araması için FTS5 (trigram) dizini.
+def _goc_indeksler(conn):
+    c = conn.cursor()
+    # /gecmis-analizler: user_id ile filtreleyip tarih sırasıyla okur; bağlantı sütunlarını da içeren kapsayıcı indeks.
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analizler_kullanici_tarih ON analizler(user_id, tarih, baslik, article_id)')
+    # /veriler-data: en son analiz (ORDER BY tarih DESC LIMIT 1) tablo sıralanmadan indeksten okunur.
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analizler_tarih ON analizler(tarih)')
+    # Durum filtresiyle birlikte yapılan aramalar ve istatistikler için.
+    c.execute('CREATE INDEX IF NOT EXISTS idx_articles_durum ON articles(durum)')
+
+    # /all-users: isim/soyisim/e-posta içinde alt dizgi araması (LIKE '%x%') için trigram FTS5 dizini.
+    try:
+        c.execute('''CREATE VIRTUAL TABLE IF NOT EXISTS users_fts
+                     USING fts5(isim, soyisim, email, content='users', content_rowid='id', tokenize='trigram')''')
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 trigram dizini oluşturulamadı, kullanıcı araması LIKE ile yapılacak: {str(e)}")
+        return
+    c.execute("INSERT INTO users_fts(users_fts) VALUES ('rebuild')")
+    c.execute('''CREATE TRIGGER IF NOT EXISTS users_fts_ekle AFTER INSERT ON users BEGIN
+                     INSERT INTO users_fts(rowid, isim, soyisim, email) VALUES (new.id, new.isim, new.soyisim, new.email);
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS users_fts_sil AFTER DELETE ON users BEGIN
+                     INSERT INTO users_fts(users_fts, rowid, isim, soyisim, email) VALUES ('delete', old.id, old.isim, old.soyisim, old.email);
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS users_fts_guncelle AFTER UPDATE OF isim, soyisim, email ON users BEGIN
+                     INSERT INTO users_fts(users_fts, rowid, isim, soyisim, email) VALUES ('delete', old.id, old.isim, old.soyisim, old.email);
+                     INSERT INTO users_fts(rowid, isim, soyisim, email) VALUES (new.id, new.isim, new.soyisim, new.email);
+                 END''')
+
+# analizler.user_id değerinin users satırından nasıl üretildiği ("isim_soyisim_email_yas_sehir").
+KULLANICI_KIMLIGI_IFADESI = "isim || '_' || soyisim || '_' || email || '_' || yas || '_' || sehir"
+
+# Göç 3: users tablosunda tetikleyicilerle güncel tutulan analiz_sayisi sayacı. Tetikleyiciler kullanıcıyı
+# user_id dizgisiyle eşleştirdiği için aynı ifade üzerinde bir ifade indeksi oluşturulur.
+def _goc_analiz_sayaci(conn):
+    c = conn.cursor()
+    c.execute("PRAGMA table_info(users)")
+    if 'analiz_sayisi' not in [sutun['name'] for sutun in c.fetchall()]:
+        c.execute("ALTER TABLE users ADD COLUMN analiz_sayisi INTEGER NOT NULL DEFAULT 0")
+    c.execute(f'CREATE INDEX IF NOT EXISTS idx_users_kimlik ON users({KULLANICI_KIMLIGI_IFADESI})')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_ekle AFTER INSERT ON analizler BEGIN
+                      UPDATE users SET analiz_sayisi = analiz_sayisi + 1 WHERE {KULLANICI_KIMLIGI_IFADESI} = new.user_id;
+                  END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_sil AFTER DELETE ON analizler BEGIN
+                      UPDATE users SET analiz_sayisi = analiz_sayisi - 1 WHERE {KULLANICI_KIMLIGI_IFADESI} = old.user_id;
+                  END''')
+    c.execute(f'''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_guncelle AFTER UPDATE OF user_id ON analizler
+                  WHEN old.user_id IS NOT new.user_id BEGIN
+                      UPDATE users SET analiz_sayisi = analiz_sayisi - 1 WHERE {KULLANICI_KIMLIGI_IFADESI} = old.user_id;
+                      UPDATE users SET analiz_sayisi = analiz_sayisi + 1 WHERE {KULLANICI_KIMLIGI_IFADESI} = new.user_id;
+                  END''')
+    c.execute(f'UPDATE users SET analiz_sayisi = (SELECT COUNT(*) FROM analizler WHERE user_id = {KULLANICI_KIMLIGI_IFADESI})')
+
+# Göç 4: /gecmis-analizler imleç (after_id) sayfalaması için kullanıcıya göre id sırasında okunan kapsayıcı indeks.
+def _goc_gecmis_indeksi(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_analizler_kullanici_id ON analizler(user_id, id, baslik, tarih, article_id)')
+
+# Eski şemada giriş yapmadan yapılan analizlerin user_id değeri.
+ESKI_ANONIM_KIMLIGI = 'anonymous'
+
+# Göç 5: analizler.user_id dizgisini users.id tamsayısına çevirir ve oturum anahtarı tablosunu ekler.
+# Eski anonim analizler anonim kullanıcıya bağlanır. Eşleşen kullanıcısı olmayan (silinmiş veya profili
+# değişmiş kullanıcıya ait) her eski kimlik için giriş yapılamayan ayrı bir yer tutucu kullanıcı oluşturulur;
+# böylece farklı eski kimliklerin aynı başlıklı analizleri UNIQUE(user_id, baslik) ile çakışıp kaybolmaz.
+# Yine de çakışan satır kalırsa göç hata verir ve geri alınır. Analiz sayacı tetikleyicileri ve sayaçlar
+# tamsayı kimliğe göre yeniden kurulur.
+def _goc_tamsayi_kullanici_kimligi(conn):
+    c = conn.cursor()
+    c.execute(OTURUMLAR_TABLOSU)
+    c.execute('CREATE INDEX IF NOT EXISTS idx_oturumlar_kullanici ON oturumlar(user_id)')
+
+    for tetikleyici in ('analiz_sayaci_ekle', 'analiz_sayaci_sil', 'analiz_sayaci_guncelle'):
+        c.execute(f'DROP TRIGGER IF EXISTS {tetikleyici}')
+    c.execute('ALTER TABLE analizler RENAME TO analizler_eski')
+
+    c.execute('CREATE TEMP TABLE kimlik_eslemesi (eski TEXT PRIMARY KEY, yeni INTEGER NOT NULL)')
+    c.execute(f'''INSERT INTO kimlik_eslemesi (eski, yeni)
+                  SELECT DISTINCT analizler_eski.user_id, users.id
+                  FROM analizler_eski JOIN users ON {KULLANICI_KIMLIGI_IFADESI} = analizler_eski.user_id''')
+    c.execute('''SELECT DISTINCT user_id FROM analizler_eski
+                 WHERE user_id IS NOT NULL AND user_id NOT IN ('', ?)
+                   AND user_id NOT IN (SELECT eski FROM kimlik_eslemesi)''', (ESKI_ANONIM_KIMLIGI,))
+    eslesmeyenler = [satir['user_id'] for satir in c.fetchall()]
+    for eski in eslesmeyenler:
+        c.execute("INSERT INTO users (isim, soyisim, is_admin) VALUES ('Eski kullanıcı', ?, 0)", (eski,))
+        c.execute('INSERT INTO kimlik_eslemesi (eski, yeni) VALUES (?, ?)', (eski, c.lastrowid))
+    if eslesmeyenler:
+        logger.warning(f"Kullanıcısı bulunamayan {len(eslesmeyenler)} eski kimlik için yer tutucu kullanıcı oluşturuldu.")
+
+    yeni_kimlik = 'COALESCE((SELECT yeni FROM kimlik_eslemesi WHERE eski = analizler_eski.user_id), ?)'
+    c.execute(f'''SELECT COALESCE(SUM(adet - 1), 0) FROM
+                      (SELECT COUNT(*) AS adet FROM analizler_eski WHERE baslik IS NOT NULL
+                       GROUP BY {yeni_kimlik}, baslik HAVING COUNT(*) > 1)''', (ANONIM_KULLANICI_ID,))
+    cakisan = c.fetchone()[0]
+    if cakisan:
+        logger.error(f"{cakisan} analiz aynı kullanıcı ve başlıkla çakışıyor; kullanıcı kimliği göçü geri alınıyor.")
+        raise sqlite3.IntegrityError(f"Kullanıcı kimliği göçünde {cakisan} analiz çakışıyor")
+
+    c.execute(ANALIZLER_TABLOSU)
+    c.execute(f'''INSERT INTO analizler (id, user_id, article_id, baslik, tarih)
+                  SELECT id, {yeni_kimlik}, article_id, baslik, tarih
+                  FROM analizler_eski ORDER BY id''', (ANONIM_KULLANICI_ID,))
+    c.execute('SELECT COUNT(*) FROM analizler WHERE user_id = ?', (ANONIM_KULLANICI_ID,))
+    anonim = c.fetchone()[0]
+    c.execute('DROP TABLE analizler_eski')
+    c.execute('DROP TABLE kimlik_eslemesi')
+    c.execute('DROP INDEX IF EXISTS idx_users_kimlik')
+    if anonim:
+        logger.info(f"{anonim} anonim analiz anonim kullanıcıya bağlandı.")
+
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analizler_tarih ON analizler(tarih)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analizler_kullanici_id ON analizler(user_id, id, baslik, tarih, article_id)')
+
+    c.execute('''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_ekle AFTER INSERT ON analizler BEGIN
+                     UPDATE users SET analiz_sayisi = analiz_sayisi + 1 WHERE id = new.user_id;
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_sil AFTER DELETE ON analizler BEGIN
+                     UPDATE users SET analiz_sayisi = analiz_sayisi - 1 WHERE id = old.user_id;
+                 END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS analiz_sayaci_guncelle AFTER UPDATE OF user_id ON analizler
+                 WHEN old.user_id IS NOT new.user_id BEGIN
+                     UPDATE users SET analiz_sayisi = analiz_sayisi - 1 WHERE id = old.user_id;
+                     UPDATE users SET analiz_sayisi = analiz_sayisi + 1 WHERE id = new.user_id;
+                 END''')
+    c.execute('UPDATE users SET analiz_sayisi = (SELECT COUNT(*) FROM analizler WHERE analizler.user_id = users.id)')
+
+# Göç 6: Haber sonucunu üreten ve analizin yapıldığı andaki model sürümünü kaydeder. articles.model_surumu
+# aktif sürümden farklıysa haber yeniden tahmin edilir.
+def _goc_model_surumu(conn):
+    c = conn.cursor()
+    for tablo in ('articles', 'analizler'):
+        c.execute(f"PRAGMA table_info({tablo})")
+        if 'model_surumu' not in [sutun['name'] for sutun in c.fetchall()]:
+            c.execute(f"ALTER TABLE {tablo} ADD COLUMN model_surumu TEXT")
+
+# Göç 7: Her analizin sonucunu (durum, derece) analizler satırında saklar; böylece haber başka bir model
+# sürümüyle yeniden analiz edildiğinde kullanıcıların geçmiş analizleri değişmez. Mevcut analizler bağlı
+# oldukları haberin sonucuyla doldurulur. Durum filtresi ve istatistikleri için kullanıcıya göre indeks eklenir.
+def _goc_analiz_sonucu(conn):
+    c = conn.cursor()
+    c.execute("PRAGMA table_info(analizler)")
+    sutunlar = [sutun['name'] for sutun in c.fetchall()]
+    if 'durum' not in sutunlar:
+        c.execute("ALTER TABLE analizler ADD COLUMN durum TEXT")
+    if 'derece' not in sutunlar:
+        c.execute("ALTER TABLE analizler ADD COLUMN derece INTEGER")
+    c.execute('''UPDATE analizler SET durum = (SELECT durum FROM articles WHERE articles.id = analizler.article_id),
+                                      derece = (SELECT derece FROM articles WHERE articles.id = analizler.article_id)
+                 WHERE durum IS NULL''')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_analizler_kullanici_durum ON analizler(user_id, durum, id)')
+
+# Kullanıcı için yeni bir oturum anahtarı üretip kaydeder; süresi dolmuş eski oturumlarını temizler.
+def oturum_ac(c, user_id, sure_saniye):
+    simdi = time.time()
+    token = secrets.token_urlsafe(32)
+    c.execute('DELETE FROM oturumlar WHERE user_id = ? AND bitis <= ?', (user_id, simdi))
+    c.execute('INSERT INTO oturumlar (token, user_id, bitis) VALUES (?, ?, ?)', (token, user_id, simdi + sure_saniye))
+    return token
+
+# Geçerli (süresi dolmamış) oturum anahtarının kullanıcı kimliğini döndürür; yoksa None döner.
+def oturum_kullanicisi(c, token):
+    c.execute('SELECT user_id FROM oturumlar WHERE token = ? AND bitis > ?', (token, time.time()))
+    satir = c.fetchone()
+    return satir['user_id'] if satir else None
+
+# Sıralı şema göçleri: (sürüm, göç fonksiyonu). Uygulanan son sürüm PRAGMA user_version içinde tutulur;
+# yeni bir şema değişikliği listenin sonuna bir sonraki sürüm numarasıyla eklenir.
+GOCLER = [
+    (1, _goc_temel_sema),
+    (2, _goc_indeksler),
+    (3, _goc_analiz_sayaci),
+    (4, _goc_gecmis_indeksi),
+    (5, _goc_tamsayi_kullanici_kimligi),
+    (6, _goc_model_surumu),
+    (7, _goc_analiz_sonucu),
+]
+
+# Veritabanını henüz uygulanmamış göçlerle günceller; her göç kendi işleminde (transaction) çalışır.
+# Güncel şema sürümünü döndürür.
+def semayi_guncelle(conn):
+    mevcut_surum = conn.execute('PRAGMA user_version').fetchone()[0]
+    for surum, goc in GOCLER:
+        if surum <= mevcut_surum:
+            continue
+        if not conn.in_transaction:
+            conn.execute('BEGIN')
+        try:
+            goc(conn)
+            conn.execute(f'PRAGMA user_version = {int(surum)}')
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        logger.info(f"Veritabanı şeması {surum}. sürüme güncellendi: {goc.__name__}")
+        mevcut_surum = surum
+    return mevcut_surum
+
+# Kullanıcı araması için FTS5 dizininin veritabanında bulunup bulunmadığını döndürür.
+def fts_dizini_var_mi(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'users_fts'").fetchone() is not None
@@ -0,0 +1,207 @@
+# yuk_testi.py
+#
+# Üretim sunucusunun (gunicorn.conf.py) /predict yük testi. Her işçi sayısı için sunucu ayrı bir geçici
+# veritabanıyla başlatılır, eşzamanlı istemciler süre boyunca her biri farklı başlıklı /predict istekleri
+# gönderir ve saniyedeki istek sayısı ile p50/p99 gecikme raporlanır; tahmin kuyruğu dolduğunda 503 ile
+# reddedilen istekler ayrıca sayılır. Sunucunun toplam belleği ana süreç ve işçilerin RSS toplamı ve PSS
+# toplamı (paylaşılan sayfalar süreçler arasında bölünerek) olarak verilir; model ön çatallamayla
+# paylaşıldığından PSS, işçi sayısıyla RSS kadar hızlı artmaz.
+# --kapanis verilirse son ölçümün ortasında sunucuya SIGTERM gönderilir ve sinyal anında süren isteklerin
+# tamamlanıp tamamlanmadığı raporlanır.
+# İstemciler ayrı süreçlerde çalışır; istemci tarafı darboğaz olmasın diye süreç sayısı --istemci-sureci ile
+# ayarlanabilir. Haberler --csv'den ('metin' sütunu) veya sentetik olarak üretilir.
+#
+# Kullanım: python yuk_testi.py [--isci-sayilari 1,2,4] [--eszamanli 32] [--sure 10] [--csv csv_dosyası/haberveriseti.csv]
+#                               [--kapanis]
+
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+from normalizasyon_benchmark import csv_haberleri, sentetik_haberler
+
+PROJE_KLASORU = os.path.dirname(os.path.abspath(__file__))
+
+# Sürecin ve alt süreçlerinin PID'lerini döndürür.
+def surec_agaci(pid):
+    pidler = [pid]
+    for pid in pidler:
+        try:
+            with open(f"/proc/{pid}/task/{pid}/children") as f:
+                pidler.extend(int(p) for p in f.read().split())
+        except OSError:
+            continue
+    return pidler
+
+# Süreç ağacının toplam RSS ve PSS belleğini (MB) /proc/<pid>/smaps_rollup'tan okur; okunamazsa None döner.
+def toplam_bellek_mb(pid):
+    rss = pss = 0
+    for alt in surec_agaci(pid):
+        try:
+            with open(f"/proc/{alt}/smaps_rollup") as f:
+                for satir in f:
+                    if satir.startswith('Rss:'):
+                        rss += int(satir.split()[1])
+                    elif satir.startswith('Pss:'):
+                        pss += int(satir.split()[1])
+        except OSError:
+            return None
+    return rss / 1024, pss / 1024
+
+# Sunucu /tahmin-metrikleri isteğine yanıt verene kadar bekler; süre dolarsa veya sunucu kapanırsa False döner.
+def hazir_bekle(surec, port, zaman_asimi=180):
+    bitis = time.time() + zaman_asimi
+    while time.time() < bitis and surec.poll() is None:
+        try:
+            baglanti = http.client.HTTPConnection('127.0.0.1', port, timeout=2)
+            baglanti.request('GET', '/tahmin-metrikleri')
+            if baglanti.getresponse().status == 200:
+                return True
+        except OSError:
+            time.sleep(0.5)
+    return False
+
+# Bir istemci sürecinde is_parcacigi kadar iş parçacığıyla süre dolana kadar /predict istekleri gönderir.
+# Her istek için (başlangıç zamanı, gecikme ms, sonuç) döndürür; sonuç HTTP durum kodu veya hata adıdır.
+def istemci_sureci(port, haberler, is_parcacigi, bitis, onek):
+    sonuclar = []
+    kilit = threading.Lock()
+
+    def calis(sira):
+        baglanti = None
+        sayac = 0
+        while time.time() < bitis:
+            govde = json.dumps({"title": f"{onek}-{sira}-{sayac}",
+                                "text": haberler[(sira * 7919 + sayac) % len(haberler)]})
+            sayac += 1
+            baslangic = time.time()
+            try:
+                if baglanti is None:
+                    baglanti = http.client.HTTPConnection('127.0.0.1', port, timeout=60)
+                baglanti.request('POST', '/predict', govde, {'Content-Type': 'application/json'})
+                yanit = baglanti.getresponse()
+                yanit.read()
+                sonuc = yanit.status
+            except (OSError, http.client.HTTPException) as e:
+                sonuc = type(e).__name__
+                baglanti = None
+                time.sleep(0.05)
+            with kilit:
+                sonuclar.append((baslangic, (time.time() - baslangic) * 1e3, sonuc))
+
+    isler = [threading.Thread(target=calis, args=(sira,)) for sira in range(is_parcacigi)]
+    for is_ in isler:
+        is_.start()
+    for is_ in isler:
+        is_.join()
+    return sonuclar
+
+# Sunucuya eşzamanlı istemcilerle süre boyunca yük bindirir; bütün isteklerin sonuçlarını döndürür.
+# sinyal_zamani verilirse ölçümün o saniyesinde sunucu sürecine SIGTERM gönderilir.
+def yuk_bindir(surec, port, haberler, eszamanli, istemci_sureci_sayisi, sure, onek, sinyal_zamani=None):
+    istemci_sureci_sayisi = max(1, min(istemci_sureci_sayisi, eszamanli))
+    bitis = time.time() + sure
+    paylar = [eszamanli // istemci_sureci_sayisi + (i < eszamanli % istemci_sureci_sayisi)
+              for i in range(istemci_sureci_sayisi)]
+    with multiprocessing.get_context('spawn').Pool(istemci_sureci_sayisi) as havuz:
+        isler = [havuz.apply_async(istemci_sureci, (port, haberler, pay, bitis, f"{onek}-{i}"))
+                 for i, pay in enumerate(paylar)]
+        if sinyal_zamani is not None:
+            time.sleep(sinyal_zamani)
+            sinyal_ani = time.time()
+            surec.send_signal(signal.SIGTERM)
+        sonuclar = [sonuc for is_ in isler for sonuc in is_.get()]
+    return (sonuclar, sinyal_ani) if sinyal_zamani is not None else sonuclar
+
+# Sunucuyu verilen işçi sayısıyla ayrı bir veritabanı üzerinde başlatır.
+def sunucuyu_baslat(isci_sayisi, is_parcacigi, port, db_yolu):
+    ortam = {**os.environ, 'WEB_ISCI_SAYISI': str(isci_sayisi), 'WEB_IS_PARCACIGI_SAYISI': str(is_parcacigi),
+             'WEB_ADRES': f'127.0.0.1:{port}', 'ANALIZ_DB_YOLU': db_yolu, 'LOG_SEVIYESI': 'WARNING'}
+    return subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py'], cwd=PROJE_KLASORU,
+                            env=ortam, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+def main():
+    parser = argparse.ArgumentParser(description="gunicorn ile /predict yük testi (istek/s, p99, bellek)")
+    parser.add_argument('--isci-sayilari', default='1,2,4', help="Virgülle ayrılmış işçi sayıları")
+    parser.add_argument('--is-parcacigi', type=int, default=8, help="İşçi başına iş parçacığı (gthread)")
+    parser.add_argument('--eszamanli', type=int, default=32, help="Eşzamanlı istemci bağlantısı sayısı")
+    parser.add_argument('--istemci-sureci', type=int, default=max(1, multiprocessing.cpu_count() // 2),
+                        help="İstemci bağlantılarının dağıtıldığı süreç sayısı")
+    parser.add_argument('--sure', type=float, default=10, help="Her ölçümün süresi (saniye)")
+    parser.add_argument('--isinma', type=float, default=2, help="Ölçümden önceki ısınma süresi (saniye)")
+    parser.add_argument('--csv', default=None, help="'metin' sütunu içeren CSV dosyası (verilmezse sentetik)")
+    parser.add_argument('--adet', type=int, default=2000, help="Gönderilecek farklı haber sayısı")
+    parser.add_argument('--port', type=int, default=5055, help="Sunucunun dinleyeceği port")
+    parser.add_argument('--kapanis', action='store_true',
+                        help="Son ölçümün ortasında SIGTERM gönderip devam eden isteklerin tamamlandığını denetler")
+    args = parser.parse_args()
+
+    try:
+        import gunicorn  # noqa: F401
+    except ImportError:
+        print("[HATA] gunicorn kurulu değil (pip install gunicorn)")
+        return 1
+    isci_sayilari = [int(s) for s in args.isci_sayilari.split(',') if s.strip()]
+    haberler = csv_haberleri(args.csv, args.adet) if args.csv else sentetik_haberler(args.adet)
+    print(f"{len(haberler)} haber, {args.eszamanli} eşzamanlı bağlantı, ölçüm başına {args.sure:.0f} sn\n")
+
+    satirlar = []
+    with tempfile.TemporaryDirectory() as klasor:
+        for sira, isci_sayisi in enumerate(isci_sayilari):
+            surec = sunucuyu_baslat(isci_sayisi, args.is_parcacigi, args.port, os.path.join(klasor, f"yuk_{sira}.db"))
+            try:
+                if not hazir_bekle(surec, args.port):
+                    print(f"[HATA] Sunucu {isci_sayisi} işçiyle başlatılamadı (gunicorn -c gunicorn.conf.py ile deneyin)")
+                    return 1
+                yuk_bindir(surec, args.port, haberler, args.eszamanli, args.istemci_sureci, args.isinma, f"isinma{sira}")
+                bellek = toplam_bellek_mb(surec.pid)
+                sonuclar = yuk_bindir(surec, args.port, haberler, args.eszamanli, args.istemci_sureci, args.sure,
+                                      f"olcum{sira}")
+                basarili = np.array([gecikme for _, gecikme, sonuc in sonuclar if sonuc == 200])
+                reddedilen = sum(1 for _, _, sonuc in sonuclar if sonuc == 503)
+                satirlar.append((isci_sayisi, len(basarili) / args.sure,
+                                 np.percentile(basarili, 50) if len(basarili) else float('nan'),
+                                 np.percentile(basarili, 99) if len(basarili) else float('nan'),
+                                 reddedilen, len(sonuclar) - len(basarili) - reddedilen, bellek))
+
+                if args.kapanis and sira == len(isci_sayilari) - 1:
+                    sonuclar, sinyal_ani = yuk_bindir(surec, args.port, haberler, args.eszamanli, args.istemci_sureci,
+                                                      args.sure, f"kapanis{sira}", sinyal_zamani=args.sure / 2)
+                    surec.wait(timeout=120)
+                    suren = [(baslangic, gecikme, sonuc) for baslangic, gecikme, sonuc in sonuclar
+                             if baslangic < sinyal_ani < baslangic + gecikme / 1e3]
+                    yarim = [sonuc for _, _, sonuc in suren if sonuc != 200]
+            finally:
+                if surec.poll() is None:
+                    surec.send_signal(signal.SIGTERM)
+                    surec.wait(timeout=120)
+
+    print(f"{'İşçi':>5}{'istek/s':>10}{'p50':>10}{'p99':>10}{'503':>7}{'hata':>7}{'RSS':>10}{'PSS':>10}")
+    for isci_sayisi, hiz, p50, p99, reddedilen, hata, bellek in satirlar:
+        rss, pss = bellek if bellek else (float('nan'), float('nan'))
+        print(f"{isci_sayisi:>5}{hiz:>10.0f}{p50:>8.1f}ms{p99:>8.1f}ms{reddedilen:>7}{hata:>7}{rss:>8.0f}MB{pss:>8.0f}MB")
+    print("\n503: tahmin kuyruğu dolu olduğu (TAHMIN_MAX_KUYRUK) ya da sonuç TAHMIN_ZAMAN_ASIMI içinde gelmediği için "
+          "reddedilen istekler; istek/s ve gecikmeler yalnızca başarılı istekler içindir.")
+    print("RSS: süreçlerin bellek toplamı (paylaşılan sayfalar her süreçte sayılır); "
+          "PSS: paylaşılan sayfalar süreçler arasında bölünmüş toplam.")
+
+    if args.kapanis:
+        print(f"\nKapanış: SIGTERM anında süren {len(suren)} istekten {len(suren) - len(yarim)} tanesi tamamlandı, "
+              f"sunucu çıkış kodu {surec.returncode}")
+        if yarim:
+            print(f"[HATA] Kapanışta yarım kalan istekler: {sorted(set(map(str, yarim)))}")
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())